@@ -1,10 +1,33 @@
 """ImprovMX API wrapper for GALIAS CLI."""
 
+import sqlite3
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
 import requests
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Iterator, Optional, TYPE_CHECKING
+from requests.adapters import HTTPAdapter
 from requests.auth import HTTPBasicAuth
 
-from config import IMPROVMX_API_KEY, DOMAIN, API_URL, MAX_ALIASES
+from models import Alias, AliasSet
+from store import AliasStore
+from config import (
+    IMPROVMX_API_KEY, DOMAIN, API_URL, IMPROVMX_API_BASE_URL, MAX_ALIASES, LIMITS_TTL,
+    HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT, HTTP_POOL_CONNECTIONS, HTTP_POOL_MAXSIZE, HTTP_PROXY,
+    RECORD_PATH, REPLAY_PATH, REPLAY_SPEED, BREAKER_THRESHOLD, BREAKER_RESET, BREAKER_WAIT,
+    HEDGE_PERCENTILE, HEDGE_BUDGET
+)
+from cassette import RecordingAdapter, ReplayAdapter, open_cassette
+from breaker import CircuitBreaker
+from hedge import Hedger
+from deadline import current_deadline
+from percentiles import percentile
+
+if TYPE_CHECKING:
+    # batch imports this module's errors, so only for annotations
+    from batch import Batcher
 
 
 class APIError(Exception):
@@ -32,30 +55,217 @@ class LimitReachedError(APIError):
     pass
 
 
+class RateLimitError(APIError):
+    """Raised when the API rejects a request with 429 Too Many Requests."""
+    pass
+
+
+class ServerError(APIError):
+    """Raised when the API fails with a 5xx response."""
+    pass
+
+
 class NetworkError(APIError):
     """Raised when network/connection issues occur."""
     pass
 
 
+class CircuitOpenError(NetworkError):
+    """Raised without sending a request while the circuit breaker is open."""
+    pass
+
+
+class DeadlineExceededError(APIError):
+    """Raised instead of sending (or finishing) a request once the --deadline has passed."""
+    pass
+
+
+class ClientStats:
+    """Thread-safe counters for the requests a client actually sends."""
+
+    RATE_LIMIT_HEADERS = {
+        "X-RateLimit-Limit": "limit",
+        "X-RateLimit-Remaining": "remaining",
+        "X-RateLimit-Reset": "reset",
+    }
+
+    def __init__(self, window: int = 1000):
+        """
+        Args:
+            window: Number of recent latencies kept for percentiles
+        """
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+        self.total_seconds = 0.0
+        self.latencies = deque(maxlen=window)
+        self.rate_limit: Dict[str, int] = {}
+
+    def observe(self, seconds: float, ok: bool, headers: Optional[Dict[str, str]] = None):
+        """Record one completed (or failed) request."""
+        with self._lock:
+            self.requests += 1
+            if not ok:
+                self.errors += 1
+            self.total_seconds += seconds
+            self.latencies.append(seconds)
+            for header, key in self.RATE_LIMIT_HEADERS.items():
+                value = (headers or {}).get(header)
+                if value is not None:
+                    try:
+                        self.rate_limit[key] = int(float(value))
+                    except ValueError:
+                        pass
+
+    def mean_latency(self) -> Optional[float]:
+        """Mean of recent request latencies in seconds."""
+        with self._lock:
+            if not self.latencies:
+                return None
+            return sum(self.latencies) / len(self.latencies)
+
+    def percentile(self, p: float) -> Optional[float]:
+        """Latency percentile (0-100) over recent requests in seconds."""
+        with self._lock:
+            latencies = list(self.latencies)
+        return percentile(latencies, p)
+
+
 class ImprovMXAPI:
     """Wrapper for ImprovMX API operations."""
 
-    def __init__(self):
-        """Initialize API client with configuration."""
+    def __init__(self, domain: Optional[str] = None):
+        """
+        Initialize API client with configuration.
+        
+        Args:
+            domain: Domain to manage (defaults to DOMAIN from .env)
+        """
+        self.domain = domain
+        self.stats = ClientStats()
+        self.breaker = CircuitBreaker(BREAKER_THRESHOLD, BREAKER_RESET)
+        # Duplicates of slow GETs; cassettes need exactly one response per request
+        self.hedger = None
+        if HEDGE_PERCENTILE > 0 and not (RECORD_PATH or REPLAY_PATH):
+            self.hedger = Hedger(HEDGE_PERCENTILE, HEDGE_BUDGET)
+        # When set (see planner.DryRunRecorder), mutating requests are
+        # recorded instead of sent
+        self.recorder = None
+        self._limits: Optional[Dict[str, int]] = None
+        self._limits_lock = threading.Lock()
         self.auth = HTTPBasicAuth("api", IMPROVMX_API_KEY)
         self.session = requests.Session()
         self.session.auth = self.auth
         self.session.headers.update({
             "Content-Type": "application/json",
-            "User-Agent": "GALIAS-CLI/1.0"
+            "User-Agent": "GALIAS-CLI/1.0",
+            "Accept-Encoding": "gzip, deflate",
+            "Connection": "keep-alive"
         })
+        if HTTP_PROXY:
+            self.session.proxies.update({"http": HTTP_PROXY, "https": HTTP_PROXY})
+        self.timeout = (HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT)
+        self.pool_size = 0
+        # Custom transport adapter (e.g. a cassette replay) replacing the pool
+        self.transport = None
+        if REPLAY_PATH:
+            self.use_transport(ReplayAdapter(open_cassette(REPLAY_PATH), speed=REPLAY_SPEED))
+        else:
+            self.ensure_pool(HTTP_POOL_MAXSIZE)
+    
+    def use_transport(self, adapter):
+        """Send every request through a custom ``requests`` transport adapter."""
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.transport = adapter
+    
+    def ensure_pool(self, size: int):
+        """
+        Make sure the connection pool can keep ``size`` connections alive.
+        
+        Batch jobs call this with their maximum concurrency so that parallel
+        requests reuse connections instead of opening and discarding extras.
+        """
+        if self.transport is not None or size <= self.pool_size:
+            return
+        if RECORD_PATH:
+            adapter = RecordingAdapter(open_cassette(RECORD_PATH),
+                                       pool_connections=HTTP_POOL_CONNECTIONS, pool_maxsize=size)
+        else:
+            adapter = HTTPAdapter(pool_connections=HTTP_POOL_CONNECTIONS, pool_maxsize=size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.pool_size = size
+    
+    def connection_stats(self) -> Dict[str, int]:
+        """
+        Connection reuse counters from the underlying urllib3 pools.
+        
+        Returns:
+            Dict with connections opened, requests sent over them and how
+            many of those requests reused an open connection
+        """
+        opened = sent = 0
+        for adapter in {id(a): a for a in self.session.adapters.values()}.values():
+            if not isinstance(adapter, HTTPAdapter):
+                continue
+            managers = [adapter.poolmanager] + list(adapter.proxy_manager.values())
+            for manager in managers:
+                for key in manager.pools.keys():
+                    pool = manager.pools.get(key)
+                    if pool is not None:
+                        opened += pool.num_connections
+                        sent += pool.num_requests
+        return {"connections": opened, "requests": sent, "reused": max(0, sent - opened)}
     
     def _make_request(self, method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
         """Make HTTP request with error handling."""
-        url = f"{API_URL}/{endpoint.lstrip('/')}"
+        if endpoint.startswith("http"):
+            url = endpoint
+        elif self.domain is None:
+            url = f"{API_URL}/{endpoint.lstrip('/')}"
+        else:
+            url = f"{IMPROVMX_API_BASE_URL}/v3/domains/{self.domain}/{endpoint.lstrip('/')}"
+        
+        if self.recorder is not None and method != "GET":
+            return self.recorder.record(method, endpoint, kwargs.get("json"))
+        
+        budget = current_deadline()
+        if budget is not None and budget.expired:
+            raise DeadlineExceededError(f"Deadline of {budget.seconds:g}s reached before {method} {endpoint}.")
+        
+        if not self.breaker.acquire(wait=BREAKER_WAIT, timeout=budget.remaining() if budget else None):
+            raise CircuitOpenError(
+                f"ImprovMX API unavailable after {self.breaker.failures} consecutive failures; "
+                f"not sending requests for {self.breaker.retry_in():.0f}s."
+            )
         
         try:
-            response = self.session.request(method, url, **kwargs)
+            start = time.perf_counter()
+            try:
+                # Requests never outlive the deadline
+                kwargs.setdefault("timeout", self.timeout if budget is None else budget.timeout(self.timeout))
+                if method == "GET" and self.hedger is not None:
+                    response = self.hedger.request(lambda: self.session.request(method, url, **kwargs))
+                else:
+                    response = self.session.request(method, url, **kwargs)
+            except requests.exceptions.RequestException:
+                self.stats.observe(time.perf_counter() - start, ok=False)
+                if budget is not None and budget.expired:
+                    # Cut short by our own deadline; says nothing about the API
+                    self.breaker.release()
+                    raise DeadlineExceededError(f"Deadline of {budget.seconds:g}s reached during {method} {endpoint}.")
+                self.breaker.record(ok=False)
+                raise
+            except BaseException:
+                self.breaker.release()
+                raise
+            self.stats.observe(
+                time.perf_counter() - start,
+                ok=response.status_code < 500,
+                headers=response.headers
+            )
+            self.breaker.record(ok=response.status_code < 500)
             
             # Handle specific HTTP status codes
             if response.status_code == 401:
@@ -71,12 +281,20 @@ class ImprovMXAPI:
                 try:
                     error_data = response.json()
                     if "limit" in error_data.get("message", "").lower():
+                        # Only use limits already known; fetching them here
+                        # could recurse into this error path
+                        limit = (self._limits or {}).get("aliases")
                         raise LimitReachedError(
-                            f"Alias limit reached ({MAX_ALIASES} aliases max)."
+                            f"Alias limit reached ({limit} aliases max)." if limit
+                            else "Alias limit reached."
                         )
                 except ValueError:
                     pass
                 raise APIError(f"Bad request: {response.text}")
+            elif response.status_code == 429:
+                raise RateLimitError(f"API error (429): {response.text}")
+            elif response.status_code >= 500:
+                raise ServerError(f"API error ({response.status_code}): {response.text}")
             elif not response.ok:
                 raise APIError(f"API error ({response.status_code}): {response.text}")
             
@@ -102,6 +320,174 @@ class ImprovMXAPI:
         """
         return self._make_request("GET", "aliases")
     
+    def iter_aliases(self, meta: Optional[Dict[str, Any]] = None) -> Iterator[Alias]:
+        """
+        Iterate over every alias of the domain, following pagination.
+        
+        Args:
+            meta: If given, filled with the first page's top-level fields
+                other than ``aliases`` (``total``, ``limit``, ...)
+        
+        Yields:
+            Alias records
+        """
+        page = 1
+        seen = 0
+        while True:
+            data = self._make_request("GET", "aliases", params={"page": page})
+            if meta is not None and page == 1:
+                meta.update((key, value) for key, value in data.items() if key != "aliases")
+            aliases = data.get("aliases", [])
+            for alias in aliases:
+                yield Alias.from_dict(alias)
+            seen += len(aliases)
+            total = data.get("total")
+            if not aliases or total is None or seen >= total:
+                return
+            page += 1
+    
+    def iter_logs(self, alias: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over the delivery logs of the domain (or one alias), newest
+        first, fetching the next page only when the previous one is used up.
+        
+        Args:
+            alias: Only logs of this alias
+        
+        Yields:
+            Log entries as returned by the API
+        """
+        endpoint = f"logs/{alias}" if alias else "logs"
+        cursor = None
+        while True:
+            params = {"next_cursor": cursor} if cursor else None
+            data = self._make_request("GET", endpoint, params=params)
+            entries = data.get("logs", [])
+            for entry in entries:
+                yield entry
+            cursor = data.get("next_cursor")
+            if not entries or not cursor:
+                return
+    
+    def get_aliases(self) -> AliasSet:
+        """
+        Get every alias of the domain as typed records.
+        
+        Returns:
+            AliasSet with O(1) lookup by name, keeping the listing's
+            envelope fields in ``meta``
+        """
+        meta: Dict[str, Any] = {}
+        return AliasSet(self.iter_aliases(meta), meta=meta)
+    
+    def prefetch_aliases(self) -> "Future[AliasSet]":
+        """
+        Start fetching every alias on a background thread.
+        
+        Lets interactive commands hide the listing behind prompt time.
+        
+        Returns:
+            Future resolving to the AliasSet (or raising the request error)
+        """
+        future: Future = Future()
+        
+        def _fetch():
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                aliases = self.get_aliases()
+            except BaseException as e:
+                future.set_exception(e)
+                return
+            future.set_result(aliases)
+            # Warm the limits for the count display while we're at it; the
+            # caller looks them up again, so a failure here only costs time
+            try:
+                self.alias_limit()
+            except Exception:
+                pass
+        
+        threading.Thread(target=_fetch, name="galias-prefetch", daemon=True).start()
+        return future
+    
+    def get_account_limits(self) -> Dict[str, int]:
+        """
+        Fetch the plan limits of the account.
+        
+        Returns:
+            Dict of limit name (e.g. "aliases", "domains") to value
+        """
+        data = self._make_request("GET", f"{IMPROVMX_API_BASE_URL}/v3/account")
+        account = data.get("account")
+        limits = account.get("limits") if isinstance(account, dict) else None
+        if not isinstance(limits, dict):
+            return {}
+        return {name: int(value) for name, value in limits.items() if isinstance(value, (int, float))}
+    
+    def limits(self) -> Dict[str, int]:
+        """
+        Account limits, cached in memory and in the local store for LIMITS_TTL.
+        
+        Falls back to a stale cached copy, then to MAX_ALIASES, when the API
+        cannot be reached, so callers never fail because of this lookup.
+        
+        Returns:
+            Dict of limit name to value (always contains "aliases")
+        """
+        with self._limits_lock:
+            if self._limits is not None:
+                return self._limits
+            
+            cached = stale = None
+            try:
+                with AliasStore() as store:
+                    cached = store.limits(max_age=LIMITS_TTL)
+                    stale = cached or store.limits()
+            except (sqlite3.Error, OSError):
+                pass
+            
+            limits = cached
+            if limits is None:
+                try:
+                    limits = self.get_account_limits()
+                except APIError:
+                    limits = stale
+                else:
+                    try:
+                        with AliasStore() as store:
+                            store.put_limits(limits)
+                    except (sqlite3.Error, OSError):
+                        pass
+            
+            limits = dict(limits or {})
+            limits.setdefault("aliases", MAX_ALIASES)
+            self._limits = limits
+            return limits
+    
+    def alias_limit(self) -> int:
+        """Maximum number of aliases per domain on this account."""
+        return self.limits()["aliases"]
+    
+    def list_domains(self) -> List[str]:
+        """
+        Get the names of all domains on the account.
+        
+        Returns:
+            List of domain names
+        """
+        domains = []
+        page = 1
+        while True:
+            data = self._make_request(
+                "GET", f"{IMPROVMX_API_BASE_URL}/v3/domains", params={"page": page}
+            )
+            batch = data.get("domains", [])
+            domains.extend(d["domain"] for d in batch)
+            total = data.get("total")
+            if not batch or total is None or len(domains) >= total:
+                return domains
+            page += 1
+    
     def add_alias(self, alias: str, forward: str) -> Dict[str, Any]:
         """
         Create a new alias.
@@ -119,6 +505,19 @@ class ImprovMXAPI:
         }
         return self._make_request("POST", "aliases", json=data)
     
+    def update_alias(self, alias: str, forward: str) -> Dict[str, Any]:
+        """
+        Change the forward address of an existing alias.
+        
+        Args:
+            alias: The alias name to update
+            forward: New email address to forward to
+            
+        Returns:
+            Dict containing the updated alias data
+        """
+        return self._make_request("PUT", f"aliases/{alias}", json={"forward": forward})
+    
     def delete_alias(self, alias: str) -> Dict[str, Any]:
         """
         Delete an existing alias.
@@ -131,6 +530,28 @@ class ImprovMXAPI:
         """
         return self._make_request("DELETE", f"aliases/{alias}")
     
+    def batch(self, workers: Optional[int] = None, on_result=None) -> "Batcher":
+        """
+        Collect alias changes and send them together.
+        
+        Usage::
+        
+            with api.batch() as b:
+                b.add("new", "me@example.com")
+                b.delete("old")
+            report = b.report()
+        
+        Args:
+            workers: Initial number of concurrent requests
+            on_result: Optional callback invoked as each operation completes
+            
+        Returns:
+            batch.Batcher that sends its planned operations when the block exits
+        """
+        # batch imports this module's errors
+        from batch import Batcher
+        return Batcher(self, workers=workers, on_result=on_result)
+    
     def get_alias_count(self) -> int:
         """
         Get the current number of aliases.
@@ -140,7 +561,9 @@ class ImprovMXAPI:
         """
         data = self.list_aliases()
         aliases = data.get("aliases", [])
-        return len(aliases)
+        # The listing is paginated; its total covers every page
+        total = data.get("total")
+        return int(total) if isinstance(total, (int, float)) else len(aliases)
 
 
 # Global API instance
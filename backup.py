@@ -0,0 +1,272 @@
+"""Compressed incremental alias backups for GALIAS CLI.
+
+Snapshots are JSONL files under ``GALIAS_HOME/backups/<domain>``. The first
+line of each file is a header; every following line is either a ``put``
+(alias record as returned by the API) or a ``del`` (alias name). A full
+snapshot contains only puts and resets the state, a delta snapshot is
+applied on top of the state left by the snapshots before it.
+"""
+
+import gzip
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple, Iterator, Iterable
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+from config import GALIAS_HOME, DOMAIN, BACKUP_KEEP
+from batch import Operation
+from models import Alias, AliasSet
+
+
+TIMESTAMP_FORMAT = "%Y%m%dT%H%M%S%fZ"
+
+
+class BackupError(Exception):
+    """Raised when a backup cannot be written, read or restored."""
+    pass
+
+
+class Snapshot:
+    """A single backup file on disk."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        parts = self.path.name.split(".")
+        if len(parts) < 4 or parts[1] not in ("full", "delta"):
+            raise BackupError(f"Not a backup file: {self.path.name}")
+        self.timestamp = datetime.strptime(parts[0], TIMESTAMP_FORMAT).replace(tzinfo=timezone.utc)
+        self.kind = parts[1]
+
+    @property
+    def is_full(self) -> bool:
+        return self.kind == "full"
+
+    def __repr__(self):
+        return f"Snapshot({self.path.name!r})"
+
+
+def backup_dir(domain: str = None) -> Path:
+    """Directory holding the snapshots for a domain."""
+    return GALIAS_HOME / "backups" / (domain or DOMAIN)
+
+
+def default_extension() -> str:
+    """Use zstd when the zstandard package is installed, gzip otherwise."""
+    return ".zst" if zstandard is not None else ".gz"
+
+
+def _open(path: Path, mode: str):
+    """Open a compressed snapshot in text mode."""
+    if path.suffix == ".zst":
+        if zstandard is None:
+            raise BackupError(f"{path.name} is zstd-compressed but 'zstandard' is not installed")
+        return zstandard.open(path, mode + "t", encoding="utf-8")
+    return gzip.open(path, mode + "t", encoding="utf-8")
+
+
+def list_snapshots(directory: Path = None) -> List[Snapshot]:
+    """Return all snapshots in a directory, oldest first."""
+    directory = Path(directory) if directory else backup_dir()
+    if not directory.exists():
+        return []
+    snapshots = []
+    for path in directory.iterdir():
+        try:
+            snapshots.append(Snapshot(path))
+        except (BackupError, ValueError):
+            continue
+    # A full snapshot sharing a delta's timestamp was folded from it by
+    # compact(); it comes first so the state never goes back to before the delta
+    return sorted(snapshots, key=lambda s: (s.timestamp, not s.is_full))
+
+
+def read_snapshot(snapshot: Snapshot) -> Tuple[Dict[str, Any], Iterator[Dict[str, Any]]]:
+    """
+    Read a snapshot file.
+
+    Returns:
+        Tuple of (header, iterator over records)
+    """
+    handle = _open(snapshot.path, "r")
+    try:
+        header = json.loads(handle.readline())
+    except ValueError as e:
+        handle.close()
+        raise BackupError(f"Corrupt snapshot {snapshot.path.name}: {e}")
+
+    def records():
+        with handle:
+            for line in handle:
+                if line.strip():
+                    yield json.loads(line)
+
+    return header, records()
+
+
+def apply_snapshot(state: Dict[str, Dict[str, Any]], snapshot: Snapshot):
+    """Apply a snapshot's records to an alias state in place."""
+    _, records = read_snapshot(snapshot)
+    if snapshot.is_full:
+        state.clear()
+    for record in records:
+        if record["op"] == "put":
+            state[record["alias"]["alias"]] = record["alias"]
+        elif record["op"] == "del":
+            state.pop(record["alias"], None)
+
+
+def state_at(snapshots: List[Snapshot], at: Optional[datetime] = None) -> Tuple[Dict[str, Dict[str, Any]], Optional[Snapshot]]:
+    """
+    Reconstruct the alias state as of a point in time.
+
+    Args:
+        snapshots: Snapshots sorted oldest first
+        at: Point in time (defaults to the latest snapshot)
+
+    Returns:
+        Tuple of (alias name -> record, snapshot the state was taken from)
+    """
+    chosen = [s for s in snapshots if at is None or s.timestamp <= at]
+    if not chosen:
+        return {}, None
+
+    start = 0
+    for index in range(len(chosen) - 1, -1, -1):
+        if chosen[index].is_full:
+            start = index
+            break
+
+    state = {}
+    for snapshot in chosen[start:]:
+        apply_snapshot(state, snapshot)
+    return state, chosen[-1]
+
+
+def compute_delta(previous: Dict[str, Dict[str, Any]], current: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Return the records that turn ``previous`` into ``current``."""
+    records = []
+    for name, alias in current.items():
+        if previous.get(name) != alias:
+            records.append({"op": "put", "alias": alias})
+    for name in previous:
+        if name not in current:
+            records.append({"op": "del", "alias": name})
+    return records
+
+
+def write_snapshot(directory: Path, kind: str, records: List[Dict[str, Any]],
+                   timestamp: datetime, extension: str = None) -> Snapshot:
+    """Write a snapshot file and return it."""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    name = f"{timestamp.strftime(TIMESTAMP_FORMAT)}.{kind}.jsonl{extension or default_extension()}"
+    path = directory / name
+    tmp_path = directory / (".tmp-" + name)
+
+    header = {
+        "kind": kind,
+        "timestamp": timestamp.isoformat(),
+        "records": len(records),
+    }
+    with _open(tmp_path, "w") as handle:
+        handle.write(json.dumps(header) + "\n")
+        for record in records:
+            handle.write(json.dumps(record, sort_keys=True) + "\n")
+    tmp_path.replace(path)
+    return Snapshot(path)
+
+
+def create_backup(aliases: Iterable[Alias], directory: Path = None, full: bool = False,
+                  now: Optional[datetime] = None) -> Optional[Snapshot]:
+    """
+    Store the current aliases as a delta against the previous snapshot.
+
+    A full snapshot is written when there is no previous snapshot or when
+    ``full`` is set. Nothing is written when the state is unchanged.
+
+    Returns:
+        The written snapshot, or None if there was nothing to store
+    """
+    directory = Path(directory) if directory else backup_dir()
+    now = now or datetime.now(timezone.utc)
+    current = {alias.alias: alias.to_dict() for alias in aliases}
+    snapshots = list_snapshots(directory)
+
+    if full or not snapshots:
+        records = [{"op": "put", "alias": alias} for alias in current.values()]
+        return write_snapshot(directory, "full", records, now)
+
+    previous, _ = state_at(snapshots)
+    records = compute_delta(previous, current)
+    if not records:
+        return None
+    return write_snapshot(directory, "delta", records, now)
+
+
+def compact(directory: Path = None, keep: int = BACKUP_KEEP) -> int:
+    """
+    Apply the retention policy: keep the newest ``keep`` snapshots.
+
+    The oldest retained snapshot is rewritten as a full snapshot (folding in
+    every delta before it) so that older files can be deleted.
+
+    Returns:
+        Number of files removed
+    """
+    directory = Path(directory) if directory else backup_dir()
+    snapshots = list_snapshots(directory)
+    if keep < 1 or len(snapshots) <= keep:
+        return 0
+
+    oldest_kept = snapshots[-keep]
+    if not oldest_kept.is_full:
+        state, _ = state_at(snapshots, oldest_kept.timestamp)
+        records = [{"op": "put", "alias": alias} for alias in state.values()]
+        write_snapshot(directory, "full", records, oldest_kept.timestamp,
+                       extension=oldest_kept.path.suffix)
+        oldest_kept.path.unlink()
+
+    removed = 0
+    for snapshot in snapshots[:-keep]:
+        # A full snapshot at the kept timestamp is the one just written
+        if snapshot.timestamp < oldest_kept.timestamp:
+            snapshot.path.unlink()
+            removed += 1
+    return removed
+
+
+def parse_timestamp(value: str) -> datetime:
+    """Parse an ISO 8601 timestamp; naive values are taken as UTC."""
+    try:
+        parsed = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+    except ValueError:
+        raise BackupError(f"Invalid timestamp: {value} (expected ISO 8601, e.g. 2025-01-31T12:00)")
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def plan_restore(live: AliasSet, target: Dict[str, Dict[str, Any]]) -> List[Operation]:
+    """
+    Compute the minimal operations turning the live aliases into ``target``.
+
+    Deletes come first so that capacity is freed before anything is added.
+    """
+    deletes, updates, adds = [], [], []
+
+    for name in live.names():
+        if name not in target:
+            deletes.append(Operation("delete", name))
+    for name, alias in target.items():
+        existing = live.get(name)
+        if existing is None:
+            adds.append(Operation("add", name, alias.get("forward")))
+        elif existing.forward != alias.get("forward"):
+            updates.append(Operation("update", name, alias.get("forward")))
+
+    return deletes + updates + adds
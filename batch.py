@@ -0,0 +1,488 @@
+"""Concurrent execution of alias operations for GALIAS CLI."""
+
+import json
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Dict, List, Any, Optional, Callable, Iterable, Tuple
+
+from api import RateLimitError, ServerError, NetworkError
+from config import BATCH_WORKERS, BATCH_MAX_WORKERS
+from deadline import deadline_expired, clip_to_deadline
+
+# Errors that mean the API is overloaded rather than the request being wrong
+OVERLOAD_ERRORS = (RateLimitError, ServerError, NetworkError)
+# Operations a stream may hold back behind busy aliases before reading pauses
+STREAM_BACKLOG = 1000
+
+
+class Operation:
+    """A single alias change to apply through the API."""
+
+    ACTIONS = ("add", "update", "delete")
+
+    def __init__(self, action: str, alias: str, forward: Optional[str] = None):
+        if action not in self.ACTIONS:
+            raise ValueError(f"Unknown operation: {action}")
+        self.action = action
+        self.alias = alias
+        self.forward = forward
+
+    def apply(self, api) -> Dict[str, Any]:
+        """Send this operation using the given API client."""
+        if self.action == "add":
+            return api.add_alias(self.alias, self.forward)
+        elif self.action == "update":
+            return api.update_alias(self.alias, self.forward)
+        return api.delete_alias(self.alias)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the operation for JSON output or storage."""
+        data = {"action": self.action, "alias": self.alias}
+        if self.forward is not None:
+            data["forward"] = self.forward
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Operation":
+        """Rebuild an operation from its serialized form."""
+        return cls(data["action"], data["alias"], data.get("forward"))
+
+    def __eq__(self, other):
+        return isinstance(other, Operation) and self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        if self.forward is None:
+            return f"Operation({self.action!r}, {self.alias!r})"
+        return f"Operation({self.action!r}, {self.alias!r}, {self.forward!r})"
+
+
+class OperationResult:
+    """Outcome of a single operation in a batch."""
+
+    def __init__(self, operation: Operation, response: Optional[Dict[str, Any]] = None,
+                 error: Optional[Exception] = None):
+        self.operation = operation
+        self.response = response
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = self.operation.to_dict()
+        data["ok"] = self.ok
+        if self.error is not None:
+            data["error"] = str(self.error)
+        return data
+
+
+class ConcurrencyController:
+    """
+    AIMD window for the number of requests a batch keeps in flight.
+
+    The window grows by about one request per round trip of successes while
+    latency stays close to the best observed, and halves on 429, 5xx or
+    network errors. Only one decrease happens per round trip, so a burst of
+    failures from the same overload counts as a single signal.
+    """
+
+    # Latency above max(best * TOLERANCE, best + SLACK) stops the window growing
+    LATENCY_TOLERANCE = 2.0
+    LATENCY_SLACK = 0.05
+    DECREASE = 0.5
+
+    def __init__(self, initial: int = None, maximum: int = None, minimum: int = 1):
+        """
+        Args:
+            initial: Starting window (defaults to BATCH_WORKERS)
+            maximum: Largest window (defaults to BATCH_MAX_WORKERS, at least initial)
+            minimum: Smallest window
+        """
+        initial = max(1, BATCH_WORKERS if initial is None else initial)
+        self.maximum = max(initial, BATCH_MAX_WORKERS if maximum is None else maximum)
+        self.minimum = max(1, min(minimum, initial))
+        self._window = float(initial)
+        self._lock = threading.Lock()
+        self._best_latency: Optional[float] = None
+        self._smoothed_latency: Optional[float] = None
+        self._hold_until = 0.0
+        self.started = time.monotonic()
+        self.completed = 0
+        self.backoffs = 0
+
+    @property
+    def window(self) -> int:
+        """Number of requests currently allowed in flight."""
+        return int(self._window)
+
+    def observe(self, latency: float, error: Optional[Exception] = None, now: float = None):
+        """Feed the outcome of one request into the window."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self.completed += 1
+            if isinstance(error, OVERLOAD_ERRORS):
+                if now >= self._hold_until:
+                    self._window = max(float(self.minimum), self._window * self.DECREASE)
+                    self.backoffs += 1
+                    self._hold_until = now + (self._smoothed_latency or latency)
+                return
+
+            if self._smoothed_latency is None:
+                self._smoothed_latency = latency
+            else:
+                self._smoothed_latency = 0.8 * self._smoothed_latency + 0.2 * latency
+            if self._best_latency is None or latency < self._best_latency:
+                self._best_latency = latency
+
+            # Client errors (404, 409, ...) say nothing about API health
+            healthy = latency <= max(self._best_latency * self.LATENCY_TOLERANCE,
+                                     self._best_latency + self.LATENCY_SLACK)
+            if error is None and healthy and now >= self._hold_until:
+                self._window = min(float(self.maximum), self._window + 1.0 / self._window)
+
+    def rate(self, now: float = None) -> float:
+        """Completed operations per second since the controller was created."""
+        elapsed = (time.monotonic() if now is None else now) - self.started
+        return self.completed / elapsed if elapsed > 0 else 0.0
+
+
+def run_operations(
+    api,
+    operations: Iterable[Operation],
+    workers: int = None,
+    on_result: Optional[Callable[[OperationResult], None]] = None,
+    controller: Optional[ConcurrencyController] = None
+) -> List[OperationResult]:
+    """
+    Apply operations concurrently and collect their results.
+
+    Errors are captured per operation rather than aborting the batch. The
+    number of requests in flight follows ``controller``'s window. Once the
+    command's deadline has passed, operations not yet started are dropped
+    and have no result.
+
+    Args:
+        api: ImprovMXAPI instance shared by all workers
+        operations: Operations to apply
+        workers: Initial concurrency when no controller is given
+        on_result: Optional callback invoked as each operation completes
+        controller: Concurrency controller (a new one starting at ``workers``
+            by default)
+
+    Returns:
+        Results in completion order
+    """
+    if controller is None:
+        controller = ConcurrencyController(workers)
+    pending = deque(operations)
+    results = []
+    if not pending:
+        return results
+
+    def _apply(op: Operation) -> OperationResult:
+        start = time.perf_counter()
+        try:
+            result = OperationResult(op, response=op.apply(api))
+        except Exception as e:
+            result = OperationResult(op, error=e)
+        controller.observe(time.perf_counter() - start, result.error)
+        return result
+
+    with ThreadPoolExecutor(max_workers=controller.maximum) as executor:
+        running = set()
+        try:
+            while pending or running:
+                if deadline_expired():
+                    pending.clear()
+                while pending and len(running) < controller.window:
+                    running.add(executor.submit(_apply, pending.popleft()))
+                if not running:
+                    break
+                done, running = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    result = future.result()
+                    results.append(result)
+                    if on_result is not None:
+                        on_result(result)
+        except BaseException:
+            # Ctrl-C: don't send anything that hasn't started yet
+            pending.clear()
+            for future in running:
+                future.cancel()
+            raise
+
+    return results
+
+
+def run_phased(
+    api,
+    operations: Iterable[Operation],
+    workers: int = None,
+    on_result: Optional[Callable[[OperationResult], None]] = None,
+    controller: Optional[ConcurrencyController] = None
+) -> List[OperationResult]:
+    """Run all deletes before any other operation so that capacity is freed first."""
+    if controller is None:
+        controller = ConcurrencyController(workers)
+    operations = [op for op in operations]
+    deletes = [op for op in operations if op.action == "delete"]
+    others = [op for op in operations if op.action != "delete"]
+    results = run_operations(api, deletes, on_result=on_result, controller=controller)
+    results.extend(run_operations(api, others, on_result=on_result, controller=controller))
+    return results
+
+
+def coalesce(operations: Iterable[Operation]) -> Tuple[List[Operation], List[str]]:
+    """
+    Reduce operations to the fewest requests with the same end state.
+    
+    An alias' first operation tells whether it exists beforehand (an add means
+    it does not, an update or delete that it does) and its last one what is
+    left afterwards. That gives at most one request per alias: an add followed
+    by a delete sends nothing, a delete followed by an add becomes one update,
+    and repeated forward changes collapse into the last.
+    
+    Returns:
+        Tuple of (operations in order of each alias' first appearance,
+        aliases whose operations cancelled out)
+    """
+    # Alias -> [existed before, forward afterwards or None if absent]
+    net: Dict[str, List[Any]] = {}
+    for op in operations:
+        state = net.setdefault(op.alias, [op.action != "add", None])
+        state[1] = None if op.action == "delete" else op.forward
+    
+    planned, cancelled = [], []
+    for alias, (existed, forward) in net.items():
+        if forward is None:
+            if existed:
+                planned.append(Operation("delete", alias))
+            else:
+                cancelled.append(alias)
+        else:
+            planned.append(Operation("update" if existed else "add", alias, forward))
+    return planned, cancelled
+
+
+class Batcher:
+    """
+    Collects alias operations and sends them as one planned batch.
+    
+    Used through ``ImprovMXAPI.batch()``::
+    
+        with api.batch() as b:
+            b.delete("old")
+            b.add("new", "me@example.com")
+        print(b.report())
+    
+    Nothing is sent until the block exits; if it raises, nothing is sent at
+    all. Operations are reduced with ``coalesce`` and run with
+    ``run_phased``, so deletes free capacity before any add. Failed
+    operations are reported rather than raised.
+    """
+    
+    def __init__(self, api, workers: int = None,
+                 on_result: Optional[Callable[[OperationResult], None]] = None):
+        """
+        Args:
+            api: ImprovMXAPI instance the operations are sent with
+            workers: Initial concurrency (defaults to BATCH_WORKERS)
+            on_result: Optional callback invoked as each operation completes
+        """
+        self.api = api
+        self.workers = workers
+        self.on_result = on_result
+        self.operations: List[Operation] = []
+        self.planned: List[Operation] = []
+        self.cancelled: List[str] = []
+        self.results: List[OperationResult] = []
+        self.controller: Optional[ConcurrencyController] = None
+    
+    def add(self, alias: str, forward: str) -> "Batcher":
+        self.operations.append(Operation("add", alias, forward))
+        return self
+    
+    def update(self, alias: str, forward: str) -> "Batcher":
+        self.operations.append(Operation("update", alias, forward))
+        return self
+    
+    def delete(self, alias: str) -> "Batcher":
+        self.operations.append(Operation("delete", alias))
+        return self
+    
+    def execute(self) -> List[OperationResult]:
+        """Send the collected operations; called when the ``with`` block exits."""
+        self.planned, self.cancelled = coalesce(self.operations)
+        self.controller = ConcurrencyController(self.workers)
+        self.api.ensure_pool(self.controller.maximum)
+        self.results = run_phased(self.api, self.planned, on_result=self.on_result,
+                                  controller=self.controller)
+        return self.results
+    
+    @property
+    def failed(self) -> List[OperationResult]:
+        return [result for result in self.results if not result.ok]
+    
+    def report(self) -> Dict[str, Any]:
+        """Consolidated outcome of the batch as a JSON-serializable dict."""
+        return {
+            "requested": len(self.operations),
+            "sent": len(self.planned),
+            "cancelled": self.cancelled,
+            "succeeded": len(self.results) - len(self.failed),
+            "failed": len(self.failed),
+            # Dropped when the deadline passed
+            "not_sent": len(self.planned) - len(self.results),
+            "results": [result.to_dict() for result in self.results],
+        }
+    
+    def __enter__(self) -> "Batcher":
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.execute()
+        return False
+
+
+def parse_operation(line: str) -> Optional[Operation]:
+    """
+    Parse one line of an operation stream.
+    
+    Accepts ``add NAME FORWARD``, ``update NAME FORWARD`` and ``delete NAME``,
+    or the JSON object written by ``Operation.to_dict``.
+    
+    Returns:
+        The operation, or None for blank lines and ``#`` comments
+    
+    Raises:
+        ValueError: If the line is not a valid operation
+    """
+    line = line.strip()
+    if not line or line.startswith("#"):
+        return None
+    
+    if line.startswith("{"):
+        try:
+            data = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON: {e.msg}")
+        if not isinstance(data, dict) or not data.get("action") or not data.get("alias"):
+            raise ValueError('JSON operations need "action" and "alias"')
+        op = Operation.from_dict(data)
+    else:
+        parts = line.split()
+        if len(parts) not in (2, 3):
+            raise ValueError(f"Expected 'ACTION ALIAS [FORWARD]', got {line!r}")
+        op = Operation(parts[0].lower(), *parts[1:])
+    
+    if op.action == "delete":
+        op.forward = None
+    elif not op.forward:
+        raise ValueError(f"{op.action} {op.alias} needs a forward address")
+    return op
+
+
+def run_stream(
+    api,
+    operations: Iterable[Operation],
+    on_result: Callable[[int, OperationResult], None],
+    controller: Optional[ConcurrencyController] = None,
+    backlog: int = STREAM_BACKLOG
+):
+    """
+    Apply operations while they are still being read.
+    
+    Operations on different aliases run concurrently within ``controller``'s
+    window. Operations on the same alias run one after another in input
+    order: a worker that finishes one goes on with the next queued for that
+    alias. Reading pauses while the window is full or ``backlog`` operations
+    are queued, so memory stays bounded however long the stream is. Once the
+    command's deadline has passed, nothing more is read or started.
+    
+    Args:
+        api: ImprovMXAPI instance shared by all workers
+        operations: Operations, possibly produced lazily (e.g. from stdin)
+        on_result: Called with the operation's position in the stream and its
+            result as soon as it completes; called from worker threads
+        controller: Concurrency controller (a new one by default)
+        backlog: Most operations held back behind busy aliases
+    """
+    if controller is None:
+        controller = ConcurrencyController()
+    cond = threading.Condition()
+    # Alias -> operations queued behind the one in flight; present while busy
+    waiting: Dict[str, deque] = {}
+    state = {"running": 0, "queued": 0}
+    failures: List[BaseException] = []
+    
+    def _drain(alias: str, index: int, op: Operation):
+        while True:
+            start = time.perf_counter()
+            try:
+                result = OperationResult(op, response=op.apply(api))
+            except Exception as e:
+                result = OperationResult(op, error=e)
+            controller.observe(time.perf_counter() - start, result.error)
+            try:
+                on_result(index, result)
+            except BaseException as e:
+                # e.g. a closed stdout: stop the stream instead of hanging it
+                with cond:
+                    failures.append(e)
+                    for queue in waiting.values():
+                        queue.clear()
+                    state["queued"] = 0
+            
+            with cond:
+                queue = waiting[alias]
+                if queue and deadline_expired():
+                    state["queued"] -= len(queue)
+                    queue.clear()
+                if queue:
+                    index, op = queue.popleft()
+                    state["queued"] -= 1
+                    cond.notify_all()
+                    continue
+                del waiting[alias]
+                state["running"] -= 1
+                cond.notify_all()
+                return
+    
+    with ThreadPoolExecutor(max_workers=controller.maximum) as executor:
+        try:
+            for index, op in enumerate(operations):
+                if deadline_expired():
+                    break
+                with cond:
+                    while not failures and not deadline_expired():
+                        queue = waiting.get(op.alias)
+                        if queue is not None and state["queued"] < backlog:
+                            queue.append((index, op))
+                            state["queued"] += 1
+                            break
+                        if queue is None and state["running"] < controller.window:
+                            waiting[op.alias] = deque()
+                            state["running"] += 1
+                            executor.submit(_drain, op.alias, index, op)
+                            break
+                        # Woken by completions; the timeout notices the deadline
+                        cond.wait(clip_to_deadline(1.0))
+                if failures or deadline_expired():
+                    break
+            with cond:
+                while waiting:
+                    cond.wait()
+        except BaseException:
+            # Ctrl-C: let requests in flight finish but send nothing queued
+            with cond:
+                for queue in waiting.values():
+                    queue.clear()
+                state["queued"] = 0
+            raise
+    
+    if failures:
+        raise failures[0]
@@ -0,0 +1,131 @@
+"""Circuit breaker for the GALIAS API client.
+
+After ``threshold`` consecutive failed requests (connection errors, timeouts
+and 5xx responses) the circuit opens. While it is open, requests are refused
+immediately instead of each one waiting for its own timeout. A client can
+also be set to wait, in which case requests are held until the next probe.
+Once ``reset_timeout`` has passed, one request is let through as a probe
+("half-open"). If it succeeds the circuit closes; if it fails, the circuit
+opens for another ``reset_timeout``.
+
+One breaker belongs to one ``ImprovMXAPI`` client and is shared by every
+thread using it, such as the workers of a batch job.
+"""
+
+import threading
+import time
+from typing import Dict, Any, Callable, Optional
+
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+# Numeric state for metrics
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitBreaker:
+    """Thread-safe closed/open/half-open state machine."""
+
+    def __init__(self, threshold: int = 5, reset_timeout: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            threshold: Consecutive failures that open the circuit (0 disables it)
+            reset_timeout: Seconds the circuit stays open before a probe
+            clock: Monotonic time source (for tests)
+        """
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._cond = threading.Condition()
+        self.state = CLOSED
+        self.failures = 0
+        self.opens = 0
+        self.rejected = 0
+        self._opened_at = 0.0
+        self._probing = False
+
+    def _refresh(self, now: float):
+        if self.state == OPEN and now >= self._opened_at + self.reset_timeout:
+            self.state = HALF_OPEN
+            self._probing = False
+
+    def acquire(self, wait: bool = False, timeout: Optional[float] = None) -> bool:
+        """
+        Ask to send a request.
+
+        Args:
+            wait: Block until the circuit lets a request through instead of
+                refusing straight away
+            timeout: Longest time to block when waiting
+
+        Returns:
+            True if the request may be sent (the caller must then report the
+            outcome with ``record`` or ``release``), False if it is refused
+        """
+        if not self.threshold:
+            return True
+        deadline = None if timeout is None else self._clock() + timeout
+        with self._cond:
+            while True:
+                now = self._clock()
+                self._refresh(now)
+                if self.state == CLOSED:
+                    return True
+                if self.state == HALF_OPEN and not self._probing:
+                    self._probing = True
+                    return True
+                if not wait or (deadline is not None and now >= deadline):
+                    self.rejected += 1
+                    return False
+                # Wake up for the probe, or when the probe in flight reports
+                pause = self._opened_at + self.reset_timeout - now if self.state == OPEN else self.reset_timeout
+                if deadline is not None:
+                    pause = min(pause, deadline - now)
+                self._cond.wait(max(pause, 0.001))
+
+    def record(self, ok: bool):
+        """Report the outcome of a request let through by ``acquire``."""
+        if not self.threshold:
+            return
+        with self._cond:
+            if ok:
+                self.failures = 0
+                if self.state != CLOSED:
+                    self.state = CLOSED
+                    self._cond.notify_all()
+            else:
+                self.failures += 1
+                if self.state == HALF_OPEN or (self.state == CLOSED and self.failures >= self.threshold):
+                    self.state = OPEN
+                    self._opened_at = self._clock()
+                    self.opens += 1
+                    self._cond.notify_all()
+            self._probing = False
+
+    def release(self):
+        """Give back a request that ended without telling anything about the API."""
+        with self._cond:
+            if self._probing:
+                self._probing = False
+                self._cond.notify_all()
+
+    def retry_in(self) -> float:
+        """Seconds until the next probe may be sent (0 unless open)."""
+        with self._cond:
+            if self.state != OPEN:
+                return 0.0
+            return max(0.0, self._opened_at + self.reset_timeout - self._clock())
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current state and counters."""
+        with self._cond:
+            self._refresh(self._clock())
+            return {
+                "state": self.state,
+                "failures": self.failures,
+                "opens": self.opens,
+                "rejected": self.rejected,
+            }
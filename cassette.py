@@ -0,0 +1,202 @@
+"""HTTP record/replay transport for GALIAS CLI.
+
+A cassette is a JSONL file: a header line followed by one line per
+request/response pair. ``RecordingAdapter`` sends requests for real and
+appends what happened (including how long it took) to a cassette;
+``ReplayAdapter`` answers requests from a cassette without touching the
+network, optionally sleeping for the recorded (or scaled) duration. Both are
+``requests`` transport adapters, so the whole client stack - sessions,
+error mapping, stats - runs unchanged.
+
+Set ``GALIAS_RECORD=path`` or ``GALIAS_REPLAY=path`` (with
+``GALIAS_REPLAY_SPEED``, e.g. ``0`` for instant or ``2`` for half as fast)
+to make every ``ImprovMXAPI`` client use a cassette.
+"""
+
+import json
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from config import IMPROVMX_API_KEY
+
+
+REDACTED = "REDACTED"
+FORMAT_VERSION = 1
+
+# Never written to a cassette
+SECRET_HEADERS = {"authorization", "proxy-authorization", "cookie"}
+# Describe the wire encoding of the recorded body, which is stored decoded
+ENCODING_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+
+class CassetteError(Exception):
+    """Raised when a cassette cannot be read or has no matching interaction."""
+    pass
+
+
+def redact(text: Optional[str]) -> Optional[str]:
+    """Remove the API key from a URL or body."""
+    if text is None or not IMPROVMX_API_KEY:
+        return text
+    return text.replace(IMPROVMX_API_KEY, REDACTED)
+
+
+def _body_text(body: Any) -> Optional[str]:
+    if body is None:
+        return None
+    if isinstance(body, bytes):
+        return body.decode("utf-8", errors="replace")
+    return str(body)
+
+
+def _key(method: str, url: str, body: Optional[str]) -> Tuple[str, str, str]:
+    return (method.upper(), redact(url), redact(body) or "")
+
+
+class Cassette:
+    """Interactions of one cassette file, appended to as they are recorded."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def append(self, interaction: Dict[str, Any]):
+        """Write one interaction, creating the file with its header if needed."""
+        with self._lock:
+            new = not self.path.exists()
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as handle:
+                if new:
+                    handle.write(json.dumps({
+                        "type": "cassette", "version": FORMAT_VERSION,
+                        "created": datetime.now(timezone.utc).isoformat()
+                    }) + "\n")
+                handle.write(json.dumps(interaction) + "\n")
+
+    def interactions(self) -> List[Dict[str, Any]]:
+        """Recorded interactions in recording order."""
+        if not self.path.exists():
+            raise CassetteError(f"Cassette not found: {self.path}")
+        interactions = []
+        with open(self.path, encoding="utf-8") as handle:
+            for line in handle:
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # Torn last line from an interrupted recording
+                    continue
+                if entry.get("type") == "interaction":
+                    interactions.append(entry)
+        return interactions
+
+
+class RecordingAdapter(HTTPAdapter):
+    """Sends requests for real and records them (secrets redacted) to a cassette."""
+
+    def __init__(self, cassette: Cassette, **kwargs):
+        super().__init__(**kwargs)
+        self.cassette = cassette
+
+    def send(self, request, **kwargs):
+        start = time.perf_counter()
+        response = super().send(request, **kwargs)
+        elapsed = time.perf_counter() - start
+        # Reading the body here keeps the recorded time comparable to replay
+        content = response.content
+        self.cassette.append({
+            "type": "interaction",
+            "request": {
+                "method": request.method,
+                "url": redact(request.url),
+                "headers": {
+                    name: value for name, value in request.headers.items()
+                    if name.lower() not in SECRET_HEADERS
+                },
+                "body": redact(_body_text(request.body)),
+            },
+            "response": {
+                "status": response.status_code,
+                "reason": response.reason,
+                "headers": {
+                    name: value for name, value in response.headers.items()
+                    if name.lower() not in SECRET_HEADERS | ENCODING_HEADERS
+                },
+                "body": redact(_body_text(content)),
+            },
+            "elapsed": round(elapsed, 6),
+        })
+        return response
+
+
+class ReplayAdapter(BaseAdapter):
+    """Answers requests from a cassette instead of the network."""
+
+    def __init__(self, cassette: Cassette, speed: float = 1.0):
+        """
+        Args:
+            cassette: Recorded interactions
+            speed: Multiplier for recorded durations (0 replays instantly)
+        """
+        super().__init__()
+        self.speed = speed
+        self._lock = threading.Lock()
+        self._queues: Dict[Tuple[str, str, str], deque] = {}
+        self._last: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
+        for interaction in cassette.interactions():
+            recorded = interaction["request"]
+            key = _key(recorded["method"], recorded["url"], recorded.get("body"))
+            self._queues.setdefault(key, deque()).append(interaction)
+
+    def _next(self, key) -> Optional[Dict[str, Any]]:
+        # Identical requests get their recorded responses in order; once
+        # those run out the last one repeats (e.g. for benchmark loops)
+        with self._lock:
+            queue = self._queues.get(key)
+            if queue:
+                self._last[key] = queue.popleft()
+            return self._last.get(key)
+
+    def send(self, request, **kwargs):
+        interaction = self._next(_key(request.method, request.url, _body_text(request.body)))
+        if interaction is None:
+            raise CassetteError(f"No recorded response for {request.method} {redact(request.url)}")
+        if self.speed:
+            time.sleep(interaction.get("elapsed", 0) * self.speed)
+
+        recorded = interaction["response"]
+        response = requests.Response()
+        response.status_code = recorded["status"]
+        response.reason = recorded.get("reason")
+        response.headers = CaseInsensitiveDict(recorded.get("headers", {}))
+        response._content = (recorded.get("body") or "").encode("utf-8")
+        response.encoding = "utf-8"
+        response.url = request.url
+        response.request = request
+        response.elapsed = timedelta(seconds=interaction.get("elapsed", 0))
+        return response
+
+    def close(self):
+        pass
+
+
+_cassettes: Dict[Path, Cassette] = {}
+_cassettes_lock = threading.Lock()
+
+
+def open_cassette(path) -> Cassette:
+    """Shared Cassette for a path, so several clients can record to one file."""
+    path = Path(path).resolve()
+    with _cassettes_lock:
+        if path not in _cassettes:
+            _cassettes[path] = Cassette(path)
+        return _cassettes[path]
@@ -1,49 +1,356 @@
 """CLI commands for GALIAS."""
 
 import typer
-from typing import Optional
+from typing import Optional, List, Callable, Iterable, Tuple
 import sys
+import json
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from concurrent.futures import Future
 
-from api import get_api, APIError
+from api import (
+    get_api, ImprovMXAPI, APIError, LimitReachedError, NetworkError,
+    AliasExistsError, AliasNotFoundError, DeadlineExceededError
+)
 from ui import (
     print_banner, print_aliases_table, print_alias_count,
-    print_success, print_error, print_json_output,
+    print_success, print_error, print_info, print_json_output,
     prompt_alias, prompt_forward, prompt_delete_alias,
-    confirm_delete, handle_error_display, print_operation_summary
+    confirm_delete, handle_error_display, print_operation_summary,
+    print_snapshots_table, print_operations_table, print_batch_results,
+    print_query_table, print_jobs_table, print_dry_run_report,
+    print_warning, batch_progress, print_doctor_report, print_stats_report,
+    print_log_entry, print_stream_result
+)
+from config import DOMAIN, BATCH_WORKERS, BACKUP_KEEP
+from backup import (
+    list_snapshots, create_backup, compact, state_at,
+    parse_timestamp, plan_restore
 )
-from config import DOMAIN, MAX_ALIASES
+from store import AliasStore, REPORTS
+from journal import Job, list_jobs, load_job, run_job, jobs_dir
+from planner import DryRunRecorder, build_report
+from batch import Operation, ConcurrencyController, parse_operation, run_stream
+from generator import generate, collect_names, DEFAULT_PATTERN
+from models import Alias, AliasSet
+from completion import alias_names, job_ids
+from outbox import Outbox, plan_flush
+from doctor import run as run_diagnostics
+from deadline import set_deadline, deadline_expired, clip_to_deadline, parse_duration, DurationError, EXIT_DEADLINE
+from stats import AliasStats
+from clone import ClonePlan, DEFAULT_MAP
+from logs import (
+    LogTail, LogCursor, DEFAULT_LIMIT as DEFAULT_LOG_LIMIT, DEFAULT_INTERVAL as DEFAULT_LOG_INTERVAL
+)
+from exporter import MetricsCollector, make_server, DEFAULT_PORT, DEFAULT_INTERVAL, DEFAULT_SYNC_INTERVAL
 from pathlib import Path
 
 
 app = typer.Typer(
     name="galias",
     help="GALIAS - Terminal-based ImprovMX alias manager",
-    add_completion=False
+    add_completion=True
 )
 
 
 
 
 
-def show_banner_and_count(skip_banner: bool = False):
-    """Show banner and current alias count."""
-    if not skip_banner:
-        print_banner()
+def complete_alias_name(incomplete: str) -> List[str]:
+    """Shell completion for alias names, served from the local alias store."""
+    return alias_names(incomplete, domain=DOMAIN)
+
+
+def complete_job_id(incomplete: str) -> List[str]:
+    """Shell completion for journaled job ids."""
+    return job_ids(incomplete)
+
+
+def update_cache(update: Callable[[AliasStore], None]):
+    """Apply a change to the local alias store; cache problems never fail a command."""
+    try:
+        with AliasStore() as store:
+            update(store)
+    except (sqlite3.Error, OSError):
+        pass
+
+
+def cache_applied(operations: Iterable[Operation], domain: Optional[str] = None):
+    """
+    Mirror operations the API accepted in the local store.
     
+    A deleted alias loses its expiry with it. An added alias keeps an expiry
+    only if it was recorded for the same forward (a queued ``add --ttl``), so
+    a stale TTL never applies to a re-created alias; an updated one keeps its
+    expiry under the new forward.
+    """
+    def _apply(store: AliasStore):
+        for op in operations:
+            if op.action == "delete":
+                store.remove(op.alias, domain=domain)
+                continue
+            store.put(Alias(op.alias, op.forward), domain=domain)
+            if op.action == "add":
+                store.clear_expiry(op.alias, keep_forward=op.forward, domain=domain)
+            else:
+                store.retarget_expiry(op.alias, op.forward, domain=domain)
+    update_cache(_apply)
+
+
+def format_time(timestamp: float) -> str:
+    """Unix time as an ISO 8601 UTC string."""
+    return datetime.fromtimestamp(timestamp, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def queue_operation(operation: Operation, json_output: bool, dry_run: bool = False):
+    """Append an operation to the outbox (only report it for a dry run) and report the queue size."""
+    outbox = Outbox()
+    if dry_run:
+        pending = len(outbox) + 1
+    else:
+        outbox.append(operation)
+        pending = len(outbox)
+    
+    if json_output:
+        print_json_output({"queued": operation.to_dict(), "pending": pending,
+                           **({"dry_run": True} if dry_run else {})})
+        return
+    
+    if dry_run:
+        print_info(f"Would queue {operation.action} {operation.alias} ({pending} pending) - nothing was written")
+        return
+    print_info(f"Queued {operation.action} {operation.alias} ({pending} pending) - send with 'galias flush'")
+
+
+def start_dry_run(api) -> DryRunRecorder:
+    """Make the client record mutating requests instead of sending them."""
+    recorder = DryRunRecorder()
+    api.recorder = recorder
+    return recorder
+
+
+def finish_dry_run(api, recorder: DryRunRecorder, workers: int, json_output: bool):
+    """Detach the recorder and print the dry-run report."""
+    api.recorder = None
+    report = build_report(recorder, api, api.get_alias_count(), workers, limit=api.alias_limit())
+    
+    if json_output:
+        print_json_output({"dry_run": report})
+        return
+    
+    print_dry_run_report(report)
+
+
+def scratch_jobs_dir() -> Path:
+    """Throwaway journal directory so dry runs never leave resumable jobs behind."""
+    return Path(tempfile.mkdtemp(prefix="galias-dry-run-"))
+
+
+def check_capacity(api, operations: List[Operation], current: int):
+    """Reject a batch that would exceed the alias limit before sending anything."""
+    adds = sum(1 for op in operations if op.action == "add")
+    deletes = sum(1 for op in operations if op.action == "delete")
+    limit = api.alias_limit()
+    # Batches run deletes first, so the peak is the final count
+    if adds and current - deletes + adds > limit:
+        raise LimitReachedError(
+            f"This batch needs {current - deletes + adds} aliases but the limit is {limit} "
+            f"({current} in use)."
+        )
+
+
+def execute_job(api, job: Job, workers: int, json_output: bool,
+                resuming: bool = False, dry_run: bool = False,
+                on_done: Optional[Callable] = None, extra: Optional[dict] = None,
+                exit_on_failure: bool = True, on_result: Optional[Callable] = None):
+    """Run a journaled job, report its results and exit non-zero on failures."""
+    scheduled = len(job.pending())
+    if not json_output:
+        print_info(f"Job {job.id}: {scheduled} operation(s)")
+    
+    recorder = start_dry_run(api) if dry_run else None
+    controller = ConcurrencyController(workers)
+    api.ensure_pool(controller.maximum)
     try:
-        api = get_api()
-        count = api.get_alias_count()
-        print_alias_count(count)
+        if json_output:
+            results = run_job(api, job, resuming=resuming, controller=controller, on_result=on_result)
+        else:
+            with batch_progress(len(job.pending())) as advance:
+                def _progress(result):
+                    if on_result is not None:
+                        on_result(result)
+                    advance(controller.window, controller.rate())
+                
+                results = run_job(api, job, resuming=resuming, controller=controller, on_result=_progress)
+    except KeyboardInterrupt:
+        if not dry_run:
+            print_info(f"Job {job.id} interrupted - run 'galias resume {job.id}' to continue")
+        raise
+    finally:
+        if dry_run and job.path.parent != jobs_dir():
+            shutil.rmtree(job.path.parent, ignore_errors=True)
+    
+    if recorder is not None:
+        finish_dry_run(api, recorder, workers, json_output)
+        return
+    
+    cache_applied([r.operation for r in results if r.ok], domain=job.domain)
+    
+    # Operations dropped because the --deadline passed, and ones it cut off in flight
+    not_sent = scheduled - len(results)
+    cut_off = sum(1 for r in results if isinstance(r.error, DeadlineExceededError))
+    if json_output:
+        print_json_output({"job": job.id, **(extra or {}), "results": [r.to_dict() for r in results],
+                           **({"not_sent": not_sent} if not_sent else {}),
+                           "transport": api.connection_stats(), "circuit": api.breaker.snapshot()})
+    else:
+        print_batch_results(results)
+        transport = api.connection_stats()
+        circuit = api.breaker.snapshot()
+        print_info(f"{controller.rate():.1f} ops/s, final window {controller.window}"
+                   + (f", backed off {controller.backoffs} time(s)" if controller.backoffs else "")
+                   + f", {transport['connections']} connection(s) for {transport['requests']} request(s)")
+        if circuit["opens"]:
+            print_warning(f"API circuit opened {circuit['opens']} time(s) and refused {circuit['rejected']} "
+                          f"request(s) without sending them (now {circuit['state']})")
+        if on_done is not None:
+            on_done(results)
+    
+    if not_sent or cut_off:
+        if not json_output:
+            print_warning(f"Deadline reached - {not_sent + cut_off} operation(s) not finished; "
+                          f"finish them with 'galias resume {job.id}'")
+        sys.exit(EXIT_DEADLINE)
+    
+    if any(not r.ok for r in results):
+        if not json_output:
+            print_info(f"Retry failed operations with 'galias resume {job.id}'")
+        if exit_on_failure:
+            sys.exit(1)
+
+
+def await_prefetch(api, prefetch: Optional[Future], show_count: bool) -> Optional[AliasSet]:
+    """
+    Wait for a background alias listing started at command start.
+    
+    Errors are treated as "no data" so the command itself still runs and
+    reports the authoritative API error, once, if there is one.
+    """
+    if prefetch is None:
+        return None
+    try:
+        aliases = prefetch.result()
+    except Exception:
+        return None
+    if show_count:
+        print_alias_count(len(aliases), api.alias_limit())
         print()
-        return count
-    except Exception as e:
-        handle_error_display(e)
+    return aliases
+
+
+def fetch_count(api, show_count: bool) -> Optional[int]:
+    """
+    Current alias count from a single request (the listing's total).
+    
+    Like await_prefetch, errors are left to the command's own request.
+    """
+    try:
+        count = api.get_alias_count()
+    except Exception:
         return None
+    if show_count:
+        print_alias_count(count, api.alias_limit())
+        print()
+    return count
+
+
+def stream_aliases(api):
+    """
+    Write every alias as an NDJSON line while paging through the listing.
+    
+    Nothing is held beyond the current page; the local store is synced from
+    the same pass.
+    """
+    def _emit():
+        write = sys.stdout.write
+        for alias in api.iter_aliases():
+            write(json.dumps(alias.to_dict()) + "\n")
+            yield alias
+    
+    try:
+        store = AliasStore()
+    except (sqlite3.Error, OSError):
+        store = None
+    if store is None:
+        for _ in _emit():
+            pass
+        return
+    with store:
+        store.sync(_emit())
+
+
+def reap_due(api, workers: int, dry_run: bool, json_output: bool) -> Tuple[bool, Optional[float]]:
+    """
+    Delete the aliases whose expiry has passed.
+    
+    Returns:
+        Tuple of (whether every deletion succeeded, next expiry time)
+    """
+    # Only the due rows are read, in expiry order, from the expiry index
+    now = time.time()
+    with AliasStore() as store:
+        expired = store.due_expiries(now)
+        mirrored = AliasSet(store.lookup(name for name, _ in expired))
+        remaining = store.expiry_count() - len(expired)
+        next_expiry = store.next_expiry(after=now)
+        # Only delete an alias that is still the one its TTL was set for; one
+        # re-created since with another forward stays, and loses the stale expiry
+        stale = [name for name, forward in expired
+                 if forward is not None and (name not in mirrored or mirrored[name].forward != forward)]
+        if not dry_run:
+            for name in stale:
+                store.clear_expiry(name)
+    due = [name for name, _ in expired if name not in set(stale)]
+    
+    if stale and not json_output:
+        print_warning(f"Kept {len(stale)} alias(es) changed since their TTL was set: {', '.join(stale)}")
+    if not due:
+        if json_output:
+            print_json_output({"freed": 0, "next_expiry": None if next_expiry is None else format_time(next_expiry)})
+        elif next_expiry is not None:
+            print_info(f"No expired aliases ({remaining} temporary, next expires {format_time(next_expiry)})")
+        else:
+            print_info("No temporary aliases")
+        return True, next_expiry
+    
+    summary = {"freed": 0, **({"kept": stale} if stale else {})}
+    
+    def _count(result):
+        if result.ok:
+            summary["freed"] += 1
+    
+    operations = [Operation("delete", name) for name in due]
+    job = Job.create("reap", operations, mirrored, directory=scratch_jobs_dir() if dry_run else None)
+    # Aliases deleted elsewhere count as reaped (same rule as resuming a job)
+    execute_job(api, job, workers, json_output, resuming=True, dry_run=dry_run,
+                extra=summary, exit_on_failure=False, on_result=_count)
+    if dry_run:
+        return True, next_expiry
+    
+    if not json_output:
+        print_success(f"Freed {summary['freed']} alias slot(s)")
+        print_alias_count(api.get_alias_count(), api.alias_limit())
+    return summary["freed"] == len(due), next_expiry
 
 
 @app.command()
 def list(
     json_output: bool = typer.Option(False, "--json", help="Output raw JSON for scripting"),
+    stream: bool = typer.Option(False, "--stream", help="Write one JSON alias per line as pages arrive (constant memory)"),
     no_color: bool = typer.Option(False, "--no-color", help="Disable colored output"),
     quiet: bool = typer.Option(False, "-q", "--quiet", help="Skip banner and just show aliases")
 ):
@@ -55,20 +362,26 @@ def list(
             console._color_system = None
         
         api = get_api()
-        aliases_data = api.list_aliases()
+        if stream:
+            stream_aliases(api)
+            return
+        
+        aliases = api.get_aliases()
+        update_cache(lambda store: store.sync(aliases))
         
         if json_output:
-            print_json_output(aliases_data)
+            print_json_output(aliases.to_response())
             return
         
         if not quiet:
-            show_banner_and_count()
+            print_banner()
+            print_alias_count(len(aliases), api.alias_limit())
+            print()
         
-        print_aliases_table(aliases_data)
+        print_aliases_table(aliases)
         
         if not quiet:
-            count = len(aliases_data.get("aliases", []))
-            print_alias_count(count)
+            print_alias_count(len(aliases), api.alias_limit())
         
     except Exception as e:
         handle_error_display(e)
@@ -81,7 +394,10 @@ def add(
     forward: Optional[str] = typer.Argument(None, help="Email address to forward to"),
     json_output: bool = typer.Option(False, "--json", help="Output raw JSON for scripting"),
     no_color: bool = typer.Option(False, "--no-color", help="Disable colored output"),
-    quiet: bool = typer.Option(False, "-q", "--quiet", help="Skip banner and progress display")
+    quiet: bool = typer.Option(False, "-q", "--quiet", help="Skip banner and progress display"),
+    dry_run: bool = typer.Option(False, "--dry-run", help="Show the API calls that would be made without sending them"),
+    queue: bool = typer.Option(False, "--queue", help="Queue the change locally and send it later with 'galias flush'"),
+    ttl: Optional[str] = typer.Option(None, "--ttl", help="Delete the alias after this long with 'galias reap' (e.g. 12h, 7d)")
 ):
     """Add a new alias."""
     try:
@@ -90,13 +406,33 @@ def add(
             from ui import console
             console._color_system = None
         
-        if not quiet:
-            show_banner_and_count()
+        expires_at = time.time() + parse_duration(ttl) if ttl else None
+        
+        # Fetch the current aliases while the user types; without a prompt
+        # the one-request count is enough
+        api = get_api()
+        prefetch = None
+        if not queue and alias is None:
+            prefetch = api.prefetch_aliases()
+        
+        count = None
+        if not quiet and not queue:
+            print_banner()
+            if prefetch is None:
+                count = fetch_count(api, show_count=True)
         
         # Interactive prompts if arguments not provided
         if alias is None:
             alias = prompt_alias()
         
+        existing = await_prefetch(api, prefetch, show_count=not quiet)
+        if existing is not None:
+            count = len(existing)
+        if existing is not None and alias in existing:
+            raise AliasExistsError(f"Alias '{alias}' already exists.")
+        if count is not None and not dry_run:
+            check_capacity(api, [Operation("add", alias)], count)
+        
         if forward is None:
             forward = prompt_forward()
         
@@ -110,33 +446,62 @@ def add(
             print_error("Invalid email format for forward address")
             sys.exit(1)
         
-        api = get_api()
+        if queue:
+            if not dry_run:
+                if expires_at is not None:
+                    update_cache(lambda store: store.set_expiry(alias, expires_at, forward))
+                else:
+                    update_cache(lambda store: store.clear_expiry(alias))
+            queue_operation(Operation("add", alias, forward), json_output, dry_run=dry_run)
+            return
+        
+        recorder = start_dry_run(api) if dry_run else None
         result = api.add_alias(alias, forward)
         
+        if recorder is not None:
+            finish_dry_run(api, recorder, 1, json_output)
+            return
+        
+        def _cache(store: AliasStore):
+            store.put(Alias(alias, forward))
+            if expires_at is not None:
+                store.set_expiry(alias, expires_at, forward)
+            else:
+                store.clear_expiry(alias)
+        update_cache(_cache)
+        
         if json_output:
+            if expires_at is not None:
+                result = {**result, "expires_at": format_time(expires_at)}
             print_json_output(result)
             return
         
         print_operation_summary("add", alias, forward)
+        if expires_at is not None:
+            print_info(f"Expires {format_time(expires_at)} - run 'galias reap' to delete expired aliases")
         
         # Show updated count
         if not quiet:
             print()
-            count = api.get_alias_count()
-            print_alias_count(count)
+            count = count + 1 if count is not None else api.get_alias_count()
+            print_alias_count(count, api.alias_limit())
         
     except Exception as e:
         handle_error_display(e)
+        if isinstance(e, NetworkError) and not json_output:
+            print_info("Rerun with --queue to save the change and send it later with 'galias flush'")
         sys.exit(1)
 
 
 @app.command()
 def delete(
-    alias: Optional[str] = typer.Argument(None, help="Alias name to delete"),
+    alias: Optional[str] = typer.Argument(None, help="Alias name to delete", autocompletion=complete_alias_name),
     force: bool = typer.Option(False, "-f", "--force", help="Skip confirmation prompt"),
     json_output: bool = typer.Option(False, "--json", help="Output raw JSON for scripting"),
     no_color: bool = typer.Option(False, "--no-color", help="Disable colored output"),
-    quiet: bool = typer.Option(False, "-q", "--quiet", help="Skip banner and progress display")
+    quiet: bool = typer.Option(False, "-q", "--quiet", help="Skip banner and progress display"),
+    dry_run: bool = typer.Option(False, "--dry-run", help="Show the API calls that would be made without sending them"),
+    queue: bool = typer.Option(False, "--queue", help="Queue the change locally and send it later with 'galias flush'")
 ):
     """Delete an existing alias."""
     try:
@@ -145,8 +510,18 @@ def delete(
             from ui import console
             console._color_system = None
         
-        if not quiet:
-            show_banner_and_count()
+        # Fetch the current aliases while the user types; without a prompt
+        # the one-request count is enough
+        api = get_api()
+        prefetch = None
+        if not queue and alias is None:
+            prefetch = api.prefetch_aliases()
+        
+        count = None
+        if not quiet and not queue:
+            print_banner()
+            if prefetch is None:
+                count = fetch_count(api, show_count=True)
         
         # Interactive prompt if alias not provided
         if alias is None:
@@ -156,15 +531,34 @@ def delete(
             print_error("Alias name is required")
             sys.exit(1)
         
-        # Confirmation prompt (unless forced or in JSON mode)
-        if not force and not json_output:
+        existing = await_prefetch(api, prefetch, show_count=not quiet)
+        if existing is not None:
+            count = len(existing)
+        if existing is not None and alias not in existing:
+            raise AliasNotFoundError(f"Alias '{alias}' not found.")
+        
+        # Confirmation prompt (unless forced, dry run or in JSON mode)
+        if not force and not json_output and not dry_run:
             if not confirm_delete(alias):
                 print("Operation cancelled.")
                 return
         
-        api = get_api()
+        if queue:
+            if not dry_run:
+                # The alias is on its way out; reap must not act on it meanwhile
+                update_cache(lambda store: store.clear_expiry(alias))
+            queue_operation(Operation("delete", alias), json_output, dry_run=dry_run)
+            return
+        
+        recorder = start_dry_run(api) if dry_run else None
         result = api.delete_alias(alias)
         
+        if recorder is not None:
+            finish_dry_run(api, recorder, 1, json_output)
+            return
+        
+        update_cache(lambda store: store.remove(alias))
+        
         if json_output:
             print_json_output(result)
             return
@@ -174,11 +568,13 @@ def delete(
         # Show updated count
         if not quiet:
             print()
-            count = api.get_alias_count()
-            print_alias_count(count)
+            count = count - 1 if count is not None else api.get_alias_count()
+            print_alias_count(count, api.alias_limit())
         
     except Exception as e:
         handle_error_display(e)
+        if isinstance(e, NetworkError) and not json_output:
+            print_info("Rerun with --queue to save the change and send it later with 'galias flush'")
         sys.exit(1)
 
 
@@ -196,19 +592,848 @@ def status(
         
         api = get_api()
         count = api.get_alias_count()
+        limit = api.alias_limit()
         
         if json_output:
             status_data = {
                 "current_aliases": count,
-                "max_aliases": MAX_ALIASES,
+                "max_aliases": limit,
                 "domain": DOMAIN,
-                "usage_percentage": round((count / MAX_ALIASES) * 100, 1)
+                "usage_percentage": round((count / limit) * 100, 1) if limit else None,
+                "limits": api.limits()
             }
             print_json_output(status_data)
             return
         
         print_banner()
-        print_alias_count(count)
+        print_alias_count(count, limit)
+        
+    except Exception as e:
+        handle_error_display(e)
+        sys.exit(1)
+
+
+@app.command()
+def doctor(
+    repeat: int = typer.Option(5, "--repeat", "-n", help="Number of timed requests"),
+    url: Optional[str] = typer.Option(None, "--url", help="URL to time instead of the aliases endpoint"),
+    json_output: bool = typer.Option(False, "--json", help="Output raw JSON for scripting"),
+    no_color: bool = typer.Option(False, "--no-color", help="Disable colored output")
+):
+    """Diagnose start-up time, request latency and connection reuse."""
+    try:
+        # Set up console for no-color mode
+        if no_color:
+            from ui import console
+            console._color_system = None
+        
+        report = run_diagnostics(get_api(), repeat=repeat, url=url)
+
+        if json_output:
+            print_json_output(report)
+        else:
+            print_doctor_report(report)
+        
+        if report["requests"]["errors"] or "error" in report["connection_reuse"]:
+            sys.exit(1)
+        
+    except Exception as e:
+        handle_error_display(e)
+        sys.exit(1)
+
+
+@app.command()
+def backup(
+    full: bool = typer.Option(False, "--full", help="Write a full snapshot instead of a delta"),
+    keep: int = typer.Option(BACKUP_KEEP, "--keep", help="Number of snapshots to retain (older ones are compacted)"),
+    show: bool = typer.Option(False, "--list", help="List existing backups and exit"),
+    json_output: bool = typer.Option(False, "--json", help="Output raw JSON for scripting"),
+    no_color: bool = typer.Option(False, "--no-color", help="Disable colored output")
+):
+    """Back up aliases as a compressed incremental snapshot."""
+    try:
+        # Set up console for no-color mode
+        if no_color:
+            from ui import console
+            console._color_system = None
+        
+        if show:
+            snapshots = list_snapshots()
+            if json_output:
+                print_json_output({"backups": [
+                    {"timestamp": s.timestamp.isoformat(), "kind": s.kind, "file": str(s.path)}
+                    for s in snapshots
+                ]})
+                return
+            print_snapshots_table(snapshots)
+            return
+        
+        api = get_api()
+        aliases = api.get_aliases()
+        snapshot = create_backup(aliases, full=full)
+        removed = compact(keep=keep)
+        
+        if json_output:
+            print_json_output({
+                "file": str(snapshot.path) if snapshot else None,
+                "kind": snapshot.kind if snapshot else None,
+                "aliases": len(aliases),
+                "compacted": removed
+            })
+            return
+        
+        if snapshot is None:
+            print_info("No changes since the last backup")
+        else:
+            print_success(f"Wrote {snapshot.kind} backup of {len(aliases)} aliases: {snapshot.path.name}")
+        if removed:
+            print_info(f"Compacted {removed} old backup(s)")
+        
+    except Exception as e:
+        handle_error_display(e)
+        sys.exit(1)
+
+
+@app.command()
+def restore(
+    at: Optional[str] = typer.Option(None, "--at", help="Restore the state as of this UTC timestamp (default: latest backup)"),
+    force: bool = typer.Option(False, "-f", "--force", help="Skip confirmation prompt"),
+    workers: int = typer.Option(BATCH_WORKERS, "--workers", help="Initial number of concurrent API requests (adapts to API health)"),
+    dry_run: bool = typer.Option(False, "--dry-run", help="Show the API calls that would be made without sending them"),
+    json_output: bool = typer.Option(False, "--json", help="Output raw JSON for scripting"),
+    no_color: bool = typer.Option(False, "--no-color", help="Disable colored output")
+):
+    """Restore aliases to a backed-up point in time."""
+    try:
+        # Set up console for no-color mode
+        if no_color:
+            from ui import console
+            console._color_system = None
+        
+        when = parse_timestamp(at) if at else None
+        target, snapshot = state_at(list_snapshots(), when)
+        if snapshot is None:
+            print_error("No backup found at or before that time")
+            sys.exit(1)
+        
+        api = get_api()
+        live = api.get_aliases()
+        operations = plan_restore(live, target)
+        
+        if not json_output:
+            print_info(f"Restoring backup from {snapshot.timestamp.strftime('%Y-%m-%d %H:%M:%S')} UTC")
+            print_operations_table(operations)
+        
+        if not operations:
+            if json_output:
+                print_json_output({"results": []})
+            return
+        
+        # Confirmation prompt (unless forced, dry run or in JSON mode)
+        if not force and not json_output and not dry_run:
+            if not typer.confirm(f"Apply {len(operations)} change(s)?", default=False):
+                print("Operation cancelled.")
+                return
+        
+        if not dry_run:
+            check_capacity(api, operations, len(live))
+        
+        job = Job.create("restore", operations, live,
+                         directory=scratch_jobs_dir() if dry_run else None)
+        execute_job(api, job, workers, json_output, dry_run=dry_run)
+        
+    except Exception as e:
+        handle_error_display(e)
+        sys.exit(1)
+
+
+@app.command()
+def gen(
+    forward: str = typer.Argument(..., help="Email address the generated aliases forward to"),
+    count: int = typer.Option(1, "--count", "-n", help="Number of aliases to create"),
+    pattern: str = typer.Option(DEFAULT_PATTERN, "--pattern", "-p",
+                                help="Name pattern with {rand}, {rand:N}, {n}, {n:W} and {date} placeholders"),
+    workers: int = typer.Option(BATCH_WORKERS, "--workers", help="Initial number of concurrent API requests (adapts to API health)"),
+    dry_run: bool = typer.Option(False, "--dry-run", help="Show the API calls that would be made without sending them"),
+    json_output: bool = typer.Option(False, "--json", help="Output raw JSON for scripting"),
+    no_color: bool = typer.Option(False, "--no-color", help="Disable colored output")
+):
+    """Generate and create unique throwaway aliases."""
+    try:
+        # Set up console for no-color mode
+        if no_color:
+            from ui import console
+            console._color_system = None
+        
+        if "@" not in forward or "." not in forward:
+            print_error("Invalid email format for forward address")
+            sys.exit(1)
+        
+        # One listing both refreshes the local mirror and seeds the existence set
+        api = get_api()
+        existing = set()
+        with AliasStore() as store:
+            store.sync(collect_names(api.iter_aliases(), existing))
+        
+        limit = api.alias_limit()
+        if not dry_run and len(existing) + count > limit:
+            raise LimitReachedError(
+                f"Creating {count} aliases would exceed the limit "
+                f"({len(existing)}/{limit} in use)."
+            )
+        
+        names = generate(pattern, count, existing)
+        operations = [Operation("add", name, forward) for name in names]
+        job = Job.create("gen", operations, AliasSet(),
+                         directory=scratch_jobs_dir() if dry_run else None)
+        
+        def _show_addresses(results):
+            for result in results:
+                if result.ok:
+                    typer.echo(f"{result.operation.alias}@{DOMAIN}")
+        
+        execute_job(api, job, workers, json_output, dry_run=dry_run, on_done=_show_addresses)
+        
+    except Exception as e:
+        handle_error_display(e)
+        sys.exit(1)
+
+
+@app.command()
+def flush(
+    show: bool = typer.Option(False, "--list", help="Show queued operations without sending them"),
+    overwrite: bool = typer.Option(False, "--overwrite", help="Update aliases changed elsewhere instead of reporting conflicts"),
+    workers: int = typer.Option(BATCH_WORKERS, "--workers", help="Initial number of concurrent API requests (adapts to API health)"),
+    dry_run: bool = typer.Option(False, "--dry-run", help="Show the API calls that would be made without sending them"),
+    json_output: bool = typer.Option(False, "--json", help="Output raw JSON for scripting"),
+    no_color: bool = typer.Option(False, "--no-color", help="Disable colored output")
+):
+    """Send operations queued with --queue."""
+    try:
+        # Set up console for no-color mode
+        if no_color:
+            from ui import console
+            console._color_system = None
+        
+        outbox = Outbox()
+        queued = outbox.operations()
+        
+        if show or not queued:
+            if json_output:
+                print_json_output({"queued": [op.to_dict() for op in queued]})
+            elif queued:
+                print_operations_table(queued, title="Queued Changes")
+            else:
+                print_info("No queued changes")
+            return
+        
+        api = get_api()
+        live = api.get_aliases()
+        operations, notes = plan_flush(queued, live, overwrite=overwrite)
+        conflicts = [note for note in notes if note["status"] == "conflict"]
+        
+        if not json_output:
+            for note in notes:
+                if note["status"] == "conflict":
+                    print_warning(f"Conflict - {note['alias']}: {note['reason']}")
+                else:
+                    print_info(f"Skipped - {note['alias']}: {note['reason']}")
+        
+        if dry_run:
+            if operations:
+                job = Job.create("flush", operations, live, directory=scratch_jobs_dir())
+                execute_job(api, job, workers, json_output, dry_run=True)
+            elif json_output:
+                print_json_output({"notes": notes, "results": []})
+            return
+        
+        check_capacity(api, operations, len(live))
+        
+        # The job journal takes over durability from the outbox; conflicting
+        # changes stay queued until resolved (e.g. with --overwrite)
+        job = Job.create("flush", operations, live) if operations else None
+        outbox.clear()
+        for note in conflicts:
+            outbox.append(next(op for op in reversed(queued) if op.alias == note["alias"]))
+        
+        if job is not None:
+            execute_job(api, job, workers, json_output, extra={"notes": notes}, exit_on_failure=not conflicts)
+        elif json_output:
+            print_json_output({"notes": notes, "results": []})
+        
+        if conflicts:
+            if not json_output:
+                print_info(f"{len(conflicts)} conflicting change(s) left queued - rerun with --overwrite to apply them")
+            sys.exit(1)
+        
+    except Exception as e:
+        handle_error_display(e)
+        sys.exit(1)
+
+
+@app.command()
+def reap(
+    watch: bool = typer.Option(False, "--watch", help="Keep running and reap aliases as they expire"),
+    workers: int = typer.Option(BATCH_WORKERS, "--workers", help="Initial number of concurrent API requests (adapts to API health)"),
+    dry_run: bool = typer.Option(False, "--dry-run", help="Show the API calls that would be made without sending them"),
+    json_output: bool = typer.Option(False, "--json", help="Output raw JSON for scripting"),
+    no_color: bool = typer.Option(False, "--no-color", help="Disable colored output")
+):
+    """Delete temporary aliases whose --ttl has expired."""
+    try:
+        # Set up console for no-color mode
+        if no_color:
+            from ui import console
+            console._color_system = None
+        
+        api = get_api()
+        ok, next_expiry = reap_due(api, workers, dry_run, json_output)
+        
+        while watch and not dry_run:
+            if deadline_expired():
+                # --watch runs until interrupted, so a --deadline always ends it
+                sys.exit(EXIT_DEADLINE)
+            # Sleep until the next expiry, re-checking for new temporary aliases every minute
+            wait = 60.0 if next_expiry is None else min(60.0, max(1.0, next_expiry - time.time()))
+            try:
+                time.sleep(clip_to_deadline(wait))
+            except KeyboardInterrupt:
+                return
+            with AliasStore() as store:
+                next_expiry = store.next_expiry()
+            if next_expiry is not None and next_expiry <= time.time():
+                ok, next_expiry = reap_due(api, workers, dry_run, json_output)
+        
+        if not ok:
+            sys.exit(1)
+        
+    except Exception as e:
+        handle_error_display(e)
+        sys.exit(1)
+
+
+@app.command()
+def jobs(
+    json_output: bool = typer.Option(False, "--json", help="Output raw JSON for scripting"),
+    no_color: bool = typer.Option(False, "--no-color", help="Disable colored output")
+):
+    """List journaled batch jobs."""
+    try:
+        # Set up console for no-color mode
+        if no_color:
+            from ui import console
+            console._color_system = None
+        
+        all_jobs = list_jobs()
+        
+        if json_output:
+            print_json_output({"jobs": [
+                dict(id=job.id, command=job.command, created=job.created, **job.counts())
+                for job in all_jobs
+            ]})
+            return
+        
+        print_jobs_table(all_jobs)
+        
+    except Exception as e:
+        handle_error_display(e)
+        sys.exit(1)
+
+
+@app.command()
+def resume(
+    job_id: Optional[str] = typer.Argument(None, help="Job to resume (default: most recent interrupted job)",
+                                           autocompletion=complete_job_id),
+    workers: int = typer.Option(BATCH_WORKERS, "--workers", help="Initial number of concurrent API requests (adapts to API health)"),
+    dry_run: bool = typer.Option(False, "--dry-run", help="Show the API calls that would be made without sending them"),
+    json_output: bool = typer.Option(False, "--json", help="Output raw JSON for scripting"),
+    no_color: bool = typer.Option(False, "--no-color", help="Disable colored output")
+):
+    """Continue an interrupted batch job without redoing finished operations."""
+    try:
+        # Set up console for no-color mode
+        if no_color:
+            from ui import console
+            console._color_system = None
+        
+        job = load_job(job_id)
+        if job.complete:
+            print_info(f"Job {job.id} is already complete")
+            return
+        
+        if dry_run:
+            scratch = scratch_jobs_dir() / job.path.name
+            shutil.copy(job.path, scratch)
+            job = Job(scratch)
+        
+        api = get_api() if job.domain == DOMAIN else ImprovMXAPI(domain=job.domain)
+        execute_job(api, job, workers, json_output, resuming=True, dry_run=dry_run)
+        
+    except Exception as e:
+        handle_error_display(e)
+        sys.exit(1)
+
+
+@app.command()
+def undo(
+    job_id: str = typer.Argument(..., help="Job to undo", autocompletion=complete_job_id),
+    force: bool = typer.Option(False, "-f", "--force", help="Skip confirmation prompt"),
+    workers: int = typer.Option(BATCH_WORKERS, "--workers", help="Initial number of concurrent API requests (adapts to API health)"),
+    dry_run: bool = typer.Option(False, "--dry-run", help="Show the API calls that would be made without sending them"),
+    json_output: bool = typer.Option(False, "--json", help="Output raw JSON for scripting"),
+    no_color: bool = typer.Option(False, "--no-color", help="Disable colored output")
+):
+    """Revert the completed operations of a batch job."""
+    try:
+        # Set up console for no-color mode
+        if no_color:
+            from ui import console
+            console._color_system = None
+        
+        job = load_job(job_id)
+        operations = job.undo_operations()
+        
+        if not json_output:
+            print_operations_table(operations, title=f"Undo {job.id}")
+        if not operations:
+            return
+        
+        if not force and not json_output and not dry_run:
+            if not typer.confirm(f"Apply {len(operations)} change(s)?", default=False):
+                print("Operation cancelled.")
+                return
+        
+        api = get_api() if job.domain == DOMAIN else ImprovMXAPI(domain=job.domain)
+        prior = api.get_aliases()
+        if not dry_run:
+            check_capacity(api, operations, len(prior))
+        undo_job = Job.create("undo", operations, prior, domain=job.domain, parent=job.id,
+                              directory=scratch_jobs_dir() if dry_run else None)
+        execute_job(api, undo_job, workers, json_output, dry_run=dry_run)
+        
+    except Exception as e:
+        handle_error_display(e)
+        sys.exit(1)
+
+
+@app.command()
+def sync(
+    domains: Optional[List[str]] = typer.Option(None, "--domain", "-d", help="Domain to sync (repeatable, default: DOMAIN)"),
+    all_domains: bool = typer.Option(False, "--all", help="Sync every domain on the account"),
+    json_output: bool = typer.Option(False, "--json", help="Output raw JSON for scripting"),
+    no_color: bool = typer.Option(False, "--no-color", help="Disable colored output")
+):
+    """Update the local alias database from the API."""
+    try:
+        # Set up console for no-color mode
+        if no_color:
+            from ui import console
+            console._color_system = None
+        
+        if all_domains:
+            domains = get_api().list_domains()
+        elif not domains:
+            domains = [DOMAIN]
+        
+        summary = {}
+        with AliasStore() as store:
+            for domain in domains:
+                api = get_api() if domain == DOMAIN else ImprovMXAPI(domain=domain)
+                summary[domain] = store.sync(api.iter_aliases(), domain)
+        
+        if json_output:
+            print_json_output(summary)
+            return
+        
+        for domain, counts in summary.items():
+            print_success(
+                f"{domain}: {counts['total']} aliases "
+                f"(+{counts['added']} ~{counts['updated']} -{counts['removed']})"
+            )
+        
+    except Exception as e:
+        handle_error_display(e)
+        sys.exit(1)
+
+
+@app.command()
+def exporter(
+    port: int = typer.Option(DEFAULT_PORT, "--port", "-p", help="Port to serve /metrics on"),
+    host: str = typer.Option("127.0.0.1", "--host", help="Address to bind (use 0.0.0.0 for all interfaces)"),
+    interval: int = typer.Option(DEFAULT_INTERVAL, "--interval", help="Seconds between refreshes from the API"),
+    sync_interval: int = typer.Option(DEFAULT_SYNC_INTERVAL, "--sync-interval", help="Seconds between full syncs of the local alias database (0: never)"),
+    domains: Optional[List[str]] = typer.Option(None, "--domain", "-d", help="Domain to export (repeatable, default: DOMAIN)"),
+    all_domains: bool = typer.Option(False, "--all", help="Export every domain on the account"),
+    no_color: bool = typer.Option(False, "--no-color", help="Disable colored output")
+):
+    """Serve alias usage metrics for Prometheus."""
+    try:
+        # Set up console for no-color mode
+        if no_color:
+            from ui import console
+            console._color_system = None
+        
+        if all_domains:
+            domains = get_api().list_domains()
+        elif not domains:
+            domains = [DOMAIN]
+        
+        apis = {d: get_api() if d == DOMAIN else ImprovMXAPI(domain=d) for d in domains}
+        collector = MetricsCollector(apis, interval=interval, sync_interval=sync_interval)
+        server = make_server(collector, host, port)
+        collector.start()
+        print_info(f"Serving metrics for {', '.join(domains)} on http://{host}:{port}/metrics "
+                   f"(refresh every {interval}s)")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            collector.stop()
+        
+    except Exception as e:
+        handle_error_display(e)
+        sys.exit(1)
+
+
+@app.command()
+def query(
+    report: Optional[str] = typer.Argument(None, help=f"Predefined report: {', '.join(REPORTS)}"),
+    sql: Optional[str] = typer.Option(None, "--sql", help="Read-only SQL to run against the 'aliases' table"),
+    domain: Optional[str] = typer.Option(None, "--domain", "-d", help="Domain for predefined reports (default: DOMAIN)"),
+    limit: int = typer.Option(50, "--limit", help="Maximum rows for predefined reports"),
+    refresh: bool = typer.Option(False, "--sync", help="Sync the domain before querying"),
+    json_output: bool = typer.Option(False, "--json", help="Output raw JSON for scripting"),
+    no_color: bool = typer.Option(False, "--no-color", help="Disable colored output")
+):
+    """Query the local alias database without calling the API."""
+    try:
+        # Set up console for no-color mode
+        if no_color:
+            from ui import console
+            console._color_system = None
+        
+        if sql is None and report is None:
+            for name, (description, _) in REPORTS.items():
+                typer.echo(f"{name:12} {description}")
+            return
+        
+        domain = domain or DOMAIN
+        with AliasStore() as store:
+            if refresh:
+                api = get_api() if domain == DOMAIN else ImprovMXAPI(domain=domain)
+                store.sync(api.iter_aliases(), domain)
+            elif store.last_sync(domain) is None and not json_output:
+                print_info(f"{domain} has not been synced yet - run 'galias sync' first")
+            
+            if sql is not None:
+                columns, rows = store.query(sql)
+                title = None
+            else:
+                columns, rows = store.report(report, domain, limit)
+                title = REPORTS[report][0]
+        
+        if json_output:
+            print_json_output({"rows": [dict(zip(columns, row)) for row in rows]})
+            return
+        
+        print_query_table(columns, rows, title)
+        
+    except Exception as e:
+        handle_error_display(e)
+        sys.exit(1)
+
+
+@app.command()
+def stats(
+    cached: bool = typer.Option(False, "--cached", help="Read the local database instead of the API"),
+    domain: Optional[str] = typer.Option(None, "--domain", "-d", help="Domain to analyse (default: DOMAIN)"),
+    top: int = typer.Option(10, "--top", help="Entries per ranking"),
+    json_output: bool = typer.Option(False, "--json", help="Output raw JSON for scripting"),
+    no_color: bool = typer.Option(False, "--no-color", help="Disable colored output")
+):
+    """Summarize forwards, prefixes and duplicates in one pass over the aliases."""
+    try:
+        # Set up console for no-color mode
+        if no_color:
+            from ui import console
+            console._color_system = None
+        
+        domain = domain or DOMAIN
+        if cached:
+            with AliasStore() as store:
+                if store.last_sync(domain) is None:
+                    print_error(f"{domain} has not been synced yet - run 'galias sync' first")
+                    sys.exit(1)
+                summary = AliasStats().update(store.aliases(domain))
+        else:
+            api = get_api() if domain == DOMAIN else ImprovMXAPI(domain=domain)
+            summary = AliasStats().update(api.iter_aliases())
+        report = summary.report(top)
+        
+        if json_output:
+            print_json_output({"domain": domain, **report})
+            return
+        
+        print_stats_report(report)
+        
+    except Exception as e:
+        handle_error_display(e)
+        sys.exit(1)
+
+
+@app.command()
+def logs(
+    alias: Optional[str] = typer.Argument(None, help="Only show logs of this alias", autocompletion=complete_alias_name),
+    follow: bool = typer.Option(False, "--follow", "-f", help="Keep polling for new entries"),
+    interval: float = typer.Option(DEFAULT_LOG_INTERVAL, "--interval", help="Seconds between polls with --follow (backs off while idle)"),
+    limit: int = typer.Option(DEFAULT_LOG_LIMIT, "--limit", help="Entries to show when no earlier run was recorded"),
+    show_all: bool = typer.Option(False, "--all", help="Ignore the saved position and show the latest --limit entries"),
+    json_output: bool = typer.Option(False, "--json", help="Output one JSON entry per line (NDJSON)"),
+    no_color: bool = typer.Option(False, "--no-color", help="Disable colored output")
+):
+    """Show delivery logs, fetching only entries newer than the last run."""
+    try:
+        # Set up console for no-color mode
+        if no_color:
+            from ui import console
+            console._color_system = None
+        
+        api = get_api()
+        key = alias or ""
+        saved = None
+        if not show_all:
+            with AliasStore() as store:
+                saved = store.log_cursor(key)
+        tail = LogTail(lambda: api.iter_logs(alias), LogCursor(*saved) if saved else None,
+                       limit=limit, interval=interval)
+        
+        while True:
+            entries = tail.poll()
+            for entry in entries:
+                if json_output:
+                    sys.stdout.write(json.dumps(entry) + "\n")
+                else:
+                    print_log_entry(entry)
+            sys.stdout.flush()
+            if tail.cursor is not None:
+                update_cache(lambda store: store.set_log_cursor(*tail.state(), alias=key))
+            if not follow:
+                break
+            try:
+                time.sleep(clip_to_deadline(tail.interval))
+            except KeyboardInterrupt:
+                return
+        
+    except Exception as e:
+        handle_error_display(e)
+        sys.exit(1)
+
+
+@app.command()
+def batch(
+    source: str = typer.Argument(..., help="File of operations, one per line, or - to read standard input"),
+    workers: int = typer.Option(BATCH_WORKERS, "--workers", help="Initial number of concurrent API requests (adapts to API health)"),
+    dry_run: bool = typer.Option(False, "--dry-run", help="Show the API calls that would be made without sending them"),
+    json_output: bool = typer.Option(False, "--json", help="Output one JSON result per line (NDJSON)"),
+    no_color: bool = typer.Option(False, "--no-color", help="Disable colored output")
+):
+    """Apply a stream of add/update/delete operations, reporting each as it completes."""
+    try:
+        # Set up console for no-color mode
+        if no_color:
+            from ui import console
+            console._color_system = None
+        
+        api = get_api()
+        recorder = start_dry_run(api) if dry_run else None
+        controller = ConcurrencyController(workers)
+        api.ensure_pool(controller.maximum)
+        
+        lock = threading.Lock()
+        # Stream position -> input line, for operations not yet reported
+        line_numbers = {}
+        counts = {"ok": 0, "failed": 0}
+        changes = []
+        
+        def _emit(line: int, result=None, error: str = None):
+            ok = result is not None and result.ok
+            with lock:
+                counts["ok" if ok else "failed"] += 1
+                if ok:
+                    changes.append(result.operation)
+                if dry_run and result is not None:
+                    return
+                if json_output:
+                    data = result.to_dict() if result is not None else {"ok": False, "error": error}
+                    sys.stdout.write(json.dumps({"line": line, **data}) + "\n")
+                    sys.stdout.flush()
+                elif result is not None:
+                    print_stream_result(result, line)
+                else:
+                    print_error(f"line {line}: {error}")
+        
+        progress = {"line": 0, "eof": False}
+        
+        def _operations(lines):
+            index = 0
+            for number, text in enumerate(lines, 1):
+                progress["line"] = number
+                try:
+                    op = parse_operation(text)
+                except ValueError as e:
+                    _emit(number, error=str(e))
+                    continue
+                if op is not None:
+                    with lock:
+                        line_numbers[index] = number
+                    index += 1
+                    yield op
+            progress["eof"] = True
+        
+        def _on_result(index, result):
+            with lock:
+                number = line_numbers.pop(index)
+            _emit(number, result)
+        
+        stream = sys.stdin if source == "-" else open(source, encoding="utf-8")
+        try:
+            # readline rather than iteration so each line is acted on as soon as it arrives
+            run_stream(api, _operations(iter(stream.readline, "")), _on_result, controller=controller)
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+        
+        if recorder is not None:
+            finish_dry_run(api, recorder, workers, json_output)
+        else:
+            cache_applied(changes)
+        
+        if not json_output and recorder is None:
+            print_info(f"{counts['ok']} applied, {counts['failed']} failed "
+                       f"({controller.rate():.1f} ops/s, final window {controller.window})")
+        # Operations read but dropped when the deadline passed
+        not_sent = len(line_numbers)
+        if deadline_expired() and (not_sent or not progress["eof"]):
+            if not json_output:
+                print_warning(f"Deadline reached - stopped at input line {progress['line']}"
+                              + (f", {not_sent} operation(s) read but not sent" if not_sent else ""))
+            sys.exit(EXIT_DEADLINE)
+        if counts["failed"]:
+            sys.exit(1)
+        
+    except Exception as e:
+        handle_error_display(e)
+        sys.exit(1)
+
+
+@app.command()
+def clone(
+    source: str = typer.Option(..., "--from", help="Domain to copy aliases from"),
+    target: str = typer.Option(..., "--to", help="Domain to create the aliases on"),
+    pattern: str = typer.Option(DEFAULT_MAP, "--map", help="Target alias name with an {alias} placeholder, e.g. legacy-{alias}"),
+    overwrite: bool = typer.Option(False, "--overwrite", help="Update target aliases that have a different forward instead of reporting conflicts"),
+    workers: int = typer.Option(BATCH_WORKERS, "--workers", help="Initial number of concurrent API requests (adapts to API health)"),
+    dry_run: bool = typer.Option(False, "--dry-run", help="Show the API calls that would be made without sending them"),
+    json_output: bool = typer.Option(False, "--json", help="Output raw JSON for scripting"),
+    no_color: bool = typer.Option(False, "--no-color", help="Disable colored output")
+):
+    """Copy every alias of one domain to another."""
+    try:
+        # Set up console for no-color mode
+        if no_color:
+            from ui import console
+            console._color_system = None
+        
+        if "{alias}" not in pattern:
+            print_error("--map pattern must contain {alias}")
+            sys.exit(1)
+        if source == target and pattern == DEFAULT_MAP:
+            print_error("Source and target are the same - use --map to clone under new names")
+            sys.exit(1)
+        
+        # Validates the configuration before any request
+        get_api()
+        source_api = ImprovMXAPI(domain=source)
+        target_api = ImprovMXAPI(domain=target)
+        existing = target_api.prefetch_aliases()
+        source_total = source_api.get_alias_count()
+        plan = ClonePlan(existing.result(), pattern, overwrite)
+        
+        # Reject a clone that cannot fit before anything is sent. Copying every
+        # source alias is the worst case; only if that would not fit is the
+        # source listed up front to count the adds actually needed.
+        source_aliases = None
+        if not dry_run and len(plan.target) + source_total > target_api.alias_limit():
+            source_aliases = [*source_api.iter_aliases()]
+            needed = [*ClonePlan(plan.target, pattern, overwrite).operations(source_aliases)]
+            check_capacity(target_api, needed, len(plan.target))
+        
+        recorder = start_dry_run(target_api) if dry_run else None
+        controller = ConcurrencyController(workers)
+        target_api.ensure_pool(controller.maximum)
+        
+        lock = threading.Lock()
+        results = []
+        
+        def _on_result(index, result):
+            with lock:
+                results.append(result)
+                if not result.ok and not json_output and recorder is None:
+                    print_error(f"{result.operation.action} {result.operation.alias}: {result.error}")
+        
+        # Source pages are fetched as the workers ask for more operations
+        source_error = None
+        try:
+            run_stream(target_api, plan.operations(source_aliases if source_aliases is not None
+                                                   else source_api.iter_aliases()),
+                       _on_result, controller=controller)
+        except Exception as e:
+            # The next source page could not be fetched (deadline, network,
+            # API error); report what was copied before failing
+            source_error = e
+        
+        if recorder is not None:
+            if source_error is not None and not isinstance(source_error, DeadlineExceededError):
+                raise source_error
+            finish_dry_run(target_api, recorder, workers, json_output)
+            return
+        
+        applied = [r.operation for r in results if r.ok]
+        failed = [r for r in results if not r.ok]
+        
+        cache_applied(applied, domain=target)
+        
+        if json_output:
+            print_json_output({
+                "from": source, "to": target, "aliases": plan.seen, "skipped": plan.skipped,
+                "conflicts": plan.conflicts, "results": [r.to_dict() for r in results],
+                **({"error": str(source_error)} if source_error is not None else {})
+            })
+        else:
+            for note in plan.conflicts:
+                print_warning(f"Conflict - {note['alias']}: {note['reason']}")
+            print_success(f"{source} -> {target}: {len(applied)} of {plan.seen} alias(es) copied, "
+                          f"{plan.skipped} already present")
+            print_info(f"{controller.rate():.1f} ops/s, final window {controller.window}"
+                       + (f", {len(failed)} failed" if failed else "")
+                       + (f", {len(plan.conflicts)} conflict(s) - rerun with --overwrite to update them"
+                          if plan.conflicts else ""))
+        
+        if deadline_expired() and not (plan.complete and len(results) == plan.planned):
+            if not json_output:
+                print_warning(f"Deadline reached - {source} was not copied completely; "
+                              f"run the same clone again to continue")
+            sys.exit(EXIT_DEADLINE)
+        if source_error is not None:
+            if not json_output:
+                handle_error_display(source_error)
+                print_warning(f"Listing {source} failed - it was not copied completely; "
+                              f"run the same clone again to continue")
+            sys.exit(1)
+        if failed or plan.conflicts:
+            sys.exit(1)
         
     except Exception as e:
         handle_error_display(e)
@@ -218,9 +1443,15 @@ def status(
 @app.callback(invoke_without_command=True)
 def main(
     ctx: typer.Context,
-    version: bool = typer.Option(False, "--version", help="Show version information")
+    version: bool = typer.Option(False, "--version", help="Show version information"),
+    deadline: Optional[str] = typer.Option(None, "--deadline", help="Time budget for the command, e.g. 10s or 2m (exit status 124 when it runs out)")
 ):
     """GALIAS - Terminal-based ImprovMX alias manager."""
+    try:
+        set_deadline(parse_duration(deadline) if deadline else None)
+    except DurationError as e:
+        raise typer.BadParameter(str(e), param_hint="--deadline")
+    
     if version:
         typer.echo("GALIAS v1.0.0")
         typer.echo("ImprovMX Alias Manager")
@@ -0,0 +1,72 @@
+"""Copying aliases between domains for GALIAS CLI.
+
+``galias clone --from A --to B`` pages through A's aliases lazily and feeds
+each page straight into a concurrent batch of creates on B
+(``batch.run_stream``). Reading the next page therefore overlaps with writing
+the previous one. B's listing is fetched once up front, so aliases that
+already exist there with the same forward are skipped without a request.
+That also makes an interrupted clone safe to run again.
+"""
+
+from typing import Dict, List, Any, Iterable, Iterator
+
+from batch import Operation
+from models import Alias, AliasSet
+
+
+DEFAULT_MAP = "{alias}"
+CATCH_ALL = "*"
+
+
+def map_name(pattern: str, name: str) -> str:
+    """Target name of a source alias (``legacy-{alias}`` -> ``legacy-sales``)."""
+    if name == CATCH_ALL:
+        return name
+    return pattern.replace("{alias}", name)
+
+
+class ClonePlan:
+    """Decides, alias by alias, what a clone has to send to the target."""
+
+    def __init__(self, target: AliasSet, pattern: str = DEFAULT_MAP, overwrite: bool = False):
+        """
+        Args:
+            target: Current aliases of the target domain
+            pattern: Target name template containing ``{alias}``
+            overwrite: Update target aliases that exist with a different
+                forward instead of reporting a conflict
+
+        Raises:
+            ValueError: If the pattern does not contain ``{alias}``
+        """
+        if "{alias}" not in pattern:
+            raise ValueError("--map pattern must contain {alias}")
+        self.target = target
+        self.pattern = pattern
+        self.overwrite = overwrite
+        self.seen = 0
+        self.planned = 0
+        self.skipped = 0
+        self.complete = False
+        self.conflicts: List[Dict[str, Any]] = []
+
+    def operations(self, source: Iterable[Alias]) -> Iterator[Operation]:
+        """Operations needed on the target, yielded as the source is read."""
+        for alias in source:
+            self.seen += 1
+            name = map_name(self.pattern, alias.alias)
+            existing = self.target.get(name)
+            if existing is None:
+                self.planned += 1
+                yield Operation("add", name, alias.forward)
+            elif existing.forward == alias.forward:
+                self.skipped += 1
+            elif self.overwrite:
+                self.planned += 1
+                yield Operation("update", name, alias.forward)
+            else:
+                self.conflicts.append({
+                    "alias": name, "status": "conflict",
+                    "reason": f"exists with forward {existing.forward}, source has {alias.forward}"
+                })
+        self.complete = True
@@ -0,0 +1,174 @@
+"""Fast shell completion for GALIAS CLI.
+
+The shell calls ``galias`` with ``_GALIAS_COMPLETE`` set (Typer's protocol,
+installed with ``galias --install-completion``). ``improvctl`` hands such
+requests to ``fast_complete()`` before importing anything else, which
+answers command names, alias names and job ids from local files only - no
+network, no ``requests``/``rich``/``typer`` import. Anything it does not
+recognise (e.g. option names) falls through to Typer's own completion.
+
+Keep this module free of imports from the rest of the package.
+"""
+
+import os
+import shlex
+import sqlite3
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+COMPLETE_VAR = "_GALIAS_COMPLETE"
+
+# Subcommands in the order they appear in help (kept in sync with cli.app by
+# tests/test_completion.py)
+COMMANDS = [
+    "list", "add", "delete", "status", "doctor", "backup", "restore", "sync",
+    "exporter", "query", "stats", "logs", "gen", "flush", "reap", "jobs",
+    "resume", "undo", "batch", "clone",
+]
+
+# Subcommands whose first positional argument is an existing alias name
+ALIAS_COMMANDS = {"delete", "logs"}
+
+# Subcommands whose first positional argument is a job id
+JOB_COMMANDS = {"resume", "undo"}
+
+MAX_RESULTS = 200
+
+
+def _settings() -> Dict[str, str]:
+    """DOMAIN and GALIAS_HOME from the environment or ./.env (environment wins)."""
+    settings = {}
+    env_path = Path(".env")
+    if env_path.exists():
+        for line in env_path.read_text(encoding="utf-8", errors="ignore").splitlines():
+            key, sep, value = line.partition("=")
+            if sep and key.strip() in ("DOMAIN", "GALIAS_HOME"):
+                settings[key.strip()] = value.strip().strip("'\"")
+    for key in ("DOMAIN", "GALIAS_HOME"):
+        if os.environ.get(key):
+            settings[key] = os.environ[key]
+    settings.setdefault("GALIAS_HOME", str(Path.home() / ".galias"))
+    return settings
+
+
+def alias_names(incomplete: str, domain: Optional[str] = None, home: Optional[str] = None) -> List[str]:
+    """Alias names from the local store that start with ``incomplete``."""
+    settings = _settings()
+    domain = domain or settings.get("DOMAIN")
+    path = Path(home or settings["GALIAS_HOME"]) / "aliases.db"
+    if not domain or not path.exists():
+        return []
+    try:
+        conn = sqlite3.connect(f"{path.resolve().as_uri()}?mode=ro", uri=True)
+        try:
+            # Range scan on the (domain, alias) primary key
+            rows = conn.execute(
+                "SELECT alias FROM aliases WHERE domain = ? AND alias >= ? AND alias < ? "
+                "ORDER BY alias LIMIT ?",
+                (domain, incomplete, incomplete + "\U0010ffff", MAX_RESULTS)
+            ).fetchall()
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return []
+    return [row[0] for row in rows]
+
+
+def job_ids(incomplete: str, home: Optional[str] = None) -> List[str]:
+    """Journaled job ids that start with ``incomplete``, newest first."""
+    directory = Path(home or _settings()["GALIAS_HOME"]) / "jobs"
+    if not directory.exists():
+        return []
+    ids = [path.stem for path in directory.glob("*.jsonl") if path.stem.startswith(incomplete)]
+    return sorted(ids, reverse=True)[:MAX_RESULTS]
+
+
+def candidates(args: List[str], incomplete: str) -> Optional[List[str]]:
+    """
+    Completions for a partially typed command line.
+
+    Args:
+        args: Complete words after the program name
+        incomplete: Word being typed
+
+    Returns:
+        Completion values, or None when Typer should handle the request
+    """
+    if incomplete.startswith("-"):
+        return None
+
+    positional = [arg for arg in args if not arg.startswith("-")]
+    if not positional:
+        return [command for command in COMMANDS if command.startswith(incomplete)]
+
+    command, rest = positional[0], positional[1:]
+    if rest:
+        return None
+    if command in ALIAS_COMMANDS:
+        return alias_names(incomplete)
+    if command in JOB_COMMANDS:
+        return job_ids(incomplete)
+    return None
+
+
+def _split(line: str) -> Optional[List[str]]:
+    try:
+        return shlex.split(line)
+    except ValueError:
+        return None
+
+
+def _request() -> Optional[Tuple[str, List[str], str]]:
+    """Parse the shell's completion request into (shell, args, incomplete)."""
+    shell = os.environ.get(COMPLETE_VAR, "").replace("complete_", "")
+    if shell == "bash":
+        words = _split(os.environ.get("COMP_WORDS", ""))
+        if words is None:
+            return None
+        cword = int(os.environ.get("COMP_CWORD", "0"))
+        incomplete = words[cword] if cword < len(words) else ""
+        return shell, words[1:cword], incomplete
+    if shell in ("zsh", "fish"):
+        line = os.environ.get("_TYPER_COMPLETE_ARGS", "")
+        words = _split(line)
+        if words is None:
+            return None
+        args = words[1:]
+        if args and not line.endswith(" "):
+            return shell, args[:-1], args[-1]
+        return shell, args, ""
+    return None
+
+
+def fast_complete() -> bool:
+    """
+    Answer a completion request if it can be done from local data.
+
+    Returns:
+        True if the request was answered (the caller should exit), False to
+        fall back to Typer's completion
+    """
+    request = _request()
+    if request is None:
+        return False
+    shell, args, incomplete = request
+    values = candidates(args, incomplete)
+    if values is None:
+        return False
+
+    if shell == "bash":
+        sys.stdout.write("\n".join(values))
+    elif shell == "zsh":
+        if values:
+            quoted = "\n".join('"{}"'.format(v.replace('"', '""').replace(":", r"\\:")) for v in values)
+            sys.stdout.write(f"_arguments '*: :(({quoted}))'")
+        else:
+            sys.stdout.write("_files")
+    else:
+        action = os.environ.get("_TYPER_COMPLETE_FISH_ACTION", "")
+        if action == "is-args":
+            sys.exit(0 if values else 1)
+        sys.stdout.write("\n".join(values))
+    return True
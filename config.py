@@ -22,6 +22,37 @@ if not DOMAIN:
 IMPROVMX_API_BASE_URL = os.getenv("IMPROVMX_API_BASE_URL", "https://api.improvmx.com")
 MAX_ALIASES = int(os.getenv("MAX_ALIASES", "25"))
 
+# Local state (backups, caches, journals) lives under GALIAS_HOME
+GALIAS_HOME = Path(os.getenv("GALIAS_HOME", str(Path.home() / ".galias")))
+BATCH_WORKERS = int(os.getenv("GALIAS_BATCH_WORKERS", "4"))
+# Upper bound for the adaptive concurrency window of batch jobs
+BATCH_MAX_WORKERS = int(os.getenv("GALIAS_BATCH_MAX_WORKERS", "16"))
+BACKUP_KEEP = int(os.getenv("GALIAS_BACKUP_KEEP", "30"))
+# HTTP transport (timeouts in seconds; proxy URL applies to http and https)
+HTTP_CONNECT_TIMEOUT = float(os.getenv("GALIAS_CONNECT_TIMEOUT", "5"))
+HTTP_READ_TIMEOUT = float(os.getenv("GALIAS_READ_TIMEOUT", "30"))
+HTTP_POOL_CONNECTIONS = int(os.getenv("GALIAS_POOL_CONNECTIONS", "10"))
+HTTP_POOL_MAXSIZE = int(os.getenv("GALIAS_POOL_MAXSIZE", str(max(BATCH_MAX_WORKERS, 10))))
+HTTP_PROXY = os.getenv("GALIAS_PROXY")
+# Record API traffic to, or replay it from, a cassette file (see cassette.py)
+RECORD_PATH = os.getenv("GALIAS_RECORD")
+REPLAY_PATH = os.getenv("GALIAS_REPLAY")
+REPLAY_SPEED = float(os.getenv("GALIAS_REPLAY_SPEED", "1"))
+
+# Circuit breaker: consecutive failures that stop requests (0 disables),
+# seconds before a probe, and whether to wait instead of failing fast
+BREAKER_THRESHOLD = int(os.getenv("GALIAS_BREAKER_THRESHOLD", "5"))
+BREAKER_RESET = float(os.getenv("GALIAS_BREAKER_RESET", "30"))
+BREAKER_WAIT = os.getenv("GALIAS_BREAKER_WAIT", "").lower() in ("1", "true", "yes")
+
+# Hedged GETs: latency percentile after which a slow GET is sent again
+# (0 disables) and the share of GETs that may be duplicated
+HEDGE_PERCENTILE = float(os.getenv("GALIAS_HEDGE_PERCENTILE", "0"))
+HEDGE_BUDGET = float(os.getenv("GALIAS_HEDGE_BUDGET", "0.05"))
+
+# Account limits fetched from the API are cached locally for this many seconds
+LIMITS_TTL = int(os.getenv("GALIAS_LIMITS_TTL", "3600"))
+
 # Validate API key format
 if not IMPROVMX_API_KEY.startswith("sk_"):
     print("X Invalid API key format. ImprovMX API keys should start with 'sk_'")
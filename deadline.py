@@ -0,0 +1,104 @@
+"""Per-command time budget for GALIAS CLI.
+
+``galias --deadline 10s COMMAND`` starts a budget before the command runs.
+Every API request checks it: once it is spent, no request is sent, and
+requests still being sent get their connect and read timeouts cut to what
+is left. Batch executors stop starting queued operations when it runs out.
+The command then reports what it got done and exits with ``EXIT_DEADLINE``.
+
+Durations (``--deadline 10s``, ``add --ttl 7d``) are parsed by
+``parse_duration``.
+"""
+
+import re
+import time
+from typing import Callable, Optional, Tuple, Union
+
+
+# Same status as timeout(1), so scripts can tell "ran out of time" from errors
+EXIT_DEADLINE = 124
+
+Timeout = Union[float, Tuple[float, float]]
+
+DURATION = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([smhdw])\s*$")
+UNIT_SECONDS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+
+
+class DurationError(Exception):
+    """Raised when a duration cannot be parsed."""
+    pass
+
+
+def parse_duration(text: str) -> float:
+    """
+    Parse a duration like ``30s``, ``15m``, ``12h``, ``7d`` or ``2w``.
+
+    Returns:
+        Duration in seconds
+
+    Raises:
+        DurationError: If the text is not a positive duration
+    """
+    match = DURATION.match(text or "")
+    if not match:
+        raise DurationError(f"Invalid duration '{text}'. Use a number with s, m, h, d or w (e.g. 7d)")
+    seconds = float(match.group(1)) * UNIT_SECONDS[match.group(2)]
+    if seconds <= 0:
+        raise DurationError("Duration must be greater than zero")
+    return seconds
+
+
+class Deadline:
+    """A point in time after which no more work should start."""
+
+    def __init__(self, seconds: float, clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            seconds: Budget from now
+            clock: Monotonic time source (for tests)
+        """
+        self.seconds = seconds
+        self._clock = clock
+        self.expires_at = clock() + seconds
+
+    def remaining(self) -> float:
+        """Seconds left (0 once expired)."""
+        return max(0.0, self.expires_at - self._clock())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def clip(self, seconds: float) -> float:
+        """``seconds``, shortened so it ends by the deadline."""
+        return min(seconds, self.remaining())
+
+    def timeout(self, timeout: Timeout) -> Timeout:
+        """A requests timeout (seconds or (connect, read)) cut to the time left."""
+        if isinstance(timeout, tuple):
+            return tuple(self.clip(part) for part in timeout)
+        return self.clip(timeout)
+
+
+_current: Optional[Deadline] = None
+
+
+def set_deadline(seconds: Optional[float]) -> Optional[Deadline]:
+    """Start the budget of the running command (None removes it)."""
+    global _current
+    _current = Deadline(seconds) if seconds is not None else None
+    return _current
+
+
+def current_deadline() -> Optional[Deadline]:
+    return _current
+
+
+def deadline_expired() -> bool:
+    """True if a budget was set and has run out."""
+    return _current is not None and _current.expired
+
+
+def clip_to_deadline(seconds: float) -> float:
+    """Shorten a sleep so that it ends by the deadline, if there is one."""
+    return seconds if _current is None else _current.clip(seconds)
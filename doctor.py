@@ -0,0 +1,238 @@
+"""Connection and environment diagnostics for GALIAS CLI.
+
+``galias doctor`` answers "where does the time go?":
+
+* start-up cost of loading the configuration and importing the CLI's
+  dependencies, measured in a fresh interpreter so nothing is cached;
+* a breakdown of one API request into DNS resolution, TCP connect, TLS
+  handshake, time to first byte, body download and JSON decode, repeated
+  to report percentiles;
+* whether the ``ImprovMXAPI`` session reuses its connection across requests.
+
+The timed requests open their own sockets, so they always go directly to the
+host (any configured proxy is not used). The API key is only sent over HTTPS
+to the host of ``IMPROVMX_API_BASE_URL``; other URLs are requested without
+credentials.
+"""
+
+import http.client
+import json
+import os
+import platform
+import socket
+import ssl
+import subprocess
+import sys
+import time
+from base64 import b64encode
+from typing import Dict, List, Any, Optional
+from urllib.parse import urlsplit
+
+import requests
+
+from config import (
+    IMPROVMX_API_KEY, IMPROVMX_API_BASE_URL, API_URL, HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT,
+    HTTP_PROXY
+)
+from percentiles import percentile
+
+
+PHASES = ("dns", "connect", "tls", "ttfb", "download", "decode")
+
+# Modules whose import time is reported, in import order
+STARTUP_MODULES = ("config", "requests", "rich.console", "typer", "api", "cli")
+
+STARTUP_SCRIPT = """
+import json, sys, time
+timings = {}
+for name in sys.argv[1:]:
+    start = time.perf_counter()
+    __import__(name)
+    timings[name] = time.perf_counter() - start
+print(json.dumps(timings))
+"""
+
+
+def measure_startup(cwd: Optional[str] = None) -> Dict[str, float]:
+    """
+    Import times of the CLI's modules in a fresh interpreter, in seconds.
+
+    Each value is the time for that import given that the previous modules
+    are already loaded, so they add up to the start-up cost.
+    """
+    result = subprocess.run(
+        [sys.executable, "-c", STARTUP_SCRIPT] + list(STARTUP_MODULES),
+        capture_output=True, text=True, cwd=cwd or os.getcwd(), timeout=60,
+        env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"}
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "import failed")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def credentials_for(url: str) -> Optional[str]:
+    """Authorization header for ``url``: only HTTPS requests to the API's own host get the key."""
+    parts = urlsplit(url)
+    api = urlsplit(IMPROVMX_API_BASE_URL)
+    if parts.scheme != "https" or api.scheme != "https":
+        return None
+    if (parts.hostname, parts.port or 443) != (api.hostname, api.port or 443):
+        return None
+    return "Basic " + b64encode(f"api:{IMPROVMX_API_KEY}".encode()).decode()
+
+
+def measure_request(url: str, auth: Optional[str] = None, timeout: float = None) -> Dict[str, Any]:
+    """
+    Time the phases of one GET request on a fresh, direct connection.
+
+    Args:
+        url: URL to request
+        auth: Value of the Authorization header
+        timeout: Socket timeout in seconds
+
+    Returns:
+        Dict with a duration in seconds for each of PHASES (``tls`` is None
+        for plain HTTP), plus ``status``, ``bytes`` and ``address``
+    """
+    timeout = timeout or HTTP_READ_TIMEOUT
+    parts = urlsplit(url)
+    secure = parts.scheme == "https"
+    port = parts.port or (443 if secure else 80)
+    path = parts.path or "/"
+    if parts.query:
+        path += "?" + parts.query
+    timings: Dict[str, Any] = {}
+
+    start = time.perf_counter()
+    family, socktype, proto, _, address = socket.getaddrinfo(parts.hostname, port, type=socket.SOCK_STREAM)[0]
+    timings["dns"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    sock = socket.socket(family, socktype, proto)
+    sock.settimeout(min(timeout, HTTP_CONNECT_TIMEOUT))
+    sock.connect(address)
+    timings["connect"] = time.perf_counter() - start
+    sock.settimeout(timeout)
+
+    timings["tls"] = None
+    if secure:
+        start = time.perf_counter()
+        sock = ssl.create_default_context().wrap_socket(sock, server_hostname=parts.hostname)
+        timings["tls"] = time.perf_counter() - start
+
+    conn = (http.client.HTTPSConnection if secure else http.client.HTTPConnection)(
+        parts.hostname, port, timeout=timeout
+    )
+    conn.sock = sock
+    try:
+        headers = {"User-Agent": "GALIAS-CLI/1.0 (doctor)", "Accept": "application/json"}
+        if auth:
+            headers["Authorization"] = auth
+        start = time.perf_counter()
+        conn.request("GET", path, headers=headers)
+        response = conn.getresponse()
+        timings["ttfb"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        body = response.read()
+        timings["download"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        try:
+            json.loads(body)
+        except ValueError:
+            pass
+        timings["decode"] = time.perf_counter() - start
+    finally:
+        conn.close()
+
+    timings["status"] = response.status
+    timings["bytes"] = len(body)
+    timings["address"] = address[0]
+    return timings
+
+
+def check_reuse(api, requests_to_send: int = 3) -> Dict[str, Any]:
+    """
+    Send a few small requests through an ImprovMXAPI client and check that
+    they share one connection.
+    """
+    before = api.connection_stats()
+    for _ in range(requests_to_send):
+        api.get_account_limits()
+    after = api.connection_stats()
+    opened = after["connections"] - before["connections"]
+    sent = after["requests"] - before["requests"]
+    return {"requests": sent, "connections": opened, "reused": opened <= 1 and sent >= requests_to_send}
+
+
+def summarize(samples: List[Dict[str, Any]]) -> Dict[str, Dict[str, Optional[float]]]:
+    """Per-phase p50/p90/max in milliseconds (plus the total)."""
+    summary = {}
+    for phase in PHASES + ("total",):
+        if phase == "total":
+            values = [sum(s[p] or 0 for p in PHASES) for s in samples]
+        else:
+            values = [s[phase] for s in samples if s.get(phase) is not None]
+        if not values:
+            summary[phase] = None
+            continue
+        summary[phase] = {
+            "p50": round(percentile(values, 50) * 1000, 1),
+            "p90": round(percentile(values, 90) * 1000, 1),
+            "max": round(max(values) * 1000, 1),
+        }
+    return summary
+
+
+def environment() -> Dict[str, Any]:
+    """Versions and transport settings relevant to performance."""
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "requests": requests.__version__,
+        "api_url": API_URL,
+        "proxy": HTTP_PROXY or os.environ.get("HTTPS_PROXY") or os.environ.get("https_proxy"),
+        "connect_timeout": HTTP_CONNECT_TIMEOUT,
+        "read_timeout": HTTP_READ_TIMEOUT,
+    }
+
+
+def run(api, repeat: int = 5, url: str = None) -> Dict[str, Any]:
+    """
+    Run every diagnostic.
+
+    Failures are reported in the result instead of raised, so one broken
+    step (e.g. DNS) does not hide the others.
+    """
+    report: Dict[str, Any] = {"environment": environment()}
+
+    try:
+        report["startup_ms"] = {name: round(s * 1000, 1) for name, s in measure_startup().items()}
+    except Exception as e:
+        report["startup_error"] = str(e)
+
+    url = url or f"{API_URL}/aliases?page=1"
+    auth = credentials_for(url)
+    samples = []
+    errors = []
+    for _ in range(max(1, repeat)):
+        try:
+            samples.append(measure_request(url, auth))
+        except Exception as e:
+            errors.append(f"{type(e).__name__}: {e}")
+    report["requests"] = {
+        "url": url,
+        "authenticated": auth is not None,
+        "samples": len(samples),
+        "status": samples[-1]["status"] if samples else None,
+        "address": samples[-1]["address"] if samples else None,
+        "phases_ms": summarize(samples) if samples else None,
+        "errors": errors,
+    }
+
+    try:
+        report["connection_reuse"] = check_reuse(api)
+    except Exception as e:
+        report["connection_reuse"] = {"error": str(e)}
+    return report
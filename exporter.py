@@ -0,0 +1,250 @@
+"""Prometheus exporter for GALIAS CLI.
+
+``galias exporter`` refreshes alias counts and account limits for each
+domain on a fixed interval in a background thread and serves the last
+result at ``/metrics`` in the Prometheus text format. Scrapes only read the
+cached values, so the number of ImprovMX API calls depends on the refresh
+interval, not on how often (or by how many servers) the exporter is scraped.
+
+A refresh reads the count from the listing's ``total`` (one request per
+domain). Paging through every alias to keep the local alias store in sync
+only happens on the separate, much longer ``sync_interval``, if one is set.
+"""
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Any, Optional, Tuple
+
+from api import ImprovMXAPI
+from breaker import STATE_VALUES
+from store import AliasStore
+
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+DEFAULT_PORT = 9877
+DEFAULT_INTERVAL = 60
+# Store syncs page through every alias, so they are off unless asked for
+DEFAULT_SYNC_INTERVAL = 0
+
+LATENCY_QUANTILES = (0.5, 0.9, 0.99)
+
+# name -> (type, help)
+METRICS = {
+    "galias_up": ("gauge", "Whether the last refresh of the domain succeeded"),
+    "galias_aliases": ("gauge", "Number of aliases on the domain"),
+    "galias_alias_limit": ("gauge", "Maximum number of aliases per domain on the account"),
+    "galias_alias_usage_ratio": ("gauge", "Aliases in use as a fraction of the limit"),
+    "galias_last_refresh_timestamp_seconds": ("gauge", "Unix time of the last successful refresh"),
+    "galias_refresh_errors_total": ("counter", "Failed refreshes of the domain"),
+    "galias_api_requests_total": ("counter", "Requests sent to the ImprovMX API"),
+    "galias_api_errors_total": ("counter", "ImprovMX API requests that failed"),
+    "galias_api_latency_seconds": ("summary", "ImprovMX API request latency"),
+    "galias_circuit_state": ("gauge", "API circuit breaker state (0 closed, 1 half-open, 2 open)"),
+    "galias_circuit_opens_total": ("counter", "Times the API circuit breaker opened"),
+    "galias_circuit_rejected_total": ("counter", "Requests refused while the API circuit breaker was open"),
+    "galias_hedge_requests_total": ("counter", "GET requests eligible for hedging"),
+    "galias_hedges_total": ("counter", "Duplicate GET requests sent because the first was slow"),
+    "galias_hedge_wins_total": ("counter", "Hedged GET requests answered first by the duplicate"),
+    "galias_hedge_p99_improvement_seconds": ("gauge", "p99 GET latency without hedging minus p99 with hedging"),
+}
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value is None:
+        return "NaN"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def render_metrics(samples: List[Tuple[str, Dict[str, str], float]]) -> str:
+    """
+    Render samples in the Prometheus text exposition format.
+
+    Args:
+        samples: (metric name, labels, value) tuples; summary parts use the
+            ``_sum``/``_count`` suffixes of a name in METRICS
+
+    Returns:
+        Exposition text with HELP/TYPE lines for every metric present
+    """
+    by_metric: Dict[str, List[str]] = {}
+    for name, labels, value in samples:
+        base = name
+        for suffix in ("_sum", "_count"):
+            if name.endswith(suffix) and name[:-len(suffix)] in METRICS:
+                base = name[:-len(suffix)]
+        label_text = ",".join(f'{key}="{_escape(str(val))}"' for key, val in labels.items())
+        line = f"{name}{{{label_text}}} {_format_value(value)}" if label_text else f"{name} {_format_value(value)}"
+        by_metric.setdefault(base, []).append(line)
+
+    lines = []
+    for name, metric_lines in by_metric.items():
+        kind, help_text = METRICS.get(name, ("untyped", ""))
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        lines.extend(metric_lines)
+    return "\n".join(lines) + "\n"
+
+
+class DomainState:
+    """Last refreshed values for one domain."""
+
+    def __init__(self, domain: str, api: ImprovMXAPI):
+        self.domain = domain
+        self.api = api
+        self.aliases: Optional[int] = None
+        self.limit: Optional[int] = None
+        self.refreshed_at: Optional[float] = None
+        self.synced_at: Optional[float] = None
+        self.refresh_errors = 0
+        self.up = False
+
+
+class MetricsCollector:
+    """Refreshes domain metrics in the background and renders cached values."""
+
+    def __init__(self, apis: Dict[str, ImprovMXAPI], interval: float = DEFAULT_INTERVAL,
+                 store_path=None, sync_interval: float = DEFAULT_SYNC_INTERVAL):
+        """
+        Args:
+            apis: Client per domain to export
+            interval: Seconds between refreshes
+            store_path: Alias store to keep in sync (default store)
+            sync_interval: Seconds between full syncs of the alias store
+                (0 to never sync)
+        """
+        self.interval = interval
+        self.store_path = store_path
+        self.sync_interval = sync_interval
+        self.domains = {domain: DomainState(domain, api) for domain, api in apis.items()}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def refresh(self):
+        """Fetch counts and limits for every domain once."""
+        for state in self.domains.values():
+            try:
+                count = state.api.get_alias_count()
+                limit = state.api.alias_limit()
+            except Exception:
+                with self._lock:
+                    state.up = False
+                    state.refresh_errors += 1
+                continue
+            with self._lock:
+                state.aliases = count
+                state.limit = limit
+                state.refreshed_at = time.time()
+                state.up = True
+        if self._sync_due():
+            self.sync()
+
+    def _sync_due(self) -> bool:
+        if not self.sync_interval:
+            return False
+        now = time.time()
+        return any(state.synced_at is None or now - state.synced_at >= self.sync_interval
+                   for state in self.domains.values())
+
+    def sync(self):
+        """Page through every alias of each domain into the alias store."""
+        with AliasStore(self.store_path) as store:
+            for state in self.domains.values():
+                try:
+                    store.sync(state.api.iter_aliases(), state.domain)
+                except Exception:
+                    # The next refresh tries again; counts are unaffected
+                    continue
+                with self._lock:
+                    state.synced_at = time.time()
+
+    def _loop(self):
+        while not self._stop.is_set():
+            self.refresh()
+            self._stop.wait(self.interval)
+
+    def start(self):
+        """Start the refresh loop (the first refresh runs immediately)."""
+        self._thread = threading.Thread(target=self._loop, name="galias-exporter", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def samples(self) -> List[Tuple[str, Dict[str, str], float]]:
+        """Current samples from cached values and client counters (no API calls)."""
+        samples = []
+        with self._lock:
+            for domain, state in self.domains.items():
+                labels = {"domain": domain}
+                samples.append(("galias_up", labels, 1 if state.up else 0))
+                if state.aliases is not None:
+                    samples.append(("galias_aliases", labels, state.aliases))
+                    samples.append(("galias_alias_limit", labels, state.limit))
+                    if state.limit:
+                        samples.append(("galias_alias_usage_ratio", labels, round(state.aliases / state.limit, 4)))
+                    samples.append(("galias_last_refresh_timestamp_seconds", labels, round(state.refreshed_at, 3)))
+                samples.append(("galias_refresh_errors_total", labels, state.refresh_errors))
+
+                stats = state.api.stats
+                samples.append(("galias_api_requests_total", labels, stats.requests))
+                samples.append(("galias_api_errors_total", labels, stats.errors))
+                for quantile in LATENCY_QUANTILES:
+                    value = stats.percentile(quantile * 100)
+                    if value is not None:
+                        samples.append((
+                            "galias_api_latency_seconds",
+                            {"domain": domain, "quantile": str(quantile)}, round(value, 6)
+                        ))
+                samples.append(("galias_api_latency_seconds_sum", labels, round(stats.total_seconds, 6)))
+                samples.append(("galias_api_latency_seconds_count", labels, stats.requests))
+
+                circuit = state.api.breaker.snapshot()
+                samples.append(("galias_circuit_state", labels, STATE_VALUES[circuit["state"]]))
+                samples.append(("galias_circuit_opens_total", labels, circuit["opens"]))
+                samples.append(("galias_circuit_rejected_total", labels, circuit["rejected"]))
+
+                if state.api.hedger is not None:
+                    hedging = state.api.hedger.snapshot()
+                    samples.append(("galias_hedge_requests_total", labels, hedging["requests"]))
+                    samples.append(("galias_hedges_total", labels, hedging["hedged"]))
+                    samples.append(("galias_hedge_wins_total", labels, hedging["wins"]))
+                    if hedging["p99_improvement"] is not None:
+                        samples.append(("galias_hedge_p99_improvement_seconds", labels,
+                                        round(hedging["p99_improvement"], 6)))
+        return samples
+
+    def render(self) -> str:
+        return render_metrics(self.samples())
+
+
+def make_server(collector: MetricsCollector, host: str, port: int) -> ThreadingHTTPServer:
+    """HTTP server answering /metrics from the collector's cache."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?", 1)[0] != "/metrics":
+                self.send_error(404, "Only /metrics is served")
+                return
+            body = collector.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args: Any):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    return server
@@ -0,0 +1,110 @@
+"""Collision-free alias name generation for GALIAS CLI.
+
+Patterns are plain text with placeholders:
+
+    {rand}    8 random lowercase letters/digits
+    {rand:N}  N random lowercase letters/digits
+    {n}       sequence number starting at 1 ({n:4} zero-pads to 4 digits)
+    {date}    today's date as YYYYMMDD
+
+Candidates are checked against a set of existing alias names built from a
+single listing, so creating them never hits ``AliasExistsError``.
+"""
+
+import re
+import secrets
+import string
+from datetime import date
+from typing import List, Set, Iterable, Iterator, Optional
+
+from models import Alias
+
+
+ALPHABET = string.ascii_lowercase + string.digits
+DEFAULT_PATTERN = "{rand:10}"
+PLACEHOLDER = re.compile(r"\{(rand|n|date)(?::(\d+))?\}")
+VALID_ALIAS = re.compile(r"^[a-z0-9][a-z0-9._+-]*$")
+
+# Give up when this many candidates in a row collide
+MAX_CONSECUTIVE_COLLISIONS = 1000
+
+
+class GeneratorError(Exception):
+    """Raised when a pattern is invalid or cannot produce enough unique names."""
+    pass
+
+
+def validate_pattern(pattern: str):
+    """Check that a pattern is well formed."""
+    leftover = PLACEHOLDER.sub("", pattern)
+    if "{" in leftover or "}" in leftover:
+        raise GeneratorError(f"Unknown placeholder in pattern: {pattern}")
+    if not any(match.group(1) in ("rand", "n") for match in PLACEHOLDER.finditer(pattern)):
+        raise GeneratorError("Pattern must contain {rand} or {n} to generate distinct names")
+    for match in PLACEHOLDER.finditer(pattern):
+        if match.group(1) == "rand" and match.group(2) is not None and int(match.group(2)) < 1:
+            raise GeneratorError("{rand:N} needs N >= 1")
+
+
+def render(pattern: str, sequence: int, today: Optional[date] = None) -> str:
+    """Render one candidate name from a pattern."""
+    today = today or date.today()
+
+    def _replace(match):
+        kind, arg = match.group(1), match.group(2)
+        if kind == "rand":
+            length = int(arg) if arg else 8
+            return "".join(secrets.choice(ALPHABET) for _ in range(length))
+        if kind == "n":
+            return str(sequence).zfill(int(arg) if arg else 0)
+        return today.strftime("%Y%m%d")
+
+    return PLACEHOLDER.sub(_replace, pattern).lower()
+
+
+def generate(pattern: str, count: int, existing: Set[str], start: int = 1) -> List[str]:
+    """
+    Generate ``count`` distinct alias names not present in ``existing``.
+
+    Args:
+        pattern: Name pattern (see module docstring)
+        count: Number of names to generate
+        existing: Alias names already in use
+        start: First sequence number for {n}
+
+    Returns:
+        Generated names in creation order
+
+    Raises:
+        GeneratorError: If the pattern is invalid or too many candidates collide
+    """
+    validate_pattern(pattern)
+    names: List[str] = []
+    taken = set()
+    sequence = start
+    collisions = 0
+
+    while len(names) < count:
+        candidate = render(pattern, sequence)
+        sequence += 1
+        if not VALID_ALIAS.match(candidate):
+            raise GeneratorError(f"Pattern produces an invalid alias name: {candidate}")
+        if candidate in existing or candidate in taken:
+            collisions += 1
+            if collisions >= MAX_CONSECUTIVE_COLLISIONS:
+                raise GeneratorError(
+                    f"Pattern '{pattern}' ran out of unused names after {len(names)} of {count}"
+                )
+            continue
+        collisions = 0
+        taken.add(candidate)
+        names.append(candidate)
+
+    return names
+
+
+def collect_names(aliases: Iterable[Alias], names: Set[str]) -> Iterator[Alias]:
+    """Pass aliases through while adding their names to ``names``."""
+    for alias in aliases:
+        names.add(alias.alias)
+        yield alias
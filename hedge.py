@@ -0,0 +1,159 @@
+"""Request hedging for idempotent GETs in the GALIAS API client.
+
+A GET that has not been answered by a percentile of recent GET latencies is
+sent a second time, over another pooled connection, and whichever response
+arrives first is used. This cuts the tail that occasional slow API responses
+add to listings and counts, at the cost of a few duplicate reads. A token
+bucket limits the duplicates to a fraction of all GETs, so a slow API does
+not get twice the traffic.
+
+For each GET the latency the caller saw is kept, along with the latency the
+first request alone would have had. The difference between their p99s shows
+how much hedging helps.
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, wait, FIRST_COMPLETED
+from typing import Dict, Any, Callable, Optional
+
+from percentiles import percentile
+
+
+DEFAULT_PERCENTILE = 95.0
+# Duplicate requests allowed per GET
+DEFAULT_BUDGET = 0.05
+# GETs observed before the percentile is trusted
+MIN_SAMPLES = 20
+# Hedges that may fire back to back once the budget has built up
+MAX_BURST = 10.0
+# Never hedge sooner than this many seconds
+MIN_DELAY = 0.01
+
+
+class Hedger:
+    """Sends a duplicate of slow requests and keeps the first answer."""
+
+    def __init__(self, percentile: float = DEFAULT_PERCENTILE, budget: float = DEFAULT_BUDGET,
+                 window: int = 1000, min_samples: int = MIN_SAMPLES):
+        """
+        Args:
+            percentile: Latency percentile (0-100) after which a duplicate is sent
+            budget: Duplicates allowed per request, e.g. 0.05 for at most 5% extra
+            window: Number of recent latencies kept
+            min_samples: Requests observed before hedging starts
+        """
+        self.percentile = percentile
+        self.budget = budget
+        self.min_samples = min_samples
+        self._lock = threading.Lock()
+        self._tokens = 0.0
+        # Latency of the first request alone, and latency the caller saw
+        self.unhedged = deque(maxlen=window)
+        self.effective = deque(maxlen=window)
+        self.requests = 0
+        self.hedged = 0
+        self.wins = 0
+        self.denied = 0
+
+    def delay(self) -> Optional[float]:
+        """Seconds to wait for an answer before hedging (None while warming up)."""
+        with self._lock:
+            if not self.unhedged or len(self.unhedged) < self.min_samples:
+                return None
+            latencies = list(self.unhedged)
+        return max(MIN_DELAY, percentile(latencies, self.percentile))
+
+    def _spend(self) -> bool:
+        with self._lock:
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                self.hedged += 1
+                return True
+            self.denied += 1
+            return False
+
+    def _start(self, send: Callable[[], Any], primary: bool) -> Future:
+        future: Future = Future()
+        start = time.perf_counter()
+
+        def _run():
+            future.set_running_or_notify_cancel()
+            try:
+                result, error = send(), None
+            except BaseException as e:
+                result, error = None, e
+            if primary:
+                with self._lock:
+                    self.unhedged.append(time.perf_counter() - start)
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+        # Daemon threads: a losing request still in flight never delays exit
+        threading.Thread(target=_run, name="galias-hedge", daemon=True).start()
+        return future
+
+    def request(self, send: Callable[[], Any]) -> Any:
+        """
+        Call ``send`` and return its result, hedging it if it is slow.
+
+        Args:
+            send: Sends one idempotent request; may be called twice concurrently
+
+        Returns:
+            The result of whichever call succeeded first
+        """
+        delay = self.delay()
+        with self._lock:
+            self.requests += 1
+            self._tokens = min(MAX_BURST, self._tokens + self.budget)
+        start = time.perf_counter()
+
+        try:
+            if delay is None:
+                # Warming up: no thread hand-off
+                try:
+                    return send()
+                finally:
+                    with self._lock:
+                        self.unhedged.append(time.perf_counter() - start)
+
+            primary = self._start(send, primary=True)
+            done, _ = wait([primary], timeout=delay)
+            if done or not self._spend():
+                return primary.result()
+
+            hedge = self._start(send, primary=False)
+            pending = {primary, hedge}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future.exception() is None:
+                        if future is hedge:
+                            with self._lock:
+                                self.wins += 1
+                        return future.result()
+            # Both failed: report the original request's error
+            return primary.result()
+        finally:
+            with self._lock:
+                self.effective.append(time.perf_counter() - start)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Counters and p99 latencies (seconds) with and without hedging."""
+        with self._lock:
+            unhedged = list(self.unhedged)
+            effective = list(self.effective)
+            counters = {"requests": self.requests, "hedged": self.hedged,
+                        "wins": self.wins, "denied": self.denied}
+        p99 = percentile(effective, 99)
+        p99_unhedged = percentile(unhedged, 99)
+        return {
+            **counters,
+            "p99": p99,
+            "p99_unhedged": p99_unhedged,
+            "p99_improvement": None if p99 is None or p99_unhedged is None else p99_unhedged - p99,
+        }
@@ -13,11 +13,20 @@ from pathlib import Path
 current_dir = Path(__file__).parent
 sys.path.insert(0, str(current_dir))
 
+# Answer shell completion from local data before loading config, the API
+# client and the UI (see completion.py)
+if os.environ.get("_GALIAS_COMPLETE"):
+    import completion
+    if completion.fast_complete():
+        sys.exit(0)
+
 try:
     # Import config first to validate environment
     import config
     from cli import app
     from ui import print_error, console
+    from api import DeadlineExceededError
+    from deadline import EXIT_DEADLINE
 except ImportError as e:
     print(f"Error importing modules: {e}")
     print("Make sure all required dependencies are installed:")
@@ -29,8 +38,16 @@ def main():
     """Main entry point for GALIAS CLI."""
     try:
         # Run the CLI app (config is already validated at import time)
-        app()
-
+        app(prog_name="galias")
+
+    except SystemExit as e:
+        # Commands exit with status 1 from their error handler; only when the
+        # error they handled was a request cut off by the --deadline is that
+        # reported as running out of time. Partial results exit with
+        # EXIT_DEADLINE themselves.
+        if e.code == 1 and isinstance(e.__context__, DeadlineExceededError):
+            sys.exit(EXIT_DEADLINE)
+        raise
     except KeyboardInterrupt:
         console.print("\n\nOperation cancelled by user", style="dim yellow")
         sys.exit(0)
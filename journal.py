@@ -0,0 +1,238 @@
+"""Write-ahead journal for batch alias changes in GALIAS CLI.
+
+Every batch run is a *job* stored as ``GALIAS_HOME/jobs/<id>.jsonl``. The
+job header and the intent for every operation (with its inverse) are written
+and fsynced before anything is sent; completion records are appended as
+results come in. An interrupted job can therefore be resumed without
+redoing finished operations, and a finished job can be undone.
+"""
+
+import json
+import os
+import secrets
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+
+from config import GALIAS_HOME, DOMAIN
+from api import AliasExistsError, AliasNotFoundError
+from batch import Operation, OperationResult, ConcurrencyController, run_phased
+from models import AliasSet
+
+
+class JournalError(Exception):
+    """Raised when a job journal is missing or unreadable."""
+    pass
+
+
+def jobs_dir() -> Path:
+    """Directory holding job journals."""
+    return GALIAS_HOME / "jobs"
+
+
+def inverse_of(operation: Operation, prior: AliasSet) -> Optional[Operation]:
+    """
+    Compute the operation that reverts ``operation``.
+
+    Args:
+        operation: Operation about to be applied
+        prior: Live aliases before the job started
+
+    Returns:
+        The inverse operation, or None when it cannot be determined
+    """
+    before = prior.get(operation.alias)
+    if operation.action == "add":
+        return Operation("delete", operation.alias)
+    if before is None:
+        return None
+    if operation.action == "delete":
+        return Operation("add", operation.alias, before.forward)
+    return Operation("update", operation.alias, before.forward)
+
+
+class Job:
+    """A journaled batch of operations."""
+
+    def __init__(self, path: Path):
+        """Load a job from its journal file."""
+        self.path = Path(path)
+        self.operations: Dict[int, Operation] = {}
+        self.inverses: Dict[int, Optional[Operation]] = {}
+        self.status: Dict[int, str] = {}
+        self.errors: Dict[int, str] = {}
+        self._lock = threading.Lock()
+
+        try:
+            with open(self.path, encoding="utf-8") as handle:
+                header = json.loads(handle.readline())
+                for line in handle:
+                    if not line.strip():
+                        continue
+                    try:
+                        self._apply_record(json.loads(line))
+                    except ValueError:
+                        # A torn final line from a crash mid-write
+                        break
+        except (OSError, ValueError) as e:
+            raise JournalError(f"Cannot read job journal {self.path.name}: {e}")
+
+        self.id = header["id"]
+        self.command = header["command"]
+        self.domain = header.get("domain")
+        self.created = header["created"]
+        self.parent = header.get("parent")
+
+    def _apply_record(self, record: Dict[str, Any]):
+        seq = record["seq"]
+        if record["type"] == "intent":
+            self.operations[seq] = Operation.from_dict(record["op"])
+            inverse = record.get("inverse")
+            self.inverses[seq] = Operation.from_dict(inverse) if inverse else None
+            self.status[seq] = "pending"
+        elif record["type"] in ("done", "failed"):
+            self.status[seq] = record["type"]
+            if record.get("error"):
+                self.errors[seq] = record["error"]
+            else:
+                self.errors.pop(seq, None)
+
+    @classmethod
+    def create(cls, command: str, operations: List[Operation],
+               prior: AliasSet, domain: str = None,
+               parent: str = None, directory: Path = None) -> "Job":
+        """
+        Write a new job journal containing the intent for every operation.
+
+        Args:
+            command: Name of the command that produced the batch
+            operations: Operations in the order they should be applied
+            prior: Live aliases, used to compute inverses
+            domain: Domain the operations target
+            parent: Job this one undoes, if any
+            directory: Journal directory (defaults to GALIAS_HOME/jobs)
+        """
+        directory = Path(directory) if directory else jobs_dir()
+        directory.mkdir(parents=True, exist_ok=True)
+        now = datetime.now(timezone.utc)
+        job_id = f"{now.strftime('%Y%m%d-%H%M%S')}-{secrets.token_hex(2)}"
+        path = directory / f"{job_id}.jsonl"
+
+        with open(path, "w", encoding="utf-8") as handle:
+            handle.write(json.dumps({
+                "type": "job",
+                "id": job_id,
+                "command": command,
+                "domain": domain or DOMAIN,
+                "created": now.isoformat(),
+                "parent": parent,
+            }) + "\n")
+            for seq, op in enumerate(operations):
+                inverse = inverse_of(op, prior)
+                handle.write(json.dumps({
+                    "type": "intent",
+                    "seq": seq,
+                    "op": op.to_dict(),
+                    "inverse": inverse.to_dict() if inverse else None,
+                }) + "\n")
+            handle.flush()
+            os.fsync(handle.fileno())
+
+        return cls(path)
+
+    def record(self, seq: int, error: Optional[str] = None):
+        """Durably append the outcome of an operation."""
+        entry = {"type": "failed" if error else "done", "seq": seq}
+        if error:
+            entry["error"] = error
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as handle:
+                handle.write(json.dumps(entry) + "\n")
+                handle.flush()
+                os.fsync(handle.fileno())
+            self._apply_record(entry)
+
+    def pending(self) -> List[Tuple[int, Operation]]:
+        """Operations not yet completed successfully, in journal order."""
+        return [(seq, op) for seq, op in sorted(self.operations.items())
+                if self.status[seq] != "done"]
+
+    def counts(self) -> Dict[str, int]:
+        counts = {"pending": 0, "done": 0, "failed": 0}
+        for state in self.status.values():
+            counts[state] += 1
+        return counts
+
+    @property
+    def complete(self) -> bool:
+        return all(state == "done" for state in self.status.values())
+
+    def undo_operations(self) -> List[Operation]:
+        """Inverses of every completed operation, newest first."""
+        return [self.inverses[seq] for seq in sorted(self.operations, reverse=True)
+                if self.status[seq] == "done" and self.inverses[seq] is not None]
+
+
+def list_jobs(directory: Path = None) -> List[Job]:
+    """Return all readable jobs, oldest first."""
+    directory = Path(directory) if directory else jobs_dir()
+    if not directory.exists():
+        return []
+    jobs = []
+    for path in sorted(directory.glob("*.jsonl")):
+        try:
+            jobs.append(Job(path))
+        except (JournalError, KeyError):
+            continue
+    return jobs
+
+
+def load_job(job_id: Optional[str] = None, directory: Path = None) -> Job:
+    """
+    Load a job by id, or the most recent incomplete job when no id is given.
+
+    Raises:
+        JournalError: If no matching job exists
+    """
+    directory = Path(directory) if directory else jobs_dir()
+    if job_id is not None:
+        path = directory / f"{job_id}.jsonl"
+        if not path.exists():
+            raise JournalError(f"No job with id {job_id}")
+        return Job(path)
+
+    for job in reversed(list_jobs(directory)):
+        if not job.complete:
+            return job
+    raise JournalError("No interrupted job to resume")
+
+
+def _already_applied(result: OperationResult) -> bool:
+    """Whether a failure only means a previous attempt already succeeded."""
+    action = result.operation.action
+    return ((action == "add" and isinstance(result.error, AliasExistsError)) or
+            (action == "delete" and isinstance(result.error, AliasNotFoundError)))
+
+
+def run_job(api, job: Job, workers: int = None, on_result=None,
+            resuming: bool = False,
+            controller: Optional[ConcurrencyController] = None) -> List[OperationResult]:
+    """
+    Execute the pending operations of a job, journaling every outcome.
+
+    When resuming, an operation whose request may have been sent just before
+    the interruption is treated as done if the API reports it already applied.
+    """
+    pending = job.pending()
+    seq_by_op = {id(op): seq for seq, op in pending}
+
+    def _record(result: OperationResult):
+        if resuming and not result.ok and _already_applied(result):
+            result.error = None
+        job.record(seq_by_op[id(result.operation)], None if result.ok else str(result.error))
+        if on_result is not None:
+            on_result(result)
+
+    return run_phased(api, [op for _, op in pending], workers=workers, on_result=_record,
+                      controller=controller)
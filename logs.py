@@ -0,0 +1,134 @@
+"""Incremental delivery log fetching for GALIAS CLI.
+
+The logs endpoint returns entries newest first, one page at a time.
+``ImprovMXAPI.iter_logs()`` yields them lazily, and ``LogTail`` consumes that
+generator only until it reaches the high-water mark of the previous run:
+the newest timestamp seen plus the ids of the entries at that timestamp.
+An unchanged log therefore costs one request, and the cursor is kept in the
+local store between runs.
+"""
+
+from datetime import datetime
+from typing import Dict, List, Any, Callable, Iterable, Iterator, Optional, Tuple
+
+
+DEFAULT_LIMIT = 50
+DEFAULT_INTERVAL = 10.0
+# Idle polls back off up to this many seconds
+MAX_INTERVAL = 120.0
+
+
+def log_time(entry: Dict[str, Any]) -> float:
+    """Unix time of a log entry (ISO 8601 string or epoch seconds/milliseconds)."""
+    created = entry.get("created")
+    if isinstance(created, (int, float)):
+        return created / 1000 if created > 1e11 else float(created)
+    if isinstance(created, str):
+        try:
+            return datetime.fromisoformat(created.replace("Z", "+00:00")).timestamp()
+        except ValueError:
+            pass
+    return 0.0
+
+
+def entry_id(entry: Dict[str, Any]) -> str:
+    return str(entry.get("id") or entry.get("messageId") or "")
+
+
+def log_status(entry: Dict[str, Any]) -> str:
+    """Status of the latest delivery event (e.g. DELIVERED, REFUSED)."""
+    events = entry.get("events") or []
+    return (events[-1].get("status") if events else None) or "UNKNOWN"
+
+
+class LogCursor:
+    """High-water mark: newest timestamp seen and the entry ids at that time."""
+
+    def __init__(self, created: float, ids: Iterable[str] = ()):
+        self.created = created
+        self.ids = set(ids)
+
+    def seen(self, entry: Dict[str, Any]) -> bool:
+        at = log_time(entry)
+        return at < self.created or (at == self.created and entry_id(entry) in self.ids)
+
+    def advance(self, entries: List[Dict[str, Any]]) -> "LogCursor":
+        """Cursor after also seeing ``entries``."""
+        if not entries:
+            return self
+        newest = max(log_time(entry) for entry in entries)
+        if newest < self.created:
+            return self
+        ids = {entry_id(entry) for entry in entries if log_time(entry) == newest}
+        if newest == self.created:
+            ids |= self.ids
+        return LogCursor(newest, ids)
+
+    def __eq__(self, other):
+        return isinstance(other, LogCursor) and (self.created, self.ids) == (other.created, other.ids)
+
+
+def new_entries(entries: Iterator[Dict[str, Any]], cursor: Optional[LogCursor],
+                limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Read newest-first entries until the cursor is reached.
+
+    Args:
+        entries: Entries newest first (consumed lazily)
+        cursor: High-water mark of the previous read, if any
+        limit: Stop after this many new entries
+
+    Returns:
+        New entries, oldest first
+    """
+    fresh = []
+    for entry in entries:
+        if cursor is not None and cursor.seen(entry):
+            if log_time(entry) < cursor.created:
+                break
+            continue
+        fresh.append(entry)
+        if limit and len(fresh) >= limit:
+            break
+    fresh.reverse()
+    return fresh
+
+
+class LogTail:
+    """Polls a newest-first log source for entries past a cursor."""
+
+    def __init__(self, fetch: Callable[[], Iterator[Dict[str, Any]]],
+                 cursor: Optional[LogCursor] = None, limit: int = DEFAULT_LIMIT,
+                 interval: float = DEFAULT_INTERVAL, max_interval: float = MAX_INTERVAL):
+        """
+        Args:
+            fetch: Returns a fresh newest-first iterator (e.g. api.iter_logs)
+            cursor: Cursor of a previous run; without one only the latest
+                ``limit`` entries are read
+            limit: Entries shown on a first run
+            interval: Seconds between polls while entries keep arriving
+            max_interval: Longest wait between idle polls
+        """
+        self.fetch = fetch
+        self.cursor = cursor
+        self.limit = limit
+        self.base_interval = interval
+        self.max_interval = max(interval, max_interval)
+        self.interval = interval
+
+    def poll(self) -> List[Dict[str, Any]]:
+        """New entries since the last poll, oldest first."""
+        first = self.cursor is None
+        fresh = new_entries(self.fetch(), self.cursor, self.limit if first else None)
+        if fresh:
+            self.interval = self.base_interval
+        else:
+            self.interval = min(self.interval * 2, self.max_interval)
+        if fresh or first:
+            # A first run of an empty log still starts the cursor
+            self.cursor = (self.cursor or LogCursor(0.0)).advance(fresh)
+        return fresh
+
+    def state(self) -> Tuple[float, List[str]]:
+        """Cursor as stored in the local database."""
+        return self.cursor.created, sorted(self.cursor.ids)
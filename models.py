@@ -0,0 +1,134 @@
+"""Typed alias records for GALIAS.
+
+``Alias`` uses ``__slots__`` and interns forward addresses (which repeat a lot
+across aliases), so large alias sets take a fraction of the memory of the raw
+response dicts. ``AliasSet`` keeps aliases in listing order with O(1) lookup
+by name.
+"""
+
+import sys
+from typing import Dict, List, Any, Optional, Iterable, Iterator, Union
+
+
+class Alias:
+    """A single alias record."""
+
+    __slots__ = ("alias", "forward", "active", "id", "created", "extra")
+
+    # Record keys with their own slot; anything else is kept in ``extra``
+    FIELDS = frozenset(("alias", "forward", "active", "id", "created"))
+
+    def __init__(self, alias: str, forward: str = "", active: bool = True,
+                 id: Optional[int] = None, created: Optional[Any] = None,
+                 extra: Optional[Dict[str, Any]] = None):
+        self.alias = alias
+        self.forward = sys.intern(forward) if forward else ""
+        self.active = active
+        self.id = id
+        self.created = created
+        # None rather than {} so that plain records cost no extra dict
+        self.extra = extra or None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Alias":
+        """Build an alias from an API response record."""
+        extra = None
+        if not cls.FIELDS.issuperset(data):
+            extra = {key: value for key, value in data.items() if key not in cls.FIELDS}
+        return cls(
+            data.get("alias", ""),
+            data.get("forward", "") or "",
+            bool(data.get("active", True)),
+            data.get("id"),
+            data.get("created"),
+            extra,
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert back to the API's record format, including fields not modelled here."""
+        data = {"alias": self.alias, "forward": self.forward, "active": self.active}
+        if self.id is not None:
+            data["id"] = self.id
+        if self.created is not None:
+            data["created"] = self.created
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    @property
+    def forwards(self) -> List[str]:
+        """Individual forward addresses (ImprovMX allows a comma-separated list)."""
+        return [f.strip() for f in self.forward.split(",") if f.strip()]
+
+    def __eq__(self, other):
+        if not isinstance(other, Alias):
+            return NotImplemented
+        return all(getattr(self, slot) == getattr(other, slot) for slot in self.__slots__)
+
+    def __repr__(self):
+        return f"Alias({self.alias!r}, {self.forward!r}, active={self.active!r})"
+
+
+class AliasSet:
+    """Collection of aliases with O(1) lookup by name, in listing order."""
+
+    __slots__ = ("_by_name", "meta")
+
+    def __init__(self, aliases: Iterable[Alias] = (), meta: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            aliases: Aliases in listing order
+            meta: Top-level fields of the listing response besides ``aliases``
+                (``total``, ``limit``, ``success``, ...)
+        """
+        self._by_name: Dict[str, Alias] = {}
+        self.meta = meta if meta is not None else {}
+        for alias in aliases:
+            self.add(alias)
+
+    @classmethod
+    def from_dicts(cls, records: Iterable[Dict[str, Any]]) -> "AliasSet":
+        """Build a set from raw API records."""
+        return cls(Alias.from_dict(record) for record in records)
+
+    @classmethod
+    def from_response(cls, data: Dict[str, Any]) -> "AliasSet":
+        """Build a set from a list_aliases() response."""
+        aliases = cls.from_dicts(data.get("aliases", []))
+        aliases.meta = {key: value for key, value in data.items() if key != "aliases"}
+        return aliases
+
+    def add(self, alias: Alias):
+        """Add an alias, replacing any existing alias with the same name."""
+        self._by_name[alias.alias] = alias
+
+    def discard(self, name: str):
+        """Remove an alias by name if present."""
+        self._by_name.pop(name, None)
+
+    def get(self, name: str, default: Optional[Alias] = None) -> Optional[Alias]:
+        return self._by_name.get(name, default)
+
+    def names(self):
+        """View of the alias names."""
+        return self._by_name.keys()
+
+    def to_response(self) -> Dict[str, Any]:
+        """Convert to the list_aliases() response format, envelope fields included."""
+        return {**self.meta, "aliases": [alias.to_dict() for alias in self]}
+
+    def __getitem__(self, name: str) -> Alias:
+        return self._by_name[name]
+
+    def __contains__(self, item: Union[str, Alias]) -> bool:
+        name = item.alias if isinstance(item, Alias) else item
+        return name in self._by_name
+
+    def __iter__(self) -> Iterator[Alias]:
+        return iter(self._by_name.values())
+
+    def __len__(self) -> int:
+        return len(self._by_name)
+
+    def __repr__(self):
+        return f"AliasSet({len(self)} aliases)"
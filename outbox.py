@@ -0,0 +1,107 @@
+"""Offline outbox for alias changes in GALIAS CLI.
+
+``galias add --queue`` / ``galias delete --queue`` append operations to
+``GALIAS_HOME/outbox/<domain>.jsonl`` without touching the network.
+``galias flush`` later coalesces the queue per alias, compares the result
+with one live listing and sends only what is still needed, reporting
+conflicts instead of overwriting changes made elsewhere.
+"""
+
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+
+from config import GALIAS_HOME, DOMAIN
+from batch import Operation, coalesce
+from models import AliasSet
+
+
+def outbox_path(domain: str = None) -> Path:
+    """File holding queued operations for a domain."""
+    return GALIAS_HOME / "outbox" / f"{domain or DOMAIN}.jsonl"
+
+
+class Outbox:
+    """Durable append-only queue of alias operations."""
+
+    def __init__(self, path: Optional[Path] = None, domain: str = None):
+        self.path = Path(path) if path else outbox_path(domain)
+
+    def append(self, operation: Operation):
+        """Durably queue an operation."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        entry = {"op": operation.to_dict(), "queued": datetime.now(timezone.utc).isoformat()}
+        with open(self.path, "a", encoding="utf-8") as handle:
+            handle.write(json.dumps(entry) + "\n")
+            handle.flush()
+            os.fsync(handle.fileno())
+
+    def operations(self) -> List[Operation]:
+        """Queued operations, oldest first."""
+        if not self.path.exists():
+            return []
+        operations = []
+        with open(self.path, encoding="utf-8") as handle:
+            for line in handle:
+                if not line.strip():
+                    continue
+                try:
+                    operations.append(Operation.from_dict(json.loads(line)["op"]))
+                except (ValueError, KeyError):
+                    # Torn line from an interrupted write
+                    continue
+        return operations
+
+    def clear(self):
+        """Drop every queued operation."""
+        if self.path.exists():
+            self.path.unlink()
+
+    def __len__(self):
+        return len(self.operations())
+
+
+def plan_flush(operations: List[Operation], live: AliasSet,
+               overwrite: bool = False) -> Tuple[List[Operation], List[Dict[str, Any]]]:
+    """
+    Turn queued operations into the requests still needed against live state.
+
+    Args:
+        operations: Queued operations, oldest first
+        live: Current aliases of the domain
+        overwrite: Update aliases that were created elsewhere with a
+            different forward instead of reporting a conflict
+
+    Returns:
+        Tuple of (operations to send, notes about skipped or conflicting
+        aliases with ``alias``, ``status`` and ``reason`` keys)
+    """
+    to_send: List[Operation] = []
+    notes: List[Dict[str, Any]] = []
+    intents, cancelled = coalesce(operations)
+
+    for alias in sorted(cancelled):
+        notes.append({"alias": alias, "status": "cancelled", "reason": "added and deleted while queued"})
+
+    for op in intents:
+        existing = live.get(op.alias)
+        if op.action == "delete":
+            if existing is None:
+                notes.append({"alias": op.alias, "status": "skipped", "reason": "already deleted"})
+            else:
+                to_send.append(op)
+        elif existing is None:
+            to_send.append(Operation("add", op.alias, op.forward))
+        elif existing.forward == op.forward:
+            notes.append({"alias": op.alias, "status": "skipped", "reason": "already applied"})
+        elif op.action == "update" or overwrite:
+            to_send.append(Operation("update", op.alias, op.forward))
+        else:
+            notes.append({
+                "alias": op.alias, "status": "conflict",
+                "reason": f"exists with forward {existing.forward}, queued {op.forward}"
+            })
+
+    return to_send, notes
@@ -0,0 +1,15 @@
+"""Percentile helper shared by the GALIAS API client, hedging and diagnostics.
+
+Latency windows (``ClientStats``, ``Hedger``) and ``galias doctor`` samples
+all report nearest-rank percentiles, computed here the same way.
+"""
+
+from typing import Iterable, Optional
+
+
+def percentile(values: Iterable[float], p: float) -> Optional[float]:
+    """Nearest-rank percentile (0-100) of some values (None if there are none)."""
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
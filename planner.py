@@ -0,0 +1,152 @@
+"""Dry-run recording and cost estimates for GALIAS CLI.
+
+A ``DryRunRecorder`` attached to an ``ImprovMXAPI`` client (``api.recorder``)
+makes ``_make_request`` record every mutating request instead of sending it,
+so a dry run exercises exactly the same code path as a real one. Read-only
+requests are still sent; their latency feeds the time estimate.
+"""
+
+import math
+import threading
+import time
+from typing import Dict, List, Any, Optional, Tuple
+
+from config import MAX_ALIASES
+
+
+class PlannedCall:
+    """A request that a dry run recorded instead of sending."""
+
+    def __init__(self, method: str, endpoint: str, payload: Optional[Dict[str, Any]] = None):
+        self.method = method
+        self.endpoint = endpoint.lstrip("/")
+        self.payload = payload
+
+    @property
+    def step(self) -> str:
+        """Request label with the alias name replaced by a placeholder."""
+        parts = self.endpoint.split("/")
+        if len(parts) > 1 and parts[0] == "aliases":
+            return f"{self.method} aliases/{{alias}}"
+        return f"{self.method} {self.endpoint}"
+
+    @property
+    def alias_delta(self) -> int:
+        """Change in alias count if this request succeeds."""
+        if self.endpoint == "aliases" and self.method == "POST":
+            return 1
+        if self.endpoint.startswith("aliases/") and self.method == "DELETE":
+            return -1
+        return 0
+
+
+class DryRunRecorder:
+    """Collects the mutating requests of a dry run in the order they were issued."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls: List[PlannedCall] = []
+
+    def record(self, method: str, endpoint: str, payload: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Record a request and return a plausible successful response."""
+        with self._lock:
+            self.calls.append(PlannedCall(method, endpoint, payload))
+        if payload:
+            alias = dict(payload)
+            if "alias" not in alias and endpoint.startswith("aliases/"):
+                alias["alias"] = endpoint.split("/", 1)[1]
+            return {"success": True, "alias": alias, "dry_run": True}
+        return {"success": True, "dry_run": True}
+
+    def steps(self) -> Dict[str, int]:
+        """Number of recorded calls per request type, in first-seen order."""
+        counts: Dict[str, int] = {}
+        for call in self.calls:
+            counts[call.step] = counts.get(call.step, 0) + 1
+        return counts
+
+    def capacity(self, current: int, limit: int) -> Tuple[int, Optional[int]]:
+        """
+        Replay the recorded calls against the alias count.
+
+        Returns:
+            Tuple of (peak alias count, 1-based call number at which the
+            limit would first be exceeded or None)
+        """
+        count = peak = current
+        exceeded_at = None
+        for number, call in enumerate(self.calls, 1):
+            count += call.alias_delta
+            peak = max(peak, count)
+            if exceeded_at is None and count > limit:
+                exceeded_at = number
+        return peak, exceeded_at
+
+
+def estimate_duration(calls: int, latency: Optional[float], workers: int,
+                      rate_limit: Optional[Dict[str, int]] = None,
+                      now: Optional[float] = None) -> Optional[float]:
+    """
+    Estimate the wall time of sending ``calls`` requests.
+
+    Args:
+        calls: Number of requests
+        latency: Observed mean latency in seconds (None if unknown)
+        workers: Concurrent requests
+        rate_limit: Last seen X-RateLimit-* values (limit, remaining, reset)
+        now: Current unix time (for tests)
+
+    Returns:
+        Estimated seconds, or None if no latency has been observed
+    """
+    if latency is None:
+        return None
+    seconds = math.ceil(calls / max(1, workers)) * latency
+
+    rate_limit = rate_limit or {}
+    remaining = rate_limit.get("remaining")
+    limit = rate_limit.get("limit")
+    reset = rate_limit.get("reset")
+    if remaining is not None and limit and reset is not None and calls > remaining:
+        now = time.time() if now is None else now
+        # X-RateLimit-Reset is either an epoch timestamp or seconds to wait
+        window = max(0.0, reset - now) if reset > 1e9 else float(reset)
+        extra_windows = math.ceil((calls - remaining) / limit)
+        seconds = max(seconds, extra_windows * window)
+    return seconds
+
+
+def build_report(recorder: DryRunRecorder, api, current: int, workers: int,
+                 limit: int = None) -> Dict[str, Any]:
+    """
+    Summarize a dry run.
+
+    Args:
+        recorder: Recorder holding the planned calls
+        api: Client whose stats provide observed latency and rate limits
+        current: Alias count before the run
+        workers: Concurrency the real run would use
+        limit: Alias limit (defaults to MAX_ALIASES)
+
+    Returns:
+        Dict suitable for JSON output or ui.print_dry_run_report
+    """
+    if limit is None:
+        limit = MAX_ALIASES
+    latency = api.stats.mean_latency()
+    peak, exceeded_at = recorder.capacity(current, limit)
+    return {
+        "steps": [{"request": step, "calls": calls} for step, calls in recorder.steps().items()],
+        "api_calls": len(recorder.calls),
+        "reads_sent": api.stats.requests,
+        "latency_ms": None if latency is None else round(latency * 1000, 1),
+        "workers": workers,
+        "estimated_seconds": estimate_duration(
+            len(recorder.calls), latency, workers, dict(api.stats.rate_limit)
+        ),
+        "rate_limit": dict(api.stats.rate_limit),
+        "current_aliases": current,
+        "max_aliases": limit,
+        "peak_aliases": peak,
+        "exceeds_limit_at": exceeded_at,
+    }
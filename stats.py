@@ -0,0 +1,185 @@
+"""Single-pass alias analytics for GALIAS CLI.
+
+``galias stats`` feeds every alias, live from the API or from the local store,
+through an ``AliasStats`` exactly once. Only the summary is kept. Frequencies
+are tracked with space-saving counters of a fixed size. Results are exact
+while a field has fewer distinct values than the counter has slots. Past
+that, the frequent values (the ones a cleanup cares about) are still found,
+and their counts carry a known error bound.
+"""
+
+import heapq
+import re
+from typing import Dict, List, Any, Iterable, Optional, Tuple
+
+from models import Alias
+
+
+# Slots per counter; bounds memory regardless of the number of aliases
+DEFAULT_CAPACITY = 20000
+DEFAULT_TOP = 10
+# Example alias names kept per near-duplicate group
+NEAR_DUPLICATE_SAMPLES = 5
+
+SEPARATORS = re.compile(r"[._+-]")
+TRAILING_DIGITS = re.compile(r"\d+$")
+
+
+class TopCounter:
+    """
+    Space-saving frequency counter with a fixed number of slots.
+
+    When every slot is taken, a new value replaces the least frequent one and
+    inherits its count as error. A value's true count is therefore between
+    ``count - error`` and ``count``.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, samples: int = 0):
+        """
+        Args:
+            capacity: Maximum number of distinct values tracked
+            samples: Number of example items kept per value
+        """
+        self.capacity = capacity
+        self.samples = samples
+        self.counts: Dict[str, int] = {}
+        self.errors: Dict[str, int] = {}
+        self.examples: Dict[str, List[str]] = {}
+        self.evictions = 0
+        # (count, value) entries; stale ones are skipped when popped
+        self._heap: List[Tuple[int, str]] = []
+
+    def add(self, value: str, example: Optional[str] = None):
+        counts = self.counts
+        if value in counts:
+            counts[value] += 1
+        elif len(counts) < self.capacity:
+            counts[value] = 1
+            self.errors[value] = 0
+        else:
+            floor, evicted = self._pop_min()
+            del counts[evicted]
+            del self.errors[evicted]
+            self.examples.pop(evicted, None)
+            self.evictions += 1
+            counts[value] = floor + 1
+            self.errors[value] = floor
+        heapq.heappush(self._heap, (counts[value], value))
+        if len(self._heap) > 2 * self.capacity:
+            self._heap = [(count, key) for key, count in counts.items()]
+            heapq.heapify(self._heap)
+
+        if self.samples and example is not None:
+            examples = self.examples.setdefault(value, [])
+            if len(examples) < self.samples and example not in examples:
+                examples.append(example)
+
+    def _pop_min(self) -> Tuple[int, str]:
+        while True:
+            count, value = heapq.heappop(self._heap)
+            if self.counts.get(value) == count:
+                return count, value
+
+    @property
+    def exact(self) -> bool:
+        """True while no value has been evicted, i.e. all counts are exact."""
+        return self.evictions == 0
+
+    def top(self, n: int) -> List[Tuple[str, int]]:
+        """The ``n`` most frequent values with their (estimated) counts."""
+        return heapq.nsmallest(n, self.counts.items(), key=lambda item: (-item[1], item[0]))
+
+    def repeated(self, n: int) -> List[Tuple[str, int]]:
+        """Up to ``n`` values certainly seen more than once, with their guaranteed counts."""
+        certain = ((value, count - self.errors[value]) for value, count in self.counts.items())
+        return heapq.nsmallest(
+            n, ((value, count) for value, count in certain if count > 1),
+            key=lambda item: (-item[1], item[0])
+        )
+
+
+def name_prefix(name: str) -> str:
+    """Grouping prefix of an alias: the part before the first separator, or the name without trailing digits."""
+    head = SEPARATORS.split(name, 1)[0]
+    if head != name:
+        return head or name
+    return TRAILING_DIGITS.sub("", name) or name
+
+
+def name_skeleton(name: str) -> str:
+    """Alias name without case or separators (``John.Doe`` -> ``johndoe``)."""
+    return SEPARATORS.sub("", name.lower()) or name.lower()
+
+
+def forward_domain(address: str) -> str:
+    return address.rpartition("@")[2].lower()
+
+
+class AliasStats:
+    """Accumulates statistics over aliases fed one at a time."""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        self.total = 0
+        self.active = 0
+        # Number of forward addresses -> number of aliases (a handful of keys)
+        self.targets_per_alias: Dict[int, int] = {}
+        self.targets = TopCounter(capacity)
+        self.domains = TopCounter(capacity)
+        self.prefixes = TopCounter(capacity)
+        self.names = TopCounter(capacity)
+        self.skeletons = TopCounter(capacity, samples=NEAR_DUPLICATE_SAMPLES)
+
+    def add(self, alias: Alias):
+        self.total += 1
+        if alias.active:
+            self.active += 1
+
+        forwards = alias.forwards
+        self.targets_per_alias[len(forwards)] = self.targets_per_alias.get(len(forwards), 0) + 1
+        for address in forwards:
+            self.targets.add(address.lower())
+        for domain in {forward_domain(address) for address in forwards}:
+            self.domains.add(domain)
+
+        self.prefixes.add(name_prefix(alias.alias))
+        self.names.add(alias.alias.strip().lower())
+        self.skeletons.add(name_skeleton(alias.alias), example=alias.alias)
+
+    def update(self, aliases: Iterable[Alias]) -> "AliasStats":
+        """Feed every alias of an iterable."""
+        for alias in aliases:
+            self.add(alias)
+        return self
+
+    def report(self, top: int = DEFAULT_TOP) -> Dict[str, Any]:
+        """
+        Summary of everything seen so far.
+
+        Args:
+            top: Number of entries in each ranking
+
+        Returns:
+            JSON-serializable dict
+        """
+        near_duplicates = []
+        for skeleton, count in self.skeletons.repeated(top * 4):
+            names = self.skeletons.examples.get(skeleton, [])
+            # Only groups of different spellings; identical names are duplicates
+            if len({name.lower() for name in names}) > 1:
+                near_duplicates.append({"key": skeleton, "aliases": count, "examples": names})
+            if len(near_duplicates) == top:
+                break
+
+        counters = (self.targets, self.domains, self.prefixes, self.names, self.skeletons)
+        return {
+            "aliases": self.total,
+            "active": self.active,
+            "inactive": self.total - self.active,
+            "targets_per_alias": {str(n): count for n, count in sorted(self.targets_per_alias.items())},
+            "top_targets": [{"forward": v, "aliases": c} for v, c in self.targets.top(top)],
+            "top_domains": [{"domain": v, "aliases": c} for v, c in self.domains.top(top)],
+            "top_prefixes": [{"prefix": v, "aliases": c} for v, c in self.prefixes.top(top)],
+            "duplicates": [{"alias": v, "count": c} for v, c in self.names.repeated(top)],
+            "near_duplicates": near_duplicates,
+            "exact": all(counter.exact for counter in counters),
+        }
@@ -0,0 +1,365 @@
+"""Local SQLite mirror of aliases for GALIAS CLI."""
+
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple, Iterator, Iterable
+
+from config import GALIAS_HOME, DOMAIN
+from models import Alias
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS aliases (
+    domain  TEXT NOT NULL,
+    alias   TEXT NOT NULL,
+    forward TEXT NOT NULL DEFAULT '',
+    active  INTEGER NOT NULL DEFAULT 1,
+    created TEXT,
+    id      INTEGER,
+    PRIMARY KEY (domain, alias)
+);
+CREATE INDEX IF NOT EXISTS idx_aliases_forward ON aliases (domain, forward);
+CREATE INDEX IF NOT EXISTS idx_aliases_active ON aliases (domain, active);
+CREATE INDEX IF NOT EXISTS idx_aliases_created ON aliases (domain, created);
+
+CREATE TABLE IF NOT EXISTS sync_state (
+    domain    TEXT PRIMARY KEY,
+    synced_at REAL NOT NULL,
+    total     INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS expiries (
+    domain     TEXT NOT NULL,
+    alias      TEXT NOT NULL,
+    expires_at REAL NOT NULL,
+    forward    TEXT,
+    PRIMARY KEY (domain, alias)
+);
+CREATE INDEX IF NOT EXISTS idx_expiries_due ON expiries (domain, expires_at);
+
+CREATE TABLE IF NOT EXISTS log_cursors (
+    domain  TEXT NOT NULL,
+    alias   TEXT NOT NULL,
+    created REAL NOT NULL,
+    ids     TEXT NOT NULL,
+    PRIMARY KEY (domain, alias)
+);
+
+CREATE TABLE IF NOT EXISTS account_limits (
+    name       TEXT PRIMARY KEY,
+    value      INTEGER NOT NULL,
+    fetched_at REAL NOT NULL
+);
+"""
+
+# Predefined reports: name -> (description, SQL). ``:domain`` and ``:limit``
+# are bound at query time.
+REPORTS = {
+    "summary": (
+        "Alias counts per domain",
+        "SELECT domain, COUNT(*) AS aliases, SUM(active) AS active, "
+        "COUNT(*) - SUM(active) AS inactive FROM aliases GROUP BY domain ORDER BY domain",
+    ),
+    "by-forward": (
+        "Aliases per forward address",
+        "SELECT forward, COUNT(*) AS aliases FROM aliases WHERE domain = :domain "
+        "GROUP BY forward ORDER BY aliases DESC, forward LIMIT :limit",
+    ),
+    "inactive": (
+        "Inactive aliases",
+        "SELECT alias, forward FROM aliases WHERE domain = :domain AND active = 0 "
+        "ORDER BY alias LIMIT :limit",
+    ),
+    "recent": (
+        "Most recently created aliases",
+        "SELECT alias, forward, created FROM aliases WHERE domain = :domain "
+        "ORDER BY created DESC LIMIT :limit",
+    ),
+    "catch-all": (
+        "Catch-all and wildcard aliases",
+        "SELECT alias, forward FROM aliases WHERE domain = :domain AND alias IN ('*', '') "
+        "ORDER BY alias LIMIT :limit",
+    ),
+}
+
+# Rows are written to SQLite in chunks of this size during a sync
+SYNC_CHUNK = 1000
+
+
+class StoreError(Exception):
+    """Raised when the local alias store cannot be read or queried."""
+    pass
+
+
+def default_store_path() -> Path:
+    """Location of the alias database."""
+    return GALIAS_HOME / "aliases.db"
+
+
+def _row(domain: str, alias: Alias) -> Tuple:
+    return (
+        domain,
+        alias.alias,
+        alias.forward,
+        1 if alias.active else 0,
+        None if alias.created is None else str(alias.created),
+        alias.id,
+    )
+
+
+class AliasStore:
+    """SQLite database mirroring the aliases of one or more domains."""
+
+    def __init__(self, path: Optional[Path] = None):
+        """
+        Open (and create if needed) the alias database.
+
+        Args:
+            path: Database file (defaults to GALIAS_HOME/aliases.db)
+        """
+        self.path = Path(path) if path else default_store_path()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        # Expiries recorded before the forward was stored with them
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(expiries)")]
+        if "forward" not in columns:
+            self.conn.execute("ALTER TABLE expiries ADD COLUMN forward TEXT")
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def sync(self, aliases: Iterable[Alias], domain: str = None) -> Dict[str, int]:
+        """
+        Bring the mirror of a domain up to date with a full listing.
+
+        Only rows whose data changed are written; aliases missing from the
+        listing are removed. The whole sync is one transaction.
+
+        Args:
+            aliases: Alias records, e.g. from ImprovMXAPI.iter_aliases()
+            domain: Domain the aliases belong to
+
+        Returns:
+            Dict with added, updated, removed and total counts
+        """
+        domain = domain or DOMAIN
+        counts = {"added": 0, "updated": 0, "removed": 0, "total": 0}
+
+        with self.conn:
+            self.conn.execute("CREATE TEMP TABLE IF NOT EXISTS seen (alias TEXT PRIMARY KEY)")
+            self.conn.execute("DELETE FROM seen")
+
+            chunk = []
+            for alias in aliases:
+                chunk.append(_row(domain, alias))
+                if len(chunk) >= SYNC_CHUNK:
+                    self._write_chunk(chunk, counts)
+                    chunk = []
+            if chunk:
+                self._write_chunk(chunk, counts)
+
+            cursor = self.conn.execute(
+                "DELETE FROM aliases WHERE domain = ? AND alias NOT IN (SELECT alias FROM seen)",
+                (domain,)
+            )
+            counts["removed"] = cursor.rowcount
+            self.conn.execute(
+                "INSERT OR REPLACE INTO sync_state (domain, synced_at, total) VALUES (?, ?, ?)",
+                (domain, time.time(), counts["total"])
+            )
+
+        return counts
+
+    def _write_chunk(self, rows: List[Tuple], counts: Dict[str, int]):
+        self.conn.executemany("INSERT OR IGNORE INTO seen (alias) VALUES (?)", [(r[1],) for r in rows])
+        before = self.conn.total_changes
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO aliases (domain, alias, forward, active, created, id) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            rows
+        )
+        counts["added"] += self.conn.total_changes - before
+        before = self.conn.total_changes
+        self.conn.executemany(
+            "UPDATE aliases SET forward = ?, active = ?, created = ?, id = ? "
+            "WHERE domain = ? AND alias = ? AND "
+            "(forward IS NOT ? OR active IS NOT ? OR created IS NOT ? OR id IS NOT ?)",
+            [(r[2], r[3], r[4], r[5], r[0], r[1], r[2], r[3], r[4], r[5]) for r in rows]
+        )
+        counts["updated"] += self.conn.total_changes - before
+        counts["total"] += len(rows)
+
+    def put(self, alias: Alias, domain: str = None):
+        """Insert or replace a single mirrored alias."""
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO aliases (domain, alias, forward, active, created, id) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                _row(domain or DOMAIN, alias)
+            )
+
+    def remove(self, name: str, domain: str = None):
+        """Remove a single mirrored alias (and its expiry)."""
+        with self.conn:
+            self.conn.execute(
+                "DELETE FROM aliases WHERE domain = ? AND alias = ?", (domain or DOMAIN, name)
+            )
+            self.conn.execute(
+                "DELETE FROM expiries WHERE domain = ? AND alias = ?", (domain or DOMAIN, name)
+            )
+
+    def set_expiry(self, name: str, expires_at: float, forward: str, domain: str = None):
+        """Record when a temporary alias (with this forward) should be deleted."""
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO expiries (domain, alias, expires_at, forward) VALUES (?, ?, ?, ?)",
+                (domain or DOMAIN, name, expires_at, forward)
+            )
+
+    def clear_expiry(self, name: str, keep_forward: Optional[str] = None, domain: str = None):
+        """Make an alias permanent, unless its expiry was recorded for ``keep_forward``."""
+        sql = "DELETE FROM expiries WHERE domain = ? AND alias = ?"
+        params: Tuple = (domain or DOMAIN, name)
+        if keep_forward is not None:
+            sql += " AND forward IS NOT ?"
+            params += (keep_forward,)
+        with self.conn:
+            self.conn.execute(sql, params)
+
+    def retarget_expiry(self, name: str, forward: str, domain: str = None):
+        """Keep an alias's expiry after its forward was changed."""
+        with self.conn:
+            self.conn.execute(
+                "UPDATE expiries SET forward = ? WHERE domain = ? AND alias = ?",
+                (forward, domain or DOMAIN, name)
+            )
+
+    def due_expiries(self, now: float, domain: str = None) -> List[Tuple[str, Optional[str]]]:
+        """(alias, forward) of temporary aliases expiring at or before ``now``, soonest first."""
+        return self.conn.execute(
+            "SELECT alias, forward FROM expiries WHERE domain = ? AND expires_at <= ? "
+            "ORDER BY expires_at, alias",
+            (domain or DOMAIN, now)
+        ).fetchall()
+
+    def next_expiry(self, after: float = float("-inf"), domain: str = None) -> Optional[float]:
+        """Earliest expiry time later than ``after`` of a domain's temporary aliases, if any."""
+        return self.conn.execute(
+            "SELECT MIN(expires_at) FROM expiries WHERE domain = ? AND expires_at > ?",
+            (domain or DOMAIN, after)
+        ).fetchone()[0]
+
+    def expiry_count(self, domain: str = None) -> int:
+        """Number of temporary aliases of a domain."""
+        return self.conn.execute(
+            "SELECT COUNT(*) FROM expiries WHERE domain = ?", (domain or DOMAIN,)
+        ).fetchone()[0]
+
+    def lookup(self, names: Iterable[str], domain: str = None) -> Iterator[Alias]:
+        """Mirrored aliases with the given names (names not mirrored are skipped)."""
+        for name in names:
+            row = self.conn.execute(
+                "SELECT alias, forward, active, created, id FROM aliases WHERE domain = ? AND alias = ?",
+                (domain or DOMAIN, name)
+            ).fetchone()
+            if row is not None:
+                alias, forward, active, created, alias_id = row
+                yield Alias(alias, forward, bool(active), alias_id, created)
+
+    def aliases(self, domain: str = None) -> Iterator[Alias]:
+        """Iterate over the mirrored aliases of a domain in name order."""
+        cursor = self.conn.execute(
+            "SELECT alias, forward, active, created, id FROM aliases WHERE domain = ? ORDER BY alias",
+            (domain or DOMAIN,)
+        )
+        for alias, forward, active, created, alias_id in cursor:
+            yield Alias(alias, forward, bool(active), alias_id, created)
+
+    def count(self, domain: str = None) -> int:
+        """Number of mirrored aliases for a domain."""
+        return self.conn.execute(
+            "SELECT COUNT(*) FROM aliases WHERE domain = ?", (domain or DOMAIN,)
+        ).fetchone()[0]
+
+    def last_sync(self, domain: str = None) -> Optional[float]:
+        """Unix time of the last completed sync of a domain, if any."""
+        row = self.conn.execute(
+            "SELECT synced_at FROM sync_state WHERE domain = ?", (domain or DOMAIN,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def log_cursor(self, alias: str = "", domain: str = None) -> Optional[Tuple[float, List[str]]]:
+        """High-water mark of the delivery logs already read (alias "" for the whole domain)."""
+        row = self.conn.execute(
+            "SELECT created, ids FROM log_cursors WHERE domain = ? AND alias = ?", (domain or DOMAIN, alias)
+        ).fetchone()
+        return (row[0], json.loads(row[1])) if row else None
+
+    def set_log_cursor(self, created: float, ids: List[str], alias: str = "", domain: str = None):
+        """Remember the newest delivery log entries read."""
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO log_cursors (domain, alias, created, ids) VALUES (?, ?, ?, ?)",
+                (domain or DOMAIN, alias, created, json.dumps(ids))
+            )
+
+    def put_limits(self, limits: Dict[str, int]):
+        """Replace the cached account limits."""
+        now = time.time()
+        with self.conn:
+            self.conn.execute("DELETE FROM account_limits")
+            self.conn.executemany(
+                "INSERT INTO account_limits (name, value, fetched_at) VALUES (?, ?, ?)",
+                [(name, value, now) for name, value in limits.items()]
+            )
+
+    def limits(self, max_age: Optional[float] = None) -> Optional[Dict[str, int]]:
+        """
+        Cached account limits.
+
+        Args:
+            max_age: Ignore the cache if it is older than this many seconds
+
+        Returns:
+            Dict of limit name to value, or None if nothing (fresh) is cached
+        """
+        rows = self.conn.execute("SELECT name, value, fetched_at FROM account_limits").fetchall()
+        if not rows:
+            return None
+        if max_age is not None and time.time() - min(r[2] for r in rows) > max_age:
+            return None
+        return {name: value for name, value, _ in rows}
+
+    def query(self, sql: str, params: Any = ()) -> Tuple[List[str], List[Tuple]]:
+        """
+        Run a read-only SQL query against the mirror.
+
+        Returns:
+            Tuple of (column names, rows)
+        """
+        conn = sqlite3.connect(f"{self.path.resolve().as_uri()}?mode=ro", uri=True)
+        try:
+            cursor = conn.execute(sql, params)
+            columns = [d[0] for d in cursor.description or []]
+            return columns, cursor.fetchall()
+        except sqlite3.Error as e:
+            raise StoreError(f"Query failed: {e}")
+        finally:
+            conn.close()
+
+    def report(self, name: str, domain: str = None, limit: int = 50) -> Tuple[List[str], List[Tuple]]:
+        """Run one of the predefined REPORTS."""
+        if name not in REPORTS:
+            raise StoreError(f"Unknown report '{name}'. Available: {', '.join(REPORTS)}")
+        _, sql = REPORTS[name]
+        return self.query(sql, {"domain": domain or DOMAIN, "limit": limit})
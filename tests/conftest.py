@@ -0,0 +1,7 @@
+"""Shared pytest configuration."""
+
+import os
+import tempfile
+
+# Keep local state (alias store, backups, jobs) out of the real home directory
+os.environ.setdefault("GALIAS_HOME", tempfile.mkdtemp(prefix="galias-tests-"))
@@ -1,13 +1,27 @@
 """Tests for API module."""
 
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
 import pytest
 import responses
 from unittest.mock import patch, MagicMock
 
 from api import (
     ImprovMXAPI, get_api, APIError, AuthenticationError,
-    AliasExistsError, AliasNotFoundError, LimitReachedError, NetworkError
+    AliasExistsError, AliasNotFoundError, LimitReachedError, NetworkError,
+    CircuitOpenError, DeadlineExceededError
 )
+from hedge import Hedger
+from deadline import set_deadline
+from store import AliasStore
+
+
+def join_prefetch():
+    """Wait for prefetch threads, which warm the limits after resolving."""
+    for thread in threading.enumerate():
+        if thread.name == "galias-prefetch":
+            thread.join(timeout=5)
 
 
 class TestImprovMXAPI:
@@ -153,7 +167,85 @@ class TestImprovMXAPI:
         
         with pytest.raises(NetworkError, match="Network connection error"):
             self.api.list_aliases()
+
+    @responses.activate
+    def test_circuit_opens_after_failures(self):
+        """Test that consecutive failures stop requests from being sent."""
+        responses.add(
+            responses.GET,
+            'https://api.improvmx.com/v3/domains/test.com/aliases',
+            body=responses.ConnectionError("Connection failed")
+        )
+        threshold = self.api.breaker.threshold
+
+        for _ in range(threshold):
+            with pytest.raises(NetworkError, match="Network connection error"):
+                self.api.list_aliases()
+        with pytest.raises(CircuitOpenError):
+            self.api.list_aliases()
+
+        assert len(responses.calls) == threshold
+        assert self.api.breaker.snapshot()["state"] == "open"
+
+    @responses.activate
+    def test_client_errors_keep_circuit_closed(self):
+        """Test that 4xx answers count as the API being up."""
+        responses.add(
+            responses.DELETE,
+            'https://api.improvmx.com/v3/domains/test.com/aliases/missing',
+            json={"error": "not found"},
+            status=404
+        )
+
+        for _ in range(self.api.breaker.threshold + 1):
+            with pytest.raises(AliasNotFoundError):
+                self.api.delete_alias("missing")
+
+        assert self.api.breaker.snapshot()["state"] == "closed"
     
+    @responses.activate
+    def test_only_gets_are_hedged(self):
+        """Test that reads go through the hedger and writes never do."""
+        responses.add(responses.GET, 'https://api.improvmx.com/v3/domains/test.com/aliases',
+                      json={"aliases": [], "total": 0}, status=200)
+        responses.add(responses.DELETE, 'https://api.improvmx.com/v3/domains/test.com/aliases/old',
+                      json={"success": True}, status=200)
+        self.api.hedger = Hedger(min_samples=1)
+
+        self.api.list_aliases()
+        self.api.list_aliases()
+        self.api.delete_alias("old")
+
+        assert self.api.hedger.requests == 2
+        assert len(responses.calls) == 3
+
+    @responses.activate
+    def test_expired_deadline_sends_nothing(self):
+        """Test that no request is sent once the --deadline has passed."""
+        set_deadline(0)
+        try:
+            with pytest.raises(DeadlineExceededError):
+                self.api.list_aliases()
+        finally:
+            set_deadline(None)
+
+        assert len(responses.calls) == 0
+
+    def test_deadline_shrinks_timeouts(self):
+        """Test that requests get at most the remaining budget as timeout."""
+        self.api.session = MagicMock()
+        self.api.session.request.return_value.status_code = 200
+        self.api.session.request.return_value.json.return_value = {"aliases": []}
+        set_deadline(2)
+        try:
+            self.api.list_aliases()
+        finally:
+            set_deadline(None)
+
+        connect, read = self.api.session.request.call_args.kwargs["timeout"]
+        assert 0 < connect <= 2
+        assert 0 < read <= 2
+
     @responses.activate
     def test_get_alias_count(self):
         """Test getting alias count."""
@@ -174,6 +266,175 @@ class TestImprovMXAPI:
         
         count = self.api.get_alias_count()
         assert count == 3
+
+    @responses.activate
+    def test_batch_sends_planned_operations(self):
+        """Test that api.batch() sends one request per alias, deletes first."""
+        responses.add(responses.DELETE, 'https://api.improvmx.com/v3/domains/test.com/aliases/old',
+                      json={"success": True}, status=200)
+        responses.add(responses.POST, 'https://api.improvmx.com/v3/domains/test.com/aliases',
+                      json={"success": True}, status=200)
+
+        with self.api.batch(workers=1) as b:
+            b.add("new", "user@example.com")
+            b.add("temp", "user@example.com")
+            b.delete("temp")
+            b.delete("old")
+
+        assert [call.request.method for call in responses.calls] == ["DELETE", "POST"]
+        assert b.report()["succeeded"] == 2
+
+    @responses.activate
+    def test_get_alias_count_uses_total(self):
+        """Test that the count covers every page without fetching them."""
+        responses.add(
+            responses.GET,
+            'https://api.improvmx.com/v3/domains/test.com/aliases',
+            json={"aliases": [{"alias": "a"}, {"alias": "b"}], "total": 5000, "page": 1},
+            status=200
+        )
+
+        assert self.api.get_alias_count() == 5000
+        assert len(responses.calls) == 1
+
+    @responses.activate
+    def test_iter_aliases_follows_pages(self):
+        """Test that iter_aliases requests pages until the total is reached."""
+        url = 'https://api.improvmx.com/v3/domains/test.com/aliases'
+        responses.add(responses.GET, url, json={
+            "aliases": [{"alias": "a"}, {"alias": "b"}], "total": 3, "page": 1
+        }, match=[responses.matchers.query_param_matcher({"page": "1"})])
+        responses.add(responses.GET, url, json={
+            "aliases": [{"alias": "c"}], "total": 3, "page": 2
+        }, match=[responses.matchers.query_param_matcher({"page": "2"})])
+        
+        names = [alias.alias for alias in self.api.iter_aliases()]
+        assert names == ["a", "b", "c"]
+        assert len(responses.calls) == 2
+
+    @responses.activate
+    def test_get_aliases_keeps_envelope(self):
+        """Test that the merged listing keeps the first page's top-level fields."""
+        url = 'https://api.improvmx.com/v3/domains/test.com/aliases'
+        responses.add(responses.GET, url, json={
+            "aliases": [{"alias": "a"}], "total": 2, "limit": 1, "page": 1, "success": True
+        }, match=[responses.matchers.query_param_matcher({"page": "1"})])
+        responses.add(responses.GET, url, json={
+            "aliases": [{"alias": "b"}], "total": 2, "limit": 1, "page": 2, "success": True
+        }, match=[responses.matchers.query_param_matcher({"page": "2"})])
+
+        data = self.api.get_aliases().to_response()
+        assert data["total"] == 2
+        assert data["success"] is True
+        assert [alias["alias"] for alias in data["aliases"]] == ["a", "b"]
+    
+    @responses.activate
+    def test_iter_logs_pages_lazily(self):
+        """Test that iter_logs follows next_cursor only as entries are consumed."""
+        url = 'https://api.improvmx.com/v3/domains/test.com/logs/info'
+        responses.add(responses.GET, url, json={
+            "logs": [{"id": "3"}, {"id": "2"}], "next_cursor": "abc"
+        }, match=[responses.matchers.query_param_matcher({})])
+        responses.add(responses.GET, url, json={
+            "logs": [{"id": "1"}]
+        }, match=[responses.matchers.query_param_matcher({"next_cursor": "abc"})])
+
+        logs = self.api.iter_logs("info")
+        assert next(logs)["id"] == "3"
+        assert len(responses.calls) == 1
+        assert [entry["id"] for entry in logs] == ["2", "1"]
+        assert len(responses.calls) == 2
+
+    @responses.activate
+    def test_prefetch_aliases(self):
+        """Test that prefetch_aliases resolves to the listing in the background."""
+        responses.add(
+            responses.GET,
+            'https://api.improvmx.com/v3/domains/test.com/aliases',
+            json={"aliases": [{"alias": "a", "forward": "a@example.com"}], "total": 1},
+            status=200
+        )
+        
+        aliases = self.api.prefetch_aliases().result(timeout=5)
+        join_prefetch()
+        assert "a" in aliases
+        assert len(aliases) == 1
+    
+    @responses.activate
+    def test_prefetch_aliases_error(self):
+        """Test that prefetch errors are raised when the result is read."""
+        responses.add(
+            responses.GET,
+            'https://api.improvmx.com/v3/domains/test.com/aliases',
+            status=401
+        )
+        
+        future = self.api.prefetch_aliases()
+        with pytest.raises(AuthenticationError):
+            future.result(timeout=5)
+    
+    @responses.activate
+    def test_prefetch_resolves_when_limits_fail(self):
+        """Test that a failing limits lookup never leaves the prefetch unresolved."""
+        responses.add(
+            responses.GET,
+            'https://api.improvmx.com/v3/domains/test.com/aliases',
+            json={"aliases": [{"alias": "a"}], "total": 1},
+            status=200
+        )
+        
+        with patch.object(self.api, 'alias_limit', side_effect=RuntimeError("replay mismatch")):
+            aliases = self.api.prefetch_aliases().result(timeout=5)
+            join_prefetch()
+        assert "a" in aliases
+    
+    @responses.activate
+    def test_account_limits_tolerate_missing_account(self):
+        """Test that a null or malformed account object gives no limits instead of an error."""
+        url = 'https://api.improvmx.com/v3/account'
+        responses.add(responses.GET, url, json={"account": None}, status=200)
+        responses.add(responses.GET, url, json={"account": {"limits": []}}, status=200)
+        
+        assert self.api.get_account_limits() == {}
+        assert self.api.get_account_limits() == {}
+    
+    @responses.activate
+    def test_limits_fetched_and_cached(self, tmp_path):
+        """Test that account limits come from the API once and are cached locally."""
+        responses.add(
+            responses.GET,
+            'https://api.improvmx.com/v3/account',
+            json={"account": {"limits": {"aliases": 5000, "domains": 50}, "plan": {"name": "business"}}},
+            status=200
+        )
+        
+        with patch('api.AliasStore', lambda: AliasStore(tmp_path / "aliases.db")):
+            assert self.api.alias_limit() == 5000
+            assert ImprovMXAPI().limits() == {"aliases": 5000, "domains": 50}
+        
+        assert len(responses.calls) == 1
+    
+    @responses.activate
+    def test_limits_fall_back_to_config(self, tmp_path):
+        """Test that MAX_ALIASES is used when limits cannot be fetched."""
+        responses.add(responses.GET, 'https://api.improvmx.com/v3/account', status=500)
+        
+        with patch('api.AliasStore', lambda: AliasStore(tmp_path / "aliases.db")), \
+                patch('api.MAX_ALIASES', 25):
+            assert self.api.alias_limit() == 25
+    
+    @responses.activate
+    def test_domain_override(self):
+        """Test that a client for another domain uses that domain's URL."""
+        responses.add(
+            responses.GET,
+            'https://api.improvmx.com/v3/domains/other.com/aliases',
+            json={"aliases": []},
+            status=200
+        )
+        
+        result = ImprovMXAPI(domain="other.com").list_aliases()
+        assert result == {"aliases": []}
     
     @responses.activate
     def test_invalid_json_response(self):
@@ -195,6 +456,68 @@ class TestImprovMXAPI:
         assert self.api.session.auth.username == 'api'
         assert self.api.session.auth.password == 'sk_test_key'
 
+    
+    @responses.activate
+    def test_requests_have_timeouts(self):
+        """Test that every request is sent with connect and read timeouts."""
+        responses.add(
+            responses.GET,
+            'https://api.improvmx.com/v3/domains/test.com/aliases',
+            json={"aliases": []},
+            status=200
+        )
+        
+        self.api.list_aliases()
+        
+        assert responses.calls[0].request.req_kwargs["timeout"] == self.api.timeout
+        assert self.api.session.headers['Accept-Encoding'] == 'gzip, deflate'
+
+
+class TestTransport:
+    """Test cases for connection pooling against a local server."""
+    
+    def setup_method(self, method):
+        """Start a keep-alive HTTP server on localhost."""
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            
+            def do_GET(self):
+                body = b'{"aliases": []}'
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def log_message(self, *args):
+                pass
+        
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/aliases"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+    
+    def teardown_method(self, method):
+        self.server.shutdown()
+        self.server.server_close()
+    
+    def test_connections_are_reused(self):
+        """Test that sequential requests share one kept-alive connection."""
+        api = ImprovMXAPI()
+        for _ in range(3):
+            api._make_request("GET", self.url)
+        
+        assert api.connection_stats() == {"connections": 1, "requests": 3, "reused": 2}
+    
+    def test_ensure_pool_only_grows(self):
+        """Test that the pool is resized for larger batches only."""
+        api = ImprovMXAPI()
+        adapter = api.session.get_adapter("https://")
+        
+        api.ensure_pool(1)
+        assert api.session.get_adapter("https://") is adapter
+        api.ensure_pool(api.pool_size + 8)
+        assert api.session.get_adapter("https://")._pool_maxsize == api.pool_size
+
 
 class TestGlobalAPI:
     """Test cases for global API functions."""
@@ -0,0 +1,143 @@
+"""Tests for backup module."""
+
+import pytest
+from datetime import datetime, timedelta, timezone
+
+from backup import (
+    BackupError, create_backup, compact, list_snapshots, state_at,
+    parse_timestamp, plan_restore, read_snapshot, write_snapshot
+)
+from batch import Operation
+from models import Alias, AliasSet
+
+
+T0 = datetime(2025, 1, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def make_alias(name, forward=None):
+    return Alias(name, forward or f"{name}@example.com", id=len(name))
+
+
+class TestSnapshots:
+    """Test cases for writing and reading snapshots."""
+
+    def test_first_backup_is_full(self, tmp_path):
+        """Test that the first backup stores every alias."""
+        snapshot = create_backup([make_alias("a"), make_alias("b")], tmp_path, now=T0)
+
+        assert snapshot.is_full
+        header, records = read_snapshot(snapshot)
+        assert header["records"] == 2
+        assert len([r for r in records]) == 2
+
+    def test_second_backup_stores_only_delta(self, tmp_path):
+        """Test that subsequent backups only store changes."""
+        create_backup([make_alias("a"), make_alias("b")], tmp_path, now=T0)
+        snapshot = create_backup(
+            [make_alias("a", "new@example.com"), make_alias("c")],
+            tmp_path, now=T0 + timedelta(hours=1)
+        )
+
+        assert snapshot.kind == "delta"
+        _, records = read_snapshot(snapshot)
+        ops = sorted((r["op"], r["alias"] if r["op"] == "del" else r["alias"]["alias"]) for r in records)
+        assert ops == [("del", "b"), ("put", "a"), ("put", "c")]
+
+    def test_unchanged_state_writes_nothing(self, tmp_path):
+        """Test that no snapshot is written when nothing changed."""
+        create_backup([make_alias("a")], tmp_path, now=T0)
+
+        assert create_backup([make_alias("a")], tmp_path, now=T0 + timedelta(hours=1)) is None
+        assert len(list_snapshots(tmp_path)) == 1
+
+    def test_state_at_point_in_time(self, tmp_path):
+        """Test reconstructing the state from a chain of deltas."""
+        create_backup([make_alias("a")], tmp_path, now=T0)
+        create_backup([make_alias("a"), make_alias("b")], tmp_path, now=T0 + timedelta(hours=1))
+        create_backup([make_alias("b")], tmp_path, now=T0 + timedelta(hours=2))
+        snapshots = list_snapshots(tmp_path)
+
+        state, snapshot = state_at(snapshots, T0 + timedelta(minutes=90))
+        assert sorted(state) == ["a", "b"]
+        assert snapshot.timestamp == T0 + timedelta(hours=1)
+
+        latest, _ = state_at(snapshots)
+        assert sorted(latest) == ["b"]
+
+        empty, none = state_at(snapshots, T0 - timedelta(days=1))
+        assert empty == {} and none is None
+
+
+class TestRetention:
+    """Test cases for snapshot compaction."""
+
+    def test_compact_folds_old_deltas(self, tmp_path):
+        """Test that compaction keeps restorable state for retained snapshots."""
+        for hour, names in enumerate([["a"], ["a", "b"], ["b", "c"], ["c", "d"]]):
+            create_backup([make_alias(n) for n in names], tmp_path, now=T0 + timedelta(hours=hour))
+
+        removed = compact(tmp_path, keep=2)
+        snapshots = list_snapshots(tmp_path)
+
+        assert removed == 2
+        assert len(snapshots) == 2
+        assert snapshots[0].is_full
+        assert sorted(state_at(snapshots, snapshots[0].timestamp)[0]) == ["b", "c"]
+        assert sorted(state_at(snapshots)[0]) == ["c", "d"]
+
+    def test_interrupted_compaction_keeps_state(self, tmp_path):
+        """Test that a full snapshot left beside the delta it replaced sorts first and survives compaction."""
+        for hour, names in enumerate([["a"], ["a", "b"], ["b", "c"], ["c", "d"]]):
+            create_backup([make_alias(n) for n in names], tmp_path, now=T0 + timedelta(hours=hour))
+        # Compaction stopped after writing the full snapshot for the 3rd delta
+        folded = T0 + timedelta(hours=2)
+        write_snapshot(tmp_path, "full", [{"op": "put", "alias": make_alias(n).to_dict()} for n in ("b", "c")],
+                       folded, extension=".gz")
+
+        snapshots = list_snapshots(tmp_path)
+        assert [(s.timestamp, s.kind) for s in snapshots[2:4]] == [(folded, "full"), (folded, "delta")]
+        assert sorted(state_at(snapshots)[0]) == ["c", "d"]
+
+        assert compact(tmp_path, keep=2) == 2
+        snapshots = list_snapshots(tmp_path)
+        assert [(s.timestamp, s.kind) for s in snapshots] == [(folded, "full"), (T0 + timedelta(hours=3), "delta")]
+        assert sorted(state_at(snapshots, folded)[0]) == ["b", "c"]
+        assert sorted(state_at(snapshots)[0]) == ["c", "d"]
+
+    def test_compact_within_limit_is_noop(self, tmp_path):
+        """Test that compaction does nothing below the retention limit."""
+        create_backup([make_alias("a")], tmp_path, now=T0)
+
+        assert compact(tmp_path, keep=5) == 0
+
+
+class TestRestore:
+    """Test cases for restore planning."""
+
+    def test_plan_restore_minimal_diff(self):
+        """Test that only differing aliases produce operations, deletes first."""
+        live = AliasSet([make_alias("keep"), make_alias("extra"), make_alias("moved", "old@example.com")])
+        target = {
+            "keep": make_alias("keep").to_dict(),
+            "moved": make_alias("moved", "new@example.com").to_dict(),
+            "missing": make_alias("missing").to_dict(),
+        }
+
+        operations = plan_restore(live, target)
+
+        assert operations == [
+            Operation("delete", "extra"),
+            Operation("update", "moved", "new@example.com"),
+            Operation("add", "missing", "missing@example.com"),
+        ]
+
+    def test_parse_timestamp(self):
+        """Test timestamp parsing with and without timezone."""
+        assert parse_timestamp("2025-01-01T12:00") == T0
+        assert parse_timestamp("2025-01-01T12:00:00Z") == T0
+        with pytest.raises(BackupError):
+            parse_timestamp("yesterday")
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,365 @@
+"""Tests for batch module."""
+
+import threading
+import time
+
+import pytest
+
+from deadline import set_deadline
+from api import AliasExistsError, LimitReachedError, RateLimitError, ServerError, NetworkError
+from batch import (
+    ConcurrencyController, Operation, Batcher, run_operations, parse_operation, run_stream, coalesce
+)
+
+
+class TestConcurrencyController:
+    """Test cases for the AIMD concurrency window."""
+
+    def test_grows_while_healthy(self):
+        """Test that fast successes grow the window up to the maximum."""
+        controller = ConcurrencyController(initial=2, maximum=4)
+        for i in range(50):
+            controller.observe(0.1, now=float(i))
+
+        assert controller.window == 4
+
+    def test_halves_on_overload(self):
+        """Test that 429, 5xx and network errors halve the window."""
+        for error in (RateLimitError("429"), ServerError("503"), NetworkError("timeout")):
+            controller = ConcurrencyController(initial=8, maximum=8)
+            controller.observe(0.1, error, now=1.0)
+
+            assert controller.window == 4
+            assert controller.backoffs == 1
+
+    def test_one_decrease_per_round_trip(self):
+        """Test that a burst of failures only backs off once."""
+        controller = ConcurrencyController(initial=8, maximum=8)
+        controller.observe(0.5, now=0.0)
+        for _ in range(5):
+            controller.observe(0.5, RateLimitError("429"), now=1.0)
+
+        assert controller.window == 4
+        controller.observe(0.5, RateLimitError("429"), now=2.0)
+        assert controller.window == 2
+
+    def test_client_errors_are_neutral(self):
+        """Test that 409/404 responses neither grow nor shrink the window."""
+        controller = ConcurrencyController(initial=3, maximum=10)
+        for i in range(20):
+            controller.observe(0.1, AliasExistsError("exists"), now=float(i))
+
+        assert controller.window == 3
+
+    def test_slow_responses_stop_growth(self):
+        """Test that latency far above the best seen holds the window."""
+        controller = ConcurrencyController(initial=2, maximum=10)
+        controller.observe(0.1, now=0.0)
+        before = controller._window
+        for i in range(20):
+            controller.observe(1.0, now=float(i + 1))
+
+        assert controller._window == before
+
+
+class TestRunOperations:
+    """Test cases for concurrent execution."""
+
+    def test_in_flight_follows_window(self):
+        """Test that no more requests than the window run at once."""
+        lock = threading.Lock()
+        state = {"now": 0, "peak": 0}
+
+        class SlowAPI:
+            def add_alias(self, alias, forward):
+                with lock:
+                    state["now"] += 1
+                    state["peak"] = max(state["peak"], state["now"])
+                time.sleep(0.01)
+                with lock:
+                    state["now"] -= 1
+                return {"success": True}
+
+        controller = ConcurrencyController(initial=2, maximum=2)
+        operations = [Operation("add", f"a{i}", "x@example.com") for i in range(10)]
+        results = run_operations(SlowAPI(), operations, controller=controller)
+
+        assert len(results) == 10
+        assert all(r.ok for r in results)
+        assert state["peak"] <= 2
+        assert controller.completed == 10
+
+    def test_deadline_drops_queued_operations(self):
+        """Test that nothing new starts once the deadline has passed."""
+        calls = []
+
+        class API:
+            def delete_alias(self, alias):
+                calls.append(alias)
+                # The first request uses up the whole budget
+                set_deadline(0)
+                return {"success": True}
+
+        try:
+            operations = [Operation("delete", f"a{i}") for i in range(10)]
+            results = run_operations(API(), operations,
+                                     controller=ConcurrencyController(initial=1, maximum=1))
+        finally:
+            set_deadline(None)
+
+        assert calls == ["a0"]
+        assert len(results) == 1
+
+
+class TestParseOperation:
+    """Test cases for reading operation stream lines."""
+
+    def test_text_forms(self):
+        """Test the add/update/delete shorthand."""
+        assert parse_operation("add a x@y.com\n") == Operation("add", "a", "x@y.com")
+        assert parse_operation("  UPDATE a z@y.com") == Operation("update", "a", "z@y.com")
+        assert parse_operation("delete b") == Operation("delete", "b")
+
+    def test_json_form(self):
+        """Test that Operation.to_dict lines are accepted."""
+        line = '{"action": "add", "alias": "a", "forward": "x@y.com"}'
+        assert parse_operation(line) == Operation("add", "a", "x@y.com")
+        assert parse_operation('{"action": "delete", "alias": "b"}') == Operation("delete", "b")
+
+    def test_blank_and_comments(self):
+        """Test that blank lines and comments are skipped."""
+        assert parse_operation("") is None
+        assert parse_operation("   # bulk import") is None
+
+    def test_invalid_lines(self):
+        """Test that malformed lines raise ValueError."""
+        for line in ("add a", "rename a b", "add a b c d", "{not json", "[1]", '{"alias": "a"}'):
+            with pytest.raises(ValueError):
+                parse_operation(line)
+
+
+class TestRunStream:
+    """Test cases for pipelined execution of an operation stream."""
+
+    class RecordingAPI:
+        def __init__(self, delay=0.0):
+            self.delay = delay
+            self.lock = threading.Lock()
+            self.calls = []
+            self.active = set()
+            self.now = 0
+            self.peak = 0
+            self.overlap = False
+
+        def _call(self, action, alias):
+            with self.lock:
+                if alias in self.active:
+                    self.overlap = True
+                self.active.add(alias)
+                self.now += 1
+                self.peak = max(self.peak, self.now)
+            time.sleep(self.delay)
+            with self.lock:
+                self.active.discard(alias)
+                self.now -= 1
+                self.calls.append((action, alias))
+            if action == "add" and alias == "taken":
+                raise AliasExistsError("exists")
+            return {"success": True}
+
+        def add_alias(self, alias, forward):
+            return self._call("add", alias)
+
+        def update_alias(self, alias, forward):
+            return self._call("update", alias)
+
+        def delete_alias(self, alias):
+            return self._call("delete", alias)
+
+    def test_same_alias_keeps_input_order(self):
+        """Test that operations on one alias never overlap and run in order."""
+        api = self.RecordingAPI(delay=0.002)
+        operations = []
+        for i in range(20):
+            operations.append(Operation("add", f"a{i % 3}", "x@y.com"))
+            operations.append(Operation("delete", f"a{i % 3}"))
+        results = []
+        run_stream(api, iter(operations), lambda i, r: results.append((i, r)),
+                   controller=ConcurrencyController(initial=4, maximum=4))
+
+        assert len(results) == 40
+        assert not api.overlap
+        for name in ("a0", "a1", "a2"):
+            expected = [op.action for op in operations if op.alias == name]
+            assert [action for action, alias in api.calls if alias == name] == expected
+        assert sorted(i for i, _ in results) == list(range(40))
+
+    def test_concurrency_is_bounded(self):
+        """Test that different aliases run concurrently within the window."""
+        api = self.RecordingAPI(delay=0.01)
+        operations = [Operation("add", f"a{i}", "x@y.com") for i in range(12)]
+        run_stream(api, iter(operations), lambda i, r: None,
+                   controller=ConcurrencyController(initial=3, maximum=3))
+
+        assert 1 < api.peak <= 3
+
+    def test_results_stream_before_input_ends(self):
+        """Test that results are reported while the input is still open."""
+        api = self.RecordingAPI()
+        reported = threading.Event()
+
+        def _operations():
+            yield Operation("add", "first", "x@y.com")
+            # A pipe that stays open: the next line only comes after the first result
+            assert reported.wait(5)
+            yield Operation("add", "taken", "x@y.com")
+
+        results = []
+
+        def _on_result(index, result):
+            results.append((index, result.ok))
+            reported.set()
+
+        run_stream(api, _operations(), _on_result)
+
+        assert results == [(0, True), (1, False)]
+
+    def test_callback_errors_stop_the_stream(self):
+        """Test that a failing result handler (e.g. closed stdout) ends the run."""
+        api = self.RecordingAPI()
+
+        def _on_result(index, result):
+            raise BrokenPipeError()
+
+        with pytest.raises(BrokenPipeError):
+            run_stream(api, (Operation("delete", f"a{i}") for i in range(100)), _on_result,
+                       controller=ConcurrencyController(initial=1, maximum=1))
+        assert len(api.calls) < 100
+
+    def test_deadline_stops_reading(self):
+        """Test that a stream stops reading and drops queued work at the deadline."""
+        api = self.RecordingAPI()
+        read = []
+
+        def _operations():
+            for i in range(100):
+                read.append(i)
+                if i == 5:
+                    set_deadline(0)
+                yield Operation("add", "same", "x@y.com")
+
+        try:
+            run_stream(api, _operations(), lambda i, r: None)
+        finally:
+            set_deadline(None)
+
+        assert len(read) == 6
+        assert len(api.calls) <= 6
+
+
+class TestCoalesce:
+    """Test cases for reducing collected operations."""
+
+    def test_add_then_delete_cancels(self):
+        """Test that an alias created and removed in one batch sends nothing."""
+        planned, cancelled = coalesce([Operation("add", "a", "x@y.com"), Operation("delete", "a")])
+
+        assert planned == []
+        assert cancelled == ["a"]
+
+    def test_delete_then_add_becomes_update(self):
+        """Test that replacing an alias is a single update."""
+        planned, _ = coalesce([Operation("delete", "a"), Operation("add", "a", "new@y.com")])
+
+        assert planned == [Operation("update", "a", "new@y.com")]
+
+    def test_forward_changes_merge(self):
+        """Test that repeated forward changes keep only the last."""
+        planned, _ = coalesce([
+            Operation("add", "a", "1@y.com"), Operation("update", "a", "2@y.com"),
+            Operation("update", "b", "1@y.com"), Operation("update", "b", "3@y.com"),
+            Operation("update", "c", "1@y.com"), Operation("delete", "c"),
+        ])
+
+        assert planned == [
+            Operation("add", "a", "2@y.com"),
+            Operation("update", "b", "3@y.com"),
+            Operation("delete", "c"),
+        ]
+
+
+class TestBatcher:
+    """Test cases for the collecting batch context manager."""
+
+    class FakeAPI:
+        def __init__(self, limit=None):
+            self.limit = limit
+            self.count = 0
+            self.lock = threading.Lock()
+            self.calls = []
+
+        def ensure_pool(self, size):
+            pass
+
+        def add_alias(self, alias, forward):
+            with self.lock:
+                self.calls.append(("add", alias))
+                if self.limit is not None and self.count >= self.limit:
+                    raise LimitReachedError("limit")
+                self.count += 1
+            return {"success": True}
+
+        def update_alias(self, alias, forward):
+            with self.lock:
+                self.calls.append(("update", alias))
+            return {"success": True}
+
+        def delete_alias(self, alias):
+            with self.lock:
+                self.calls.append(("delete", alias))
+                self.count -= 1
+            return {"success": True}
+
+    def test_deletes_free_capacity_first(self):
+        """Test that adds written before deletes still fit under the limit."""
+        api = self.FakeAPI(limit=2)
+        api.count = 2
+        with Batcher(api, workers=4) as b:
+            b.add("new1", "x@y.com").add("new2", "x@y.com")
+            b.delete("old1").delete("old2")
+
+        assert not b.failed
+        assert {action for action, _ in api.calls[:2]} == {"delete"}
+        assert api.count == 2
+
+    def test_report(self):
+        """Test the consolidated report."""
+        api = self.FakeAPI()
+        with Batcher(api) as b:
+            b.add("a", "x@y.com")
+            b.delete("a")
+            b.delete("b")
+            b.add("b", "z@y.com")
+
+        report = b.report()
+        assert report["requested"] == 4
+        assert report["sent"] == 1
+        assert report["cancelled"] == ["a"]
+        assert report["succeeded"] == 1
+        assert report["results"] == [{"action": "update", "alias": "b", "forward": "z@y.com", "ok": True}]
+        assert api.calls == [("update", "b")]
+
+    def test_nothing_sent_on_exception(self):
+        """Test that an error inside the block discards the batch."""
+        api = self.FakeAPI()
+        with pytest.raises(RuntimeError):
+            with Batcher(api) as b:
+                b.add("a", "x@y.com")
+                raise RuntimeError("abort")
+
+        assert api.calls == []
+        assert b.results == []
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,114 @@
+"""Tests for breaker module."""
+
+import threading
+import time
+
+import pytest
+
+from breaker import CircuitBreaker, CLOSED, OPEN, HALF_OPEN
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestCircuitBreaker:
+    """Test cases for the closed/open/half-open state machine."""
+
+    def setup_method(self, method):
+        self.clock = FakeClock()
+        self.breaker = CircuitBreaker(threshold=3, reset_timeout=10, clock=self.clock)
+
+    def fail(self, times):
+        for _ in range(times):
+            assert self.breaker.acquire()
+            self.breaker.record(ok=False)
+
+    def test_opens_after_consecutive_failures(self):
+        """Test that only consecutive failures open the circuit."""
+        self.fail(2)
+        self.breaker.acquire()
+        self.breaker.record(ok=True)
+        self.fail(2)
+        assert self.breaker.state == CLOSED
+
+        self.fail(1)
+        assert self.breaker.state == OPEN
+        assert not self.breaker.acquire()
+        assert self.breaker.snapshot() == {"state": OPEN, "failures": 3, "opens": 1, "rejected": 1}
+        assert self.breaker.retry_in() == 10
+
+    def test_half_open_probe(self):
+        """Test that one probe is let through after the reset timeout."""
+        self.fail(3)
+        self.clock.now = 10
+
+        assert self.breaker.acquire()
+        assert self.breaker.state == HALF_OPEN
+        assert not self.breaker.acquire()
+
+        self.breaker.record(ok=True)
+        assert self.breaker.state == CLOSED
+        assert self.breaker.acquire()
+
+    def test_failed_probe_reopens(self):
+        """Test that a failed probe opens the circuit for another period."""
+        self.fail(3)
+        self.clock.now = 10
+        assert self.breaker.acquire()
+        self.breaker.record(ok=False)
+
+        assert self.breaker.state == OPEN
+        assert self.breaker.snapshot()["opens"] == 2
+        self.clock.now = 15
+        assert not self.breaker.acquire()
+
+    def test_released_probe_frees_slot(self):
+        """Test that a probe ending without an outcome lets another one through."""
+        self.fail(3)
+        self.clock.now = 10
+        assert self.breaker.acquire()
+        self.breaker.release()
+
+        assert self.breaker.acquire()
+
+    def test_disabled(self):
+        """Test that a zero threshold never opens."""
+        breaker = CircuitBreaker(threshold=0)
+        for _ in range(10):
+            assert breaker.acquire()
+            breaker.record(ok=False)
+
+        assert breaker.state == CLOSED
+
+    def test_waiting_requests_follow_probe(self):
+        """Test that waiting threads are released once a probe closes the circuit."""
+        breaker = CircuitBreaker(threshold=1, reset_timeout=0.05)
+        breaker.acquire()
+        breaker.record(ok=False)
+
+        allowed = []
+
+        def worker():
+            if breaker.acquire(wait=True, timeout=5):
+                allowed.append(True)
+                breaker.record(ok=True)
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        start = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+
+        assert allowed == [True] * 4
+        assert time.monotonic() - start >= 0.04
+        assert breaker.state == CLOSED
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,103 @@
+"""Tests for cassette module."""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from api import ImprovMXAPI, AliasExistsError
+from cassette import Cassette, RecordingAdapter, ReplayAdapter, CassetteError, REDACTED
+from config import IMPROVMX_API_KEY
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def _reply(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        time.sleep(0.05)
+        self._reply(200, {"aliases": [{"alias": "a", "forward": "a@example.com"}], "total": 1})
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        self._reply(409, {"message": "exists"})
+
+    def log_message(self, *args):
+        pass
+
+
+class TestRecordReplay:
+    """Test cases for recording real traffic and replaying it offline."""
+
+    def setup_method(self, method):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def teardown_method(self, method):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def record(self, path):
+        api = ImprovMXAPI()
+        api.use_transport(RecordingAdapter(Cassette(path)))
+        aliases = api._make_request("GET", f"{self.base}/aliases?key={IMPROVMX_API_KEY}")
+        with pytest.raises(AliasExistsError):
+            api._make_request("POST", f"{self.base}/aliases", json={"alias": "a", "forward": "a@example.com"})
+        return aliases
+
+    def test_recording_redacts_secrets(self, tmp_path):
+        """Test that neither the auth header nor the key reach the cassette."""
+        self.record(tmp_path / "run.jsonl")
+
+        text = (tmp_path / "run.jsonl").read_text()
+        assert IMPROVMX_API_KEY not in text
+        assert "Authorization" not in text
+        assert REDACTED in text
+
+    def test_replay_matches_recording(self, tmp_path):
+        """Test that replay reproduces responses and error mapping offline."""
+        recorded = self.record(tmp_path / "run.jsonl")
+
+        api = ImprovMXAPI()
+        api.use_transport(ReplayAdapter(Cassette(tmp_path / "run.jsonl"), speed=0))
+
+        assert api._make_request("GET", f"{self.base}/aliases?key={IMPROVMX_API_KEY}") == recorded
+        with pytest.raises(AliasExistsError):
+            api._make_request("POST", f"{self.base}/aliases", json={"alias": "a", "forward": "a@example.com"})
+        with pytest.raises(CassetteError, match="No recorded response"):
+            api._make_request("GET", f"{self.base}/other")
+
+    def test_replay_timing_scales(self, tmp_path):
+        """Test that recorded durations are replayed with the speed factor."""
+        self.record(tmp_path / "run.jsonl")
+        url = f"{self.base}/aliases?key={IMPROVMX_API_KEY}"
+
+        timings = {}
+        for speed in (0, 2):
+            api = ImprovMXAPI()
+            api.use_transport(ReplayAdapter(Cassette(tmp_path / "run.jsonl"), speed=speed))
+            start = time.perf_counter()
+            api._make_request("GET", url)
+            timings[speed] = time.perf_counter() - start
+
+        assert timings[0] < 0.05
+        assert timings[2] >= 0.1
+
+    def test_missing_cassette(self, tmp_path):
+        """Test that replaying a missing cassette fails clearly."""
+        with pytest.raises(CassetteError):
+            ReplayAdapter(Cassette(tmp_path / "missing.jsonl"))
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,193 @@
+"""Tests for cli module."""
+
+import json
+import re
+import time
+
+import pytest
+import responses
+from typer.testing import CliRunner
+
+import api
+import journal
+from api import DeadlineExceededError
+from deadline import set_deadline, EXIT_DEADLINE
+import outbox
+import store
+from cli import app
+from models import Alias
+from store import AliasStore
+
+
+BASE = "https://api.improvmx.com/v3"
+
+
+class FakeImprovMX:
+    """In-memory ImprovMX API for one domain, served through ``responses``."""
+
+    def __init__(self, mock, domain="test.com", limit=100):
+        self.aliases = {}
+        url = re.compile(rf"{re.escape(BASE)}/domains/{re.escape(domain)}/aliases(/[^?]*)?(\?.*)?$")
+        mock.add_callback(responses.GET, url, callback=self.list)
+        mock.add_callback(responses.POST, url, callback=self.add)
+        mock.add_callback(responses.PUT, url, callback=self.update)
+        mock.add_callback(responses.DELETE, url, callback=self.delete)
+        mock.add(responses.GET, f"{BASE}/account",
+                 json={"success": True, "account": {"limits": {"aliases": limit}}})
+
+    @staticmethod
+    def _name(request):
+        return request.path_url.split("?", 1)[0].rsplit("/aliases/", 1)[-1]
+
+    def _reply(self, status, body):
+        return status, {"Content-Type": "application/json"}, json.dumps(body)
+
+    def list(self, request):
+        records = [{"alias": name, "forward": forward, "active": True} for name, forward in self.aliases.items()]
+        page = int(request.params.get("page", 1))
+        return self._reply(200, {"aliases": records[(page - 1) * 100:page * 100],
+                                 "total": len(records), "page": page, "success": True})
+
+    def add(self, request):
+        body = json.loads(request.body)
+        if body["alias"] in self.aliases:
+            return self._reply(400, {"success": False, "errors": {"alias": ["This alias already exists."]}})
+        self.aliases[body["alias"]] = body["forward"]
+        return self._reply(200, {"success": True, "alias": body})
+
+    def update(self, request):
+        name = self._name(request)
+        if name not in self.aliases:
+            return self._reply(404, {"success": False, "error": "Alias not found"})
+        self.aliases[name] = json.loads(request.body)["forward"]
+        return self._reply(200, {"success": True})
+
+    def delete(self, request):
+        name = self._name(request)
+        if self.aliases.pop(name, None) is None:
+            return self._reply(404, {"success": False, "error": "Alias not found"})
+        return self._reply(200, {"success": True})
+
+
+@pytest.fixture
+def home(tmp_path, monkeypatch):
+    """Fresh local state (store, jobs, outbox) and API client per test."""
+    for module in (store, journal, outbox):
+        monkeypatch.setattr(module, "GALIAS_HOME", tmp_path)
+    monkeypatch.setattr(api, "_api_instance", None)
+    yield tmp_path
+    set_deadline(None)
+
+
+@pytest.fixture
+def improvmx(home):
+    with responses.RequestsMock(assert_all_requests_are_fired=False) as mock:
+        yield FakeImprovMX(mock)
+
+
+def galias(*args):
+    return CliRunner().invoke(app, [*args, "--no-color"])
+
+
+class TestExpiries:
+    """Test cases for TTLs surviving queued, journaled and repeated changes."""
+
+    def test_recreated_alias_is_not_reaped(self, improvmx, monkeypatch):
+        """Test that a stale TTL never deletes an alias re-created without one."""
+        assert galias("add", "tmp", "x@example.com", "--ttl", "1h", "-q").exit_code == 0
+        assert galias("delete", "tmp", "--queue", "--force").exit_code == 0
+        assert galias("flush").exit_code == 0
+        assert galias("add", "tmp", "y@example.com", "-q").exit_code == 0
+
+        later = time.time() + 7200
+        monkeypatch.setattr(time, "time", lambda: later)
+        result = galias("reap", "--json")
+
+        assert result.exit_code == 0, result.output
+        assert improvmx.aliases == {"tmp": "y@example.com"}
+        with AliasStore() as db:
+            assert db.expiry_count() == 0
+
+    def test_reap_skips_alias_changed_behind_its_ttl(self, improvmx, monkeypatch):
+        """Test that reap only deletes the alias its TTL was recorded for."""
+        assert galias("add", "tmp", "x@example.com", "--ttl", "1h", "-q").exit_code == 0
+        improvmx.aliases["tmp"] = "y@example.com"
+        with AliasStore() as db:
+            db.put(Alias("tmp", "y@example.com"))
+
+        later = time.time() + 7200
+        monkeypatch.setattr(time, "time", lambda: later)
+        result = galias("reap", "--json")
+
+        assert result.exit_code == 0, result.output
+        assert improvmx.aliases == {"tmp": "y@example.com"}
+        with AliasStore() as db:
+            assert db.expiry_count() == 0
+
+    def test_flushed_ttl_add_is_reaped(self, improvmx, monkeypatch):
+        """Test that a TTL given to a queued add still applies once it is flushed."""
+        assert galias("add", "tmp", "x@example.com", "--ttl", "1h", "--queue").exit_code == 0
+        assert galias("flush").exit_code == 0
+
+        later = time.time() + 7200
+        monkeypatch.setattr(time, "time", lambda: later)
+        result = galias("reap", "--json")
+
+        assert result.exit_code == 0, result.output
+        assert improvmx.aliases == {}
+
+
+class TestQueue:
+    """Test cases for queuing changes offline."""
+
+    def test_dry_run_does_not_write_outbox(self, improvmx):
+        """Test that --queue --dry-run reports the operation without queuing it."""
+        result = galias("add", "tmp", "x@example.com", "--queue", "--dry-run", "--ttl", "1h", "--json")
+        assert result.exit_code == 0, result.output
+        assert json.loads(result.output) == {
+            "queued": {"action": "add", "alias": "tmp", "forward": "x@example.com"},
+            "pending": 1, "dry_run": True,
+        }
+        assert galias("delete", "tmp", "--queue", "--dry-run", "--force").exit_code == 0
+
+        assert len(outbox.Outbox()) == 0
+        with AliasStore() as db:
+            assert db.expiry_count() == 0
+
+    def test_queued_delete_clears_expiry(self, improvmx):
+        """Test that queuing a delete makes reap leave the alias to the flush."""
+        assert galias("add", "tmp", "x@example.com", "--ttl", "1h", "-q").exit_code == 0
+        assert galias("delete", "tmp", "--queue", "--force").exit_code == 0
+
+        assert len(outbox.Outbox()) == 1
+        with AliasStore() as db:
+            assert db.expiry_count() == 0
+
+
+class TestDeadline:
+    """Test cases for commands running out of their --deadline."""
+
+    def test_reap_watch_stops_at_deadline(self, improvmx):
+        """Test that reap --watch exits 124 once the budget is spent instead of spinning."""
+        start = time.monotonic()
+        result = CliRunner().invoke(app, ["--deadline", "0.3s", "reap", "--watch", "--no-color"])
+
+        assert result.exit_code == EXIT_DEADLINE, result.output
+        assert time.monotonic() - start < 10
+
+    def test_in_flight_operation_cut_off_exits_124(self, improvmx, monkeypatch):
+        """Test that a job operation failing on the deadline counts as running out of time."""
+        improvmx.aliases["tmp"] = "x@example.com"
+        assert galias("delete", "tmp", "--queue", "--force").exit_code == 0
+
+        def _cut_off(self, alias):
+            raise DeadlineExceededError("Deadline of 1s reached during DELETE")
+        monkeypatch.setattr(api.ImprovMXAPI, "delete_alias", _cut_off)
+        result = galias("flush")
+
+        assert result.exit_code == EXIT_DEADLINE, result.output
+        assert "not finished" in result.output
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
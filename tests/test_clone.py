@@ -0,0 +1,73 @@
+"""Tests for clone module."""
+
+import pytest
+
+from batch import Operation
+from clone import ClonePlan, map_name
+from models import Alias, AliasSet
+
+
+class TestMapName:
+    """Test cases for target name templates."""
+
+    def test_placeholder(self):
+        """Test that {alias} is replaced with the source name."""
+        assert map_name("{alias}", "sales") == "sales"
+        assert map_name("legacy-{alias}", "sales") == "legacy-sales"
+
+    def test_catch_all_is_kept(self):
+        """Test that the catch-all alias keeps its name."""
+        assert map_name("legacy-{alias}", "*") == "*"
+
+
+class TestClonePlan:
+    """Test cases for deciding what a clone sends."""
+
+    def test_operations(self):
+        """Test that missing aliases are added and matching ones skipped."""
+        target = AliasSet([Alias("same", "a@x.com"), Alias("other", "b@x.com")])
+        plan = ClonePlan(target)
+        source = [Alias("same", "a@x.com"), Alias("other", "a@x.com"), Alias("new", "a@x.com")]
+
+        assert list(plan.operations(source)) == [Operation("add", "new", "a@x.com")]
+        assert plan.seen == 3
+        assert plan.skipped == 1
+        assert [note["alias"] for note in plan.conflicts] == ["other"]
+
+    def test_overwrite_updates_conflicts(self):
+        """Test that --overwrite turns conflicts into updates."""
+        target = AliasSet([Alias("other", "b@x.com")])
+        plan = ClonePlan(target, overwrite=True)
+
+        assert list(plan.operations([Alias("other", "a@x.com")])) == [Operation("update", "other", "a@x.com")]
+        assert plan.conflicts == []
+
+    def test_map_is_applied_before_matching(self):
+        """Test that mapped names are compared with the target."""
+        target = AliasSet([Alias("old-sales", "a@x.com")])
+        plan = ClonePlan(target, "old-{alias}")
+        source = [Alias("sales", "a@x.com"), Alias("support", "a@x.com")]
+
+        assert list(plan.operations(source)) == [Operation("add", "old-support", "a@x.com")]
+
+    def test_source_is_read_lazily(self):
+        """Test that operations are produced while the source is being read."""
+        read = []
+
+        def _source():
+            for name in ("a", "b"):
+                read.append(name)
+                yield Alias(name, "a@x.com")
+
+        operations = ClonePlan(AliasSet()).operations(_source())
+        next(operations)
+        assert read == ["a"]
+
+    def test_pattern_needs_placeholder(self):
+        """Test that a map without {alias} is rejected."""
+        with pytest.raises(ValueError):
+            ClonePlan(AliasSet(), "legacy")
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
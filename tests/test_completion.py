@@ -0,0 +1,99 @@
+"""Tests for completion module."""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from completion import COMMANDS, candidates, alias_names, job_ids
+from models import Alias
+from store import AliasStore
+
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture
+def home(tmp_path, monkeypatch):
+    """A GALIAS_HOME with a synced alias store and two jobs."""
+    monkeypatch.setenv("GALIAS_HOME", str(tmp_path))
+    monkeypatch.setenv("DOMAIN", "test.com")
+    with AliasStore(tmp_path / "aliases.db") as store:
+        store.sync([Alias("sales"), Alias("support"), Alias("info")], "test.com")
+        store.sync([Alias("sales-other")], "other.com")
+    (tmp_path / "jobs").mkdir()
+    (tmp_path / "jobs" / "20250101-120000-abcd.jsonl").write_text("")
+    (tmp_path / "jobs" / "20250102-120000-ef01.jsonl").write_text("")
+    return tmp_path
+
+
+class TestCandidates:
+    """Test cases for completion candidates."""
+
+    def test_commands_match_cli(self):
+        """Test that the static command list matches the Typer app."""
+        from cli import app
+        registered = {c.name or c.callback.__name__ for c in app.registered_commands}
+
+        assert set(COMMANDS) == registered
+
+    def test_command_names(self):
+        """Test completion of the subcommand."""
+        assert candidates([], "st") == ["status", "stats"]
+        assert "delete" in candidates([], "")
+
+    def test_alias_names_from_store(self, home):
+        """Test alias names are served from the local store for one domain."""
+        assert candidates(["delete"], "s") == ["sales", "support"]
+        assert candidates(["delete", "--force"], "i") == ["info"]
+        assert alias_names("sales", domain="other.com") == ["sales-other"]
+
+    def test_job_ids(self, home):
+        """Test job ids are newest first."""
+        assert candidates(["undo"], "2025") == ["20250102-120000-ef01", "20250101-120000-abcd"]
+        assert job_ids("20250101") == ["20250101-120000-abcd"]
+
+    def test_falls_back_for_options(self, home):
+        """Test that option completion is left to Typer."""
+        assert candidates(["delete"], "--") is None
+        assert candidates(["delete", "sales"], "") is None
+        assert candidates(["list"], "") is None
+
+    def test_missing_store(self, tmp_path, monkeypatch):
+        """Test that a missing store yields no alias names."""
+        monkeypatch.setenv("GALIAS_HOME", str(tmp_path / "none"))
+        assert alias_names("s", domain="test.com") == []
+
+
+class TestFastPath:
+    """Test cases for the completion fast path in improvctl."""
+
+    def test_bash_completion_skips_heavy_imports(self, home):
+        """Test that completion answers without importing requests or the CLI."""
+        env = dict(os.environ, _GALIAS_COMPLETE="complete_bash", COMP_WORDS="galias delete su", COMP_CWORD="2")
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", "import improvctl"],
+            capture_output=True, text=True, cwd=str(ROOT), env=env
+        )
+
+        assert result.returncode == 0
+        assert result.stdout == "support"
+        imported = [line.split("|")[-1].strip() for line in result.stderr.splitlines()]
+        assert "requests" not in imported
+        assert "cli" not in imported
+
+    def test_zsh_completion_format(self, home):
+        """Test the zsh output format."""
+        env = dict(os.environ, _GALIAS_COMPLETE="complete_zsh", _TYPER_COMPLETE_ARGS="galias del")
+        result = subprocess.run(
+            [sys.executable, "-c", "import improvctl"],
+            capture_output=True, text=True, cwd=str(ROOT), env=env
+        )
+
+        assert result.stdout == "_arguments '*: :((\"delete\"))'"
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
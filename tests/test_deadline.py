@@ -0,0 +1,119 @@
+"""Tests for deadline module."""
+
+import sys
+
+import pytest
+
+from api import AliasNotFoundError, DeadlineExceededError
+from deadline import (
+    Deadline, DurationError, set_deadline, current_deadline, deadline_expired, clip_to_deadline, parse_duration,
+    EXIT_DEADLINE
+)
+
+
+@pytest.fixture(autouse=True)
+def no_deadline():
+    """Never leak a budget into other tests."""
+    yield
+    set_deadline(None)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestDeadline:
+    """Test cases for the command time budget."""
+
+    def test_remaining_and_expired(self):
+        """Test that the budget drains with the clock."""
+        clock = FakeClock()
+        deadline = Deadline(10, clock=clock)
+        clock.now += 4
+
+        assert deadline.remaining() == 6
+        assert not deadline.expired
+        clock.now += 7
+        assert deadline.remaining() == 0
+        assert deadline.expired
+
+    def test_timeouts_shrink(self):
+        """Test that request timeouts are cut to the time left."""
+        clock = FakeClock()
+        deadline = Deadline(10, clock=clock)
+
+        assert deadline.timeout((5, 30)) == (5, 10)
+        clock.now += 8
+        assert deadline.timeout((5, 30)) == (2, 2)
+        assert deadline.timeout(30) == 2
+
+    def test_global_budget(self):
+        """Test setting and clearing the budget of the running command."""
+        assert current_deadline() is None
+        assert not deadline_expired()
+        assert clip_to_deadline(60) == 60
+
+        set_deadline(5)
+        assert current_deadline().seconds == 5
+        assert clip_to_deadline(60) <= 5
+
+        set_deadline(0)
+        assert deadline_expired()
+        set_deadline(None)
+        assert not deadline_expired()
+
+
+class TestParseDuration:
+    """Test cases for duration parsing."""
+
+    def test_units(self):
+        """Test every supported unit."""
+        assert parse_duration("45s") == 45
+        assert parse_duration("15m") == 900
+        assert parse_duration("12h") == 43200
+        assert parse_duration("7d") == 604800
+        assert parse_duration("2w") == 1209600
+        assert parse_duration("1.5h") == 5400
+
+    def test_invalid(self):
+        """Test that malformed or empty durations are rejected."""
+        for text in ("", "7", "7x", "d", "-1d", "0s"):
+            with pytest.raises(DurationError):
+                parse_duration(text)
+
+
+
+class TestExitStatus:
+    """Test cases for the exit status of commands after the deadline."""
+
+    @staticmethod
+    def failing_app(error):
+        def app(**kwargs):
+            try:
+                raise error
+            except Exception:
+                sys.exit(1)
+        return app
+
+    def test_only_deadline_errors_exit_124(self, monkeypatch):
+        """Test that a failure exits 124 only if the deadline caused it."""
+        import improvctl
+        set_deadline(0)
+
+        monkeypatch.setattr(improvctl, "app", self.failing_app(DeadlineExceededError("late")))
+        with pytest.raises(SystemExit) as exc:
+            improvctl.main()
+        assert exc.value.code == EXIT_DEADLINE
+
+        monkeypatch.setattr(improvctl, "app", self.failing_app(AliasNotFoundError("gone")))
+        with pytest.raises(SystemExit) as exc:
+            improvctl.main()
+        assert exc.value.code == 1
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
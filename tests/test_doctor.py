@@ -0,0 +1,126 @@
+"""Tests for doctor module."""
+
+import json
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock
+
+import pytest
+
+from doctor import PHASES, summarize, measure_request, check_reuse, credentials_for
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = json.dumps({"aliases": [], "auth": self.headers.get("Authorization")}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestSummary:
+    """Test cases for phase summaries."""
+
+    def test_summarize_skips_missing_phases(self):
+        """Test that plain-HTTP samples report no TLS time."""
+        samples = [
+            {"dns": 0.001, "connect": 0.002, "tls": None, "ttfb": 0.010, "download": 0.001, "decode": 0.0},
+            {"dns": 0.003, "connect": 0.002, "tls": None, "ttfb": 0.030, "download": 0.001, "decode": 0.0},
+        ]
+
+        summary = summarize(samples)
+
+        assert summary["tls"] is None
+        assert summary["ttfb"]["max"] == 30.0
+        assert summary["total"]["max"] == 36.0
+
+
+class TestMeasureRequest:
+    """Test cases for timing a request against a local server."""
+
+    def setup_method(self, method):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/aliases?page=1"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def teardown_method(self, method):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_phases_measured(self):
+        """Test that every phase is timed and the response is read."""
+        timings = measure_request(self.url, auth="Basic abc", timeout=5)
+
+        assert timings["status"] == 200
+        assert timings["address"] == "127.0.0.1"
+        assert timings["bytes"] > 0
+        assert timings["tls"] is None
+        for phase in PHASES:
+            if phase != "tls":
+                assert timings[phase] >= 0
+
+    def test_unreachable(self):
+        """Test that a closed port raises instead of hanging."""
+        with socket.socket() as probe:
+            probe.bind(("127.0.0.1", 0))
+            port = probe.getsockname()[1]
+
+        with pytest.raises(OSError):
+            measure_request(f"http://127.0.0.1:{port}/", timeout=1)
+
+
+class TestCredentials:
+    """Test cases for when the API key is sent."""
+
+    def test_only_https_to_api_host(self, monkeypatch):
+        """Test that the key is sent over HTTPS to the API host and nowhere else."""
+        monkeypatch.setattr("doctor.IMPROVMX_API_BASE_URL", "https://api.improvmx.com")
+
+        assert credentials_for("https://api.improvmx.com/v3/account").startswith("Basic ")
+        assert credentials_for("https://api.improvmx.com:443/v3/account") is not None
+        assert credentials_for("http://api.improvmx.com/v3/account") is None
+        assert credentials_for("https://example.com/v3/account") is None
+        assert credentials_for("https://api.improvmx.com.example.com/") is None
+        assert credentials_for("https://api.improvmx.com:8443/") is None
+
+    def test_never_over_plain_http(self, monkeypatch):
+        """Test that an http:// API base URL does not get the key either."""
+        monkeypatch.setattr("doctor.IMPROVMX_API_BASE_URL", "http://127.0.0.1:8080")
+
+        assert credentials_for("http://127.0.0.1:8080/v3/account") is None
+
+
+class TestConnectionReuse:
+    """Test cases for the keep-alive check."""
+
+    def make_api(self, connections):
+        api = MagicMock()
+        api.connection_stats.side_effect = [
+            {"connections": 1, "requests": 2, "reused": 1},
+            {"connections": 1 + connections, "requests": 5, "reused": 4 - connections},
+        ]
+        return api
+
+    def test_reused(self):
+        """Test that one new connection for all requests counts as reuse."""
+        result = check_reuse(self.make_api(0))
+
+        assert result == {"requests": 3, "connections": 0, "reused": True}
+
+    def test_not_reused(self):
+        """Test that a connection per request is flagged."""
+        result = check_reuse(self.make_api(3))
+
+        assert result["reused"] is False
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,151 @@
+"""Tests for exporter module."""
+
+import threading
+import urllib.request
+from unittest.mock import MagicMock
+
+import pytest
+
+from api import ClientStats, NetworkError
+from breaker import CircuitBreaker
+from hedge import Hedger
+from exporter import MetricsCollector, make_server, render_metrics
+from models import Alias
+from store import AliasStore
+
+
+def make_api(names, limit=100):
+    api = MagicMock()
+    api.iter_aliases.side_effect = lambda: iter([Alias(n, f"{n}@example.com") for n in names])
+    api.get_alias_count.return_value = len(names)
+    api.alias_limit.return_value = limit
+    api.stats = ClientStats()
+    api.stats.observe(0.2, ok=True)
+    api.breaker = CircuitBreaker()
+    api.hedger = None
+    return api
+
+
+class TestRender:
+    """Test cases for the exposition format."""
+
+    def test_help_type_and_labels(self):
+        """Test that samples are grouped under HELP/TYPE lines."""
+        text = render_metrics([
+            ("galias_aliases", {"domain": "a.com"}, 3),
+            ("galias_aliases", {"domain": "b.com"}, 5),
+            ("galias_alias_usage_ratio", {"domain": "a.com"}, 0.03),
+        ])
+
+        assert text.splitlines() == [
+            "# HELP galias_aliases Number of aliases on the domain",
+            "# TYPE galias_aliases gauge",
+            'galias_aliases{domain="a.com"} 3',
+            'galias_aliases{domain="b.com"} 5',
+            "# HELP galias_alias_usage_ratio Aliases in use as a fraction of the limit",
+            "# TYPE galias_alias_usage_ratio gauge",
+            'galias_alias_usage_ratio{domain="a.com"} 0.03',
+        ]
+
+    def test_summary_parts_share_type(self):
+        """Test that _sum/_count belong to their summary."""
+        text = render_metrics([
+            ("galias_api_latency_seconds", {"quantile": "0.5"}, 0.1),
+            ("galias_api_latency_seconds_sum", {}, 1.5),
+            ("galias_api_latency_seconds_count", {}, 10),
+        ])
+
+        assert text.count("# TYPE") == 1
+        assert "galias_api_latency_seconds_count 10" in text
+
+
+class TestCollector:
+    """Test cases for cached refreshes."""
+
+    def test_refresh_and_samples(self, tmp_path):
+        """Test that a refresh caches counts, limits and usage."""
+        collector = MetricsCollector({"a.com": make_api(["x", "y"], limit=4)}, store_path=tmp_path / "db")
+        collector.refresh()
+
+        text = collector.render()
+        assert 'galias_up{domain="a.com"} 1' in text
+        assert 'galias_aliases{domain="a.com"} 2' in text
+        assert 'galias_alias_limit{domain="a.com"} 4' in text
+        assert 'galias_alias_usage_ratio{domain="a.com"} 0.5' in text
+        assert 'galias_api_requests_total{domain="a.com"} 1' in text
+        assert 'galias_circuit_state{domain="a.com"} 0' in text
+        assert "galias_hedge" not in text
+
+    def test_hedging_samples(self, tmp_path):
+        """Test that hedge counters are exported when hedging is enabled."""
+        api = make_api(["x"])
+        api.hedger = Hedger()
+        api.hedger.request(lambda: None)
+        collector = MetricsCollector({"a.com": api}, store_path=tmp_path / "db")
+
+        text = collector.render()
+        assert 'galias_hedge_requests_total{domain="a.com"} 1' in text
+        assert 'galias_hedges_total{domain="a.com"} 0' in text
+        assert 'galias_hedge_p99_improvement_seconds{domain="a.com"}' in text
+
+    def test_failed_refresh_keeps_last_values(self, tmp_path):
+        """Test that a failing refresh marks the domain down but keeps cached counts."""
+        api = make_api(["x"])
+        collector = MetricsCollector({"a.com": api}, store_path=tmp_path / "db")
+        collector.refresh()
+        api.get_alias_count.side_effect = NetworkError("down")
+        collector.refresh()
+
+        text = collector.render()
+        assert 'galias_up{domain="a.com"} 0' in text
+        assert 'galias_aliases{domain="a.com"} 1' in text
+        assert 'galias_refresh_errors_total{domain="a.com"} 1' in text
+
+    def test_scrapes_do_not_call_api(self, tmp_path):
+        """Test that /metrics is served from the cache."""
+        api = make_api(["x"])
+        collector = MetricsCollector({"a.com": api}, store_path=tmp_path / "db")
+        collector.refresh()
+        server = make_server(collector, "127.0.0.1", 0)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+            for _ in range(3):
+                with urllib.request.urlopen(url) as response:
+                    body = response.read().decode()
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        assert 'galias_aliases{domain="a.com"} 1' in body
+        assert api.get_alias_count.call_count == 1
+
+    def test_refresh_does_not_page_aliases(self, tmp_path):
+        """Test that counts come from the listing total and the store is not synced by default."""
+        api = make_api(["x", "y"])
+        collector = MetricsCollector({"a.com": api}, store_path=tmp_path / "db")
+        collector.refresh()
+        collector.refresh()
+
+        assert api.get_alias_count.call_count == 2
+        api.iter_aliases.assert_not_called()
+        assert not (tmp_path / "db").exists()
+
+    def test_store_synced_on_sync_interval(self, tmp_path):
+        """Test that the store is synced on the first refresh and then only once the sync interval passes."""
+        api = make_api(["x", "y"])
+        collector = MetricsCollector({"a.com": api}, store_path=tmp_path / "db", sync_interval=3600)
+        collector.refresh()
+        collector.refresh()
+
+        assert api.iter_aliases.call_count == 1
+        with AliasStore(tmp_path / "db") as store:
+            assert store.count("a.com") == 2
+
+        collector.domains["a.com"].synced_at -= 3600
+        collector.refresh()
+        assert api.iter_aliases.call_count == 2
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,69 @@
+"""Tests for generator module."""
+
+import pytest
+from datetime import date
+from unittest.mock import patch
+
+from generator import GeneratorError, generate, render, collect_names, validate_pattern
+from models import Alias
+
+
+class TestRender:
+    """Test cases for rendering patterns."""
+
+    def test_placeholders(self):
+        """Test each placeholder type."""
+        assert render("shop-{n:3}", 7) == "shop-007"
+        assert render("x-{date}", 1, today=date(2025, 1, 31)) == "x-20250131"
+        assert len(render("{rand:12}", 1)) == 12
+        assert len(render("{rand}", 1)) == 8
+
+    def test_invalid_patterns(self):
+        """Test rejection of malformed patterns."""
+        with pytest.raises(GeneratorError, match="Unknown placeholder"):
+            validate_pattern("{word}")
+        with pytest.raises(GeneratorError, match="distinct"):
+            validate_pattern("static")
+        with pytest.raises(GeneratorError, match="distinct"):
+            validate_pattern("x-{date}")
+
+
+class TestGenerate:
+    """Test cases for collision-free generation."""
+
+    def test_skips_existing_names(self):
+        """Test that existing names are never produced."""
+        names = generate("user{n}", 3, existing={"user1", "user3"})
+
+        assert names == ["user2", "user4", "user5"]
+
+    def test_random_names_are_unique(self):
+        """Test that random names are distinct and avoid existing ones."""
+        existing = {"aa", "ab"}
+        names = generate("{rand:4}", 200, existing)
+
+        assert len(set(names)) == 200
+        assert not existing & set(names)
+
+    def test_exhausted_pattern(self):
+        """Test that a pattern with too few possible names fails cleanly."""
+        with patch("generator.secrets.choice", return_value="a"):
+            with pytest.raises(GeneratorError, match="ran out"):
+                generate("{rand:1}", 2, existing=set())
+
+    def test_invalid_rendered_name(self):
+        """Test that patterns producing invalid alias names are rejected."""
+        with pytest.raises(GeneratorError, match="invalid alias name"):
+            generate("bad name {n}", 1, existing=set())
+
+    def test_collect_names(self):
+        """Test that names are collected while aliases pass through."""
+        names = set()
+        passed = [a for a in collect_names([Alias("a"), Alias("b")], names)]
+
+        assert len(passed) == 2
+        assert names == {"a", "b"}
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
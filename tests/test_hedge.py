@@ -0,0 +1,131 @@
+"""Tests for hedge module."""
+
+import threading
+import time
+
+import pytest
+
+from hedge import Hedger
+
+
+def warm(hedger, latency=0.0, count=20):
+    """Feed ``count`` fast requests so the percentile is known."""
+    for _ in range(count):
+        hedger.request(lambda: time.sleep(latency))
+
+
+class TestHedger:
+    """Test cases for hedged requests."""
+
+    def test_no_hedging_while_warming_up(self):
+        """Test that nothing is duplicated before enough latencies are known."""
+        hedger = Hedger(budget=1.0, min_samples=5)
+        calls = []
+        for _ in range(5):
+            hedger.request(lambda: calls.append(1))
+
+        assert len(calls) == 5
+        assert hedger.hedged == 0
+        assert hedger.delay() is not None
+
+    def test_slow_request_is_hedged(self):
+        """Test that a duplicate answers for a stalled first request."""
+        hedger = Hedger(percentile=95, budget=1.0)
+        warm(hedger)
+        calls = []
+        release = threading.Event()
+
+        def _send():
+            calls.append(1)
+            if len(calls) == 1:
+                # The first request stalls until the test is over
+                release.wait(5)
+                return "slow"
+            return "fast"
+
+        start = time.perf_counter()
+        assert hedger.request(_send) == "fast"
+        assert time.perf_counter() - start < 1
+        release.set()
+        assert hedger.hedged == 1
+        assert hedger.wins == 1
+
+    def test_fast_request_is_not_hedged(self):
+        """Test that answers within the percentile are never duplicated."""
+        hedger = Hedger(budget=1.0)
+        warm(hedger, latency=0.02)
+        hedger.request(lambda: None)
+
+        assert hedger.hedged == 0
+        assert hedger.requests == 21
+
+    def test_budget_caps_extra_load(self):
+        """Test that hedges are limited to the configured share of requests."""
+        hedger = Hedger(percentile=50, budget=0.1)
+        # Enough fast requests that the slow ones below stay above the median
+        warm(hedger, count=100)
+        for _ in range(30):
+            hedger.request(lambda: time.sleep(0.02))
+
+        # 130 requests at 10% allow 13 duplicates, at most 10 of them saved up
+        assert 9 <= hedger.hedged <= 13
+        assert hedger.denied == 30 - hedger.hedged
+
+    def test_errors_fall_back_to_other_request(self):
+        """Test that a failing duplicate does not hide the first answer."""
+        hedger = Hedger(budget=1.0)
+        warm(hedger)
+        calls = []
+
+        def _send():
+            calls.append(1)
+            if len(calls) == 1:
+                time.sleep(0.1)
+                return "first"
+            raise ConnectionError("refused")
+
+        assert hedger.request(_send) == "first"
+        assert hedger.wins == 0
+
+    def test_both_failing_raises(self):
+        """Test that the original error is raised when both requests fail."""
+        hedger = Hedger(budget=1.0)
+        warm(hedger)
+        calls = []
+
+        def _send():
+            calls.append(1)
+            if len(calls) == 1:
+                time.sleep(0.05)
+                raise TimeoutError("first")
+            raise ConnectionError("second")
+
+        with pytest.raises(TimeoutError):
+            hedger.request(_send)
+
+    def test_snapshot_reports_p99_improvement(self):
+        """Test that the p99 with hedging is compared to the first requests alone."""
+        hedger = Hedger(budget=1.0)
+        warm(hedger, count=30)
+        release = threading.Event()
+        calls = []
+
+        def _send():
+            calls.append(1)
+            if len(calls) == 1:
+                release.wait(0.3)
+            return "ok"
+
+        hedger.request(_send)
+        # Let the losing first request finish and record its latency
+        time.sleep(0.4)
+        snapshot = hedger.snapshot()
+
+        assert snapshot["requests"] == 31
+        assert snapshot["hedged"] == 1
+        assert snapshot["p99_unhedged"] >= 0.25
+        assert snapshot["p99_improvement"] > 0.2
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
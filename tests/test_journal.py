@@ -0,0 +1,105 @@
+"""Tests for journal module."""
+
+import pytest
+from unittest.mock import MagicMock
+
+from api import AliasExistsError
+from batch import Operation
+from journal import Job, JournalError, inverse_of, list_jobs, load_job, run_job
+from models import Alias, AliasSet
+
+
+PRIOR = AliasSet([
+    Alias("old", "old@example.com"),
+    Alias("moved", "before@example.com"),
+])
+
+
+class TestInverse:
+    """Test cases for inverse operation computation."""
+
+    def test_inverses(self):
+        """Test the inverse of each action."""
+        assert inverse_of(Operation("add", "new", "n@example.com"), PRIOR) == Operation("delete", "new")
+        assert inverse_of(Operation("delete", "old"), PRIOR) == Operation("add", "old", "old@example.com")
+        assert inverse_of(Operation("update", "moved", "after@example.com"), PRIOR) == \
+            Operation("update", "moved", "before@example.com")
+        assert inverse_of(Operation("delete", "unknown"), PRIOR) is None
+
+
+class TestJob:
+    """Test cases for journaled job execution."""
+
+    def setup_method(self, method):
+        """Set up test fixtures."""
+        self.operations = [
+            Operation("delete", "old"),
+            Operation("add", "new", "new@example.com"),
+            Operation("update", "moved", "after@example.com"),
+        ]
+
+    def test_create_writes_intents(self, tmp_path):
+        """Test that all intents are journaled before execution."""
+        job = Job.create("restore", self.operations, PRIOR, domain="test.com", directory=tmp_path)
+
+        reloaded = load_job(job.id, tmp_path)
+        assert reloaded.command == "restore"
+        assert [op for _, op in reloaded.pending()] == self.operations
+        assert reloaded.counts() == {"pending": 3, "done": 0, "failed": 0}
+
+    def test_resume_skips_finished_operations(self, tmp_path):
+        """Test that a resumed job only sends unfinished operations."""
+        job = Job.create("restore", self.operations, PRIOR, directory=tmp_path)
+        job.record(0)
+        job.record(1, error="Network error")
+
+        api = MagicMock()
+        results = run_job(api, load_job(directory=tmp_path), resuming=True)
+
+        assert len(results) == 2
+        api.delete_alias.assert_not_called()
+        api.add_alias.assert_called_once_with("new", "new@example.com")
+        assert load_job(job.id, tmp_path).complete
+
+    def test_resume_treats_replayed_add_as_done(self, tmp_path):
+        """Test that an add applied before the interruption is not a failure."""
+        job = Job.create("restore", [Operation("add", "new", "new@example.com")], AliasSet(), directory=tmp_path)
+        api = MagicMock()
+        api.add_alias.side_effect = AliasExistsError("Alias already exists.")
+
+        results = run_job(api, job, resuming=True)
+
+        assert results[0].ok
+        assert job.complete
+
+    def test_torn_final_line_is_ignored(self, tmp_path):
+        """Test that a partially written record does not break loading."""
+        job = Job.create("restore", self.operations, PRIOR, directory=tmp_path)
+        job.record(0)
+        with open(job.path, "a") as handle:
+            handle.write('{"type": "do')
+
+        assert load_job(job.id, tmp_path).counts()["done"] == 1
+
+    def test_undo_operations_reverse_completed_work(self, tmp_path):
+        """Test that undo only reverts completed operations, newest first."""
+        job = Job.create("restore", self.operations, PRIOR, directory=tmp_path)
+        job.record(0)
+        job.record(2)
+
+        assert job.undo_operations() == [
+            Operation("update", "moved", "before@example.com"),
+            Operation("add", "old", "old@example.com"),
+        ]
+
+    def test_load_job_errors(self, tmp_path):
+        """Test errors for missing jobs."""
+        with pytest.raises(JournalError):
+            load_job("missing", tmp_path)
+        with pytest.raises(JournalError, match="No interrupted job"):
+            load_job(directory=tmp_path)
+        assert list_jobs(tmp_path / "none") == []
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,83 @@
+"""Tests for logs module."""
+
+import pytest
+
+from logs import LogCursor, LogTail, new_entries, log_time, log_status
+
+
+def entry(log_id, created, status="DELIVERED"):
+    return {"id": log_id, "created": created, "events": [{"status": "QUEUED"}, {"status": status}]}
+
+
+class TestEntries:
+    """Test cases for reading entries past a cursor."""
+
+    def test_log_time_formats(self):
+        """Test ISO strings and epoch seconds/milliseconds."""
+        assert log_time({"created": "1970-01-01T00:01:40Z"}) == 100.0
+        assert log_time({"created": 100}) == 100.0
+        assert log_time({"created": 1700000000000}) == 1700000000.0
+        assert log_time({}) == 0.0
+
+    def test_status_is_latest_event(self):
+        """Test that the last event decides the status."""
+        assert log_status(entry("1", 1, "REFUSED")) == "REFUSED"
+        assert log_status({"id": "1"}) == "UNKNOWN"
+
+    def test_stops_at_cursor(self):
+        """Test that reading stops at the high-water mark, keeping same-time entries not seen yet."""
+        cursor = LogCursor(100, ["b"])
+        consumed = []
+
+        def source():
+            for item in [entry("d", 300), entry("c", 100), entry("b", 100), entry("a", 50), entry("z", 10)]:
+                consumed.append(item["id"])
+                yield item
+
+        fresh = new_entries(source(), cursor)
+
+        assert [e["id"] for e in fresh] == ["c", "d"]
+        assert consumed == ["d", "c", "b", "a"]
+
+    def test_limit_without_cursor(self):
+        """Test that a first read keeps only the latest entries."""
+        fresh = new_entries(iter([entry("c", 3), entry("b", 2), entry("a", 1)]), None, limit=2)
+
+        assert [e["id"] for e in fresh] == ["b", "c"]
+
+    def test_advance(self):
+        """Test that the cursor keeps every id at the newest timestamp."""
+        cursor = LogCursor(100, ["b"]).advance([entry("c", 100)])
+        assert cursor == LogCursor(100, ["b", "c"])
+        assert cursor.advance([entry("d", 200)]) == LogCursor(200, ["d"])
+
+
+class TestLogTail:
+    """Test cases for polling."""
+
+    def test_only_new_entries_and_backoff(self):
+        """Test that polls return new entries once and back off while idle."""
+        log = [entry("a", 1)]
+        tail = LogTail(lambda: iter(reversed(log)), interval=1, max_interval=3)
+
+        assert [e["id"] for e in tail.poll()] == ["a"]
+        assert tail.poll() == []
+        assert tail.interval == 2
+        assert tail.poll() == []
+        assert tail.interval == 3
+
+        log.extend([entry("b", 2), entry("c", 3)])
+        assert [e["id"] for e in tail.poll()] == ["b", "c"]
+        assert tail.interval == 1
+        assert tail.state() == (3, ["c"])
+
+    def test_empty_first_run_starts_cursor(self):
+        """Test that an empty log still records a position."""
+        tail = LogTail(lambda: iter([]))
+
+        assert tail.poll() == []
+        assert tail.state() == (0.0, [])
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,89 @@
+"""Tests for models module."""
+
+import pytest
+
+from models import Alias, AliasSet
+
+
+class TestAlias:
+    """Test cases for Alias records."""
+
+    def test_round_trip(self):
+        """Test conversion from and to API records."""
+        record = {"alias": "info", "forward": "me@example.com", "active": False, "id": 7}
+        alias = Alias.from_dict(record)
+
+        assert alias.alias == "info"
+        assert alias.active is False
+        assert alias.to_dict() == record
+
+    def test_defaults(self):
+        """Test defaults for missing fields."""
+        alias = Alias.from_dict({"alias": "x"})
+
+        assert alias.forward == ""
+        assert alias.active is True
+        assert alias.to_dict() == {"alias": "x", "forward": "", "active": True}
+
+    def test_slots(self):
+        """Test that records have no per-instance dict."""
+        with pytest.raises(AttributeError):
+            Alias("x").label = 1
+
+    def test_unknown_fields_pass_through(self):
+        """Test that record fields without a slot survive a round trip."""
+        record = {"alias": "info", "forward": "me@example.com", "active": True, "id": 7, "note": "x"}
+
+        assert Alias.from_dict(record).to_dict() == record
+        assert Alias.from_dict({"alias": "x"}).extra is None
+
+    def test_forwards(self):
+        """Test splitting of multiple forward addresses."""
+        assert Alias("x", "a@example.com, b@example.com").forwards == ["a@example.com", "b@example.com"]
+
+
+class TestAliasSet:
+    """Test cases for AliasSet collections."""
+
+    def setup_method(self, method):
+        """Set up test fixtures."""
+        self.aliases = AliasSet.from_response({"aliases": [
+            {"alias": "b", "forward": "b@example.com"},
+            {"alias": "a", "forward": "a@example.com"},
+        ]})
+
+    def test_lookup_and_order(self):
+        """Test lookup by name and preserved listing order."""
+        assert len(self.aliases) == 2
+        assert "a" in self.aliases
+        assert Alias("b", "b@example.com") in self.aliases
+        assert self.aliases["a"].forward == "a@example.com"
+        assert self.aliases.get("missing") is None
+        assert [a.alias for a in self.aliases] == ["b", "a"]
+
+    def test_add_replaces_and_discard(self):
+        """Test replacing and removing aliases."""
+        self.aliases.add(Alias("a", "new@example.com"))
+        self.aliases.discard("b")
+
+        assert len(self.aliases) == 1
+        assert self.aliases["a"].forward == "new@example.com"
+
+    def test_to_response(self):
+        """Test conversion back to the API response format."""
+        assert self.aliases.to_response()["aliases"][0] == {
+            "alias": "b", "forward": "b@example.com", "active": True
+        }
+
+    def test_to_response_keeps_envelope(self):
+        """Test that top-level listing fields are kept beside the aliases."""
+        aliases = AliasSet.from_response({"aliases": [{"alias": "a"}], "total": 1, "success": True})
+
+        assert aliases.to_response() == {
+            "total": 1, "success": True,
+            "aliases": [{"alias": "a", "forward": "", "active": True}],
+        }
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
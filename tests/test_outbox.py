@@ -0,0 +1,106 @@
+"""Tests for outbox module."""
+
+import pytest
+
+from batch import Operation
+from models import Alias, AliasSet
+from batch import coalesce
+from outbox import Outbox, plan_flush
+
+
+class TestOutbox:
+    """Test cases for the durable queue."""
+
+    def test_append_and_read_in_order(self, tmp_path):
+        """Test that queued operations come back oldest first."""
+        outbox = Outbox(tmp_path / "outbox.jsonl")
+        outbox.append(Operation("add", "a", "a@example.com"))
+        outbox.append(Operation("delete", "b"))
+
+        assert outbox.operations() == [Operation("add", "a", "a@example.com"), Operation("delete", "b")]
+        assert len(outbox) == 2
+
+    def test_torn_line_is_ignored(self, tmp_path):
+        """Test that a partially written entry does not break reading."""
+        outbox = Outbox(tmp_path / "outbox.jsonl")
+        outbox.append(Operation("delete", "b"))
+        with open(outbox.path, "a") as handle:
+            handle.write('{"op": {"action": "add"')
+
+        assert outbox.operations() == [Operation("delete", "b")]
+
+    def test_clear(self, tmp_path):
+        """Test that clearing empties the queue."""
+        outbox = Outbox(tmp_path / "outbox.jsonl")
+        outbox.append(Operation("delete", "b"))
+        outbox.clear()
+
+        assert outbox.operations() == []
+
+
+class TestCoalesce:
+    """Test cases for reducing queued operations per alias."""
+
+    def test_add_then_delete_cancels(self):
+        """Test that an add followed by a delete sends nothing."""
+        assert coalesce([Operation("add", "a", "x@example.com"), Operation("delete", "a")]) == ([], ["a"])
+
+    def test_delete_then_add_replaces(self):
+        """Test that a delete followed by an add becomes an update."""
+        intents, _ = coalesce([Operation("delete", "a"), Operation("add", "a", "x@example.com")])
+
+        assert intents == [Operation("update", "a", "x@example.com")]
+
+    def test_last_add_wins(self):
+        """Test that repeated adds keep the latest forward."""
+        intents, _ = coalesce([Operation("add", "a", "x@example.com"), Operation("add", "a", "y@example.com")])
+
+        assert intents == [Operation("add", "a", "y@example.com")]
+
+
+class TestPlanFlush:
+    """Test cases for comparing the queue with live state."""
+
+    def test_plan_against_live_state(self):
+        """Test skips, conflicts, updates and plain requests."""
+        live = AliasSet([
+            Alias("done", "done@example.com"),
+            Alias("taken", "other@example.com"),
+            Alias("moved", "old@example.com"),
+            Alias("gone", "gone@example.com"),
+        ])
+        queued = [
+            Operation("add", "done", "done@example.com"),
+            Operation("add", "taken", "mine@example.com"),
+            Operation("delete", "moved"),
+            Operation("add", "moved", "new@example.com"),
+            Operation("delete", "gone"),
+            Operation("delete", "missing"),
+            Operation("add", "fresh", "fresh@example.com"),
+            Operation("add", "temp", "temp@example.com"),
+            Operation("delete", "temp"),
+        ]
+
+        operations, notes = plan_flush(queued, live)
+
+        assert operations == [
+            Operation("update", "moved", "new@example.com"),
+            Operation("delete", "gone"),
+            Operation("add", "fresh", "fresh@example.com"),
+        ]
+        assert {note["alias"]: note["status"] for note in notes} == {
+            "temp": "cancelled", "done": "skipped", "taken": "conflict", "missing": "skipped",
+        }
+
+    def test_overwrite_turns_conflicts_into_updates(self):
+        """Test that --overwrite updates aliases created elsewhere."""
+        live = AliasSet([Alias("taken", "other@example.com")])
+
+        operations, notes = plan_flush([Operation("add", "taken", "mine@example.com")], live, overwrite=True)
+
+        assert operations == [Operation("update", "taken", "mine@example.com")]
+        assert notes == []
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,21 @@
+"""Tests for percentiles module."""
+
+import pytest
+
+from percentiles import percentile
+
+
+class TestPercentile:
+    """Test cases for the shared nearest-rank percentile."""
+
+    def test_nearest_rank(self):
+        """Test nearest-rank percentiles of unsorted values."""
+        values = [0.5, 0.1, 0.3, 0.2, 0.4]
+        assert percentile(values, 50) == 0.3
+        assert percentile(values, 100) == 0.5
+        assert percentile(values, 0) == 0.1
+        assert percentile([], 50) is None
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
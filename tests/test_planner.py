@@ -0,0 +1,85 @@
+"""Tests for planner module."""
+
+import pytest
+import responses
+
+from api import ImprovMXAPI
+from planner import DryRunRecorder, estimate_duration, build_report
+
+
+class TestDryRunRecorder:
+    """Test cases for recording planned calls."""
+
+    def test_steps_group_by_request_type(self):
+        """Test that calls are counted per request type."""
+        recorder = DryRunRecorder()
+        recorder.record("DELETE", "aliases/a")
+        recorder.record("POST", "aliases", {"alias": "b", "forward": "b@example.com"})
+        recorder.record("POST", "aliases", {"alias": "c", "forward": "c@example.com"})
+
+        assert recorder.steps() == {"DELETE aliases/{alias}": 1, "POST aliases": 2}
+
+    def test_synthetic_response(self):
+        """Test that recorded calls return a successful response."""
+        recorder = DryRunRecorder()
+        response = recorder.record("PUT", "aliases/a", {"forward": "x@example.com"})
+
+        assert response["alias"] == {"alias": "a", "forward": "x@example.com"}
+        assert response["dry_run"] is True
+
+    def test_capacity_detects_limit_partway(self):
+        """Test that exceeding the limit mid-run is reported with its position."""
+        recorder = DryRunRecorder()
+        recorder.record("POST", "aliases", {"alias": "a"})
+        recorder.record("POST", "aliases", {"alias": "b"})
+        recorder.record("DELETE", "aliases/c")
+
+        assert recorder.capacity(current=24, limit=25) == (26, 2)
+        assert recorder.capacity(current=10, limit=25) == (12, None)
+
+
+class TestEstimates:
+    """Test cases for duration estimates."""
+
+    def test_latency_and_workers(self):
+        """Test the estimate without rate limiting."""
+        assert estimate_duration(10, 0.2, 5) == pytest.approx(0.4)
+        assert estimate_duration(10, None, 5) is None
+
+    def test_rate_limit_dominates(self):
+        """Test that exhausting the rate limit adds waiting windows."""
+        rate = {"limit": 10, "remaining": 2, "reset": 2000000060}
+        assert estimate_duration(12, 0.1, 4, rate, now=2000000000) == pytest.approx(60)
+        assert estimate_duration(12, 0.1, 4, {"limit": 10, "remaining": 2, "reset": 30}) == pytest.approx(30)
+
+
+class TestDryRunClient:
+    """Test cases for the dry-run hook in ImprovMXAPI."""
+
+    @responses.activate
+    def test_mutations_are_not_sent(self):
+        """Test that only read requests reach the network during a dry run."""
+        responses.add(
+            responses.GET,
+            'https://api.improvmx.com/v3/domains/test.com/aliases',
+            json={"aliases": [{"alias": "a"}]},
+            headers={"X-RateLimit-Remaining": "99", "X-RateLimit-Limit": "100"},
+            status=200
+        )
+        api = ImprovMXAPI()
+        api.recorder = DryRunRecorder()
+
+        api.add_alias("new", "new@example.com")
+        api.delete_alias("a")
+        report = build_report(api.recorder, api, api.get_alias_count(), workers=2, limit=25)
+
+        assert len(responses.calls) == 1
+        assert report["api_calls"] == 2
+        assert report["reads_sent"] == 1
+        assert report["rate_limit"] == {"limit": 100, "remaining": 99}
+        assert report["peak_aliases"] == 2
+        assert report["exceeds_limit_at"] is None
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
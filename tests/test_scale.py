@@ -0,0 +1,166 @@
+"""Scale and memory regression tests.
+
+Each scenario runs the real CLI in a subprocess against a local stand-in of
+the ImprovMX aliases endpoint serving a synthetic domain, and checks the
+child's peak RSS and wall time against a budget of the form
+``base + per_alias * n``.
+
+The default run uses 10k aliases. Larger accounts are opt-in::
+
+    GALIAS_SCALE_SIZES=10000,100000,1000000 pytest tests/test_scale.py
+
+``GALIAS_SCALE_TOLERANCE`` scales every budget (e.g. ``1.5`` on a slow CI
+machine); ``GALIAS_SCALE_REPORT=path`` appends the measurements as JSON lines
+so runs can be compared over time.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlsplit, parse_qs
+
+import pytest
+
+
+ROOT = Path(__file__).resolve().parent.parent
+DOMAIN = "scale.test"
+PAGE_SIZE = 100
+
+SIZES = [int(n) for n in os.getenv("GALIAS_SCALE_SIZES", "10000").split(",") if n.strip()]
+TOLERANCE = float(os.getenv("GALIAS_SCALE_TOLERANCE", "1.0"))
+REPORT_PATH = os.getenv("GALIAS_SCALE_REPORT")
+
+# scenario: (CLI arguments, base MB, KB per alias, base seconds, ms per alias)
+# Per-alias costs are ~1.5x what was measured when they were set; modes that
+# must not grow with the account (streaming, status, searching the index)
+# get no per-alias memory at all.
+SCENARIOS = {
+    "list-table": (["list", "--quiet", "--no-color"], 60, 3.5, 5.0, 0.6),
+    "list-json": (["list", "--json", "--no-color"], 60, 2.5, 5.0, 0.06),
+    "list-stream": (["list", "--stream"], 60, 0.0, 5.0, 0.06),
+    "status": (["status", "--json"], 60, 0.0, 5.0, 0.0),
+    "sync": (["sync"], 60, 0.0, 5.0, 0.06),
+    "search": (["query", "--sql", "SELECT alias FROM aliases WHERE alias LIKE 'user00042%'", "--json"],
+               60, 0.0, 5.0, 0.0),
+    # Fixed-size counters: memory levels off once they are full
+    "stats": (["stats", "--json"], 90, 0.0, 5.0, 0.08),
+}
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "wait4"), reason="needs os.wait4 for per-process peak RSS")
+
+
+def synthetic_alias(index: int) -> dict:
+    """Deterministic alias record, so no dataset is ever held in memory."""
+    return {
+        "alias": f"user{index:07d}",
+        "forward": f"user{index}@example{index % 50}.com"
+                   + (f",team{index % 7}@example.org" if index % 5 == 0 else ""),
+        "active": index % 10 != 0,
+        "id": index + 1,
+        "created": "2025-01-01T00:00:00+00:00",
+    }
+
+
+def make_handler(total: int):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Headers and body go out as separate writes; without this every
+        # page waits for a delayed ACK
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            parts = urlsplit(self.path)
+            if parts.path == "/v3/account":
+                payload = {"account": {"limits": {"aliases": total + 1000, "domains": 10}}}
+            elif parts.path == f"/v3/domains/{DOMAIN}/aliases":
+                page = int(parse_qs(parts.query).get("page", ["1"])[0])
+                start = (page - 1) * PAGE_SIZE
+                payload = {
+                    "aliases": [synthetic_alias(i) for i in range(start, min(start + PAGE_SIZE, total))],
+                    "total": total, "page": page, "limit": PAGE_SIZE, "success": True,
+                }
+            else:
+                payload = {"error": "not found"}
+            body = json.dumps(payload).encode()
+            self.send_response(200 if "error" not in payload else 404)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def run_cli(args, env):
+    """Run galias to completion; returns (exit code, wall seconds, peak RSS in MB, stderr)."""
+    start = time.perf_counter()
+    with open(os.devnull, "wb") as sink:
+        process = subprocess.Popen(
+            [sys.executable, str(ROOT / "improvctl.py")] + args,
+            cwd=str(env["GALIAS_HOME"]), env=env, stdout=sink, stderr=subprocess.PIPE
+        )
+        _, status, usage = os.wait4(process.pid, 0)
+    elapsed = time.perf_counter() - start
+    process.returncode = os.waitstatus_to_exitcode(status) if hasattr(os, "waitstatus_to_exitcode") else status >> 8
+    stderr = process.stderr.read().decode(errors="replace")
+    process.stderr.close()
+    # ru_maxrss is KB on Linux and bytes on macOS
+    peak_mb = usage.ru_maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+    return process.returncode, elapsed, peak_mb, stderr
+
+
+@pytest.fixture(scope="module", params=SIZES, ids=lambda n: f"{n}-aliases")
+def account(request, tmp_path_factory):
+    total = request.param
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(total))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    home = tmp_path_factory.mktemp(f"scale-{total}")
+    env = {
+        **os.environ,
+        "IMPROVMX_API_KEY": "sk_scale",
+        "DOMAIN": DOMAIN,
+        "IMPROVMX_API_BASE_URL": f"http://127.0.0.1:{server.server_address[1]}",
+        "GALIAS_HOME": str(home),
+        "PYTHONPATH": str(ROOT),
+    }
+    yield total, env
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.parametrize("scenario", SCENARIOS)
+def test_within_budget(account, scenario):
+    """Test that peak memory and wall time stay within the scenario's budget."""
+    total, env = account
+    args, base_mb, kb_per_alias, base_s, ms_per_alias = SCENARIOS[scenario]
+    if scenario == "search":
+        # Searches the local index built by a previous sync
+        run_cli(["sync"], env)
+
+    code, elapsed, peak_mb, stderr = run_cli(args, env)
+
+    rss_budget = (base_mb + kb_per_alias * total / 1024) * TOLERANCE
+    time_budget = (base_s + ms_per_alias * total / 1000) * TOLERANCE
+    if REPORT_PATH:
+        with open(REPORT_PATH, "a") as handle:
+            handle.write(json.dumps({
+                "scenario": scenario, "aliases": total, "seconds": round(elapsed, 3),
+                "peak_mb": round(peak_mb, 1), "seconds_budget": round(time_budget, 3),
+                "peak_mb_budget": round(rss_budget, 1),
+            }) + "\n")
+
+    assert code == 0, stderr
+    assert peak_mb <= rss_budget, f"{scenario}: peak RSS {peak_mb:.0f} MB > budget {rss_budget:.0f} MB"
+    assert elapsed <= time_budget, f"{scenario}: {elapsed:.1f}s > budget {time_budget:.1f}s"
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,105 @@
+"""Tests for stats module."""
+
+import pytest
+
+from models import Alias
+from stats import AliasStats, TopCounter, name_prefix, name_skeleton
+
+
+class TestTopCounter:
+    """Test cases for the bounded frequency counter."""
+
+    def test_exact_below_capacity(self):
+        """Test that counts are exact while every value fits."""
+        counter = TopCounter(capacity=10)
+        for value in "abacabad":
+            counter.add(value)
+
+        assert counter.exact
+        assert counter.top(2) == [("a", 4), ("b", 2)]
+        assert counter.repeated(10) == [("a", 4), ("b", 2)]
+
+    def test_bounded_and_keeps_heavy_hitters(self):
+        """Test that memory stays bounded and frequent values survive a long tail."""
+        counter = TopCounter(capacity=50)
+        for i in range(20000):
+            counter.add("hot" if i % 10 == 0 else f"cold{i}")
+
+        assert len(counter.counts) == 50
+        assert not counter.exact
+        value, count = counter.top(1)[0]
+        assert value == "hot"
+        assert count >= 2000
+        # Guaranteed counts never overstate
+        assert dict(counter.repeated(5))["hot"] <= 2000
+
+    def test_samples(self):
+        """Test that a few distinct examples are kept per value."""
+        counter = TopCounter(capacity=10, samples=2)
+        for example in ["a", "a", "b", "c"]:
+            counter.add("key", example=example)
+
+        assert counter.examples["key"] == ["a", "b"]
+
+
+class TestNames:
+    """Test cases for alias name grouping."""
+
+    def test_prefix(self):
+        """Test prefixes from separators or trailing digits."""
+        assert name_prefix("shop-amazon") == "shop"
+        assert name_prefix("news.weekly") == "news"
+        assert name_prefix("user0042") == "user"
+        assert name_prefix("info") == "info"
+        assert name_prefix("*") == "*"
+
+    def test_skeleton(self):
+        """Test that spelling variants share a skeleton."""
+        assert name_skeleton("John.Doe") == name_skeleton("john_doe") == name_skeleton("johndoe")
+        assert name_skeleton("user1") != name_skeleton("user2")
+        assert name_skeleton("--") == "--"
+
+
+class TestAliasStats:
+    """Test cases for the single-pass summary."""
+
+    def make_aliases(self):
+        return [
+            Alias("john.doe", "me@personal.com"),
+            Alias("john_doe", "me@personal.com"),
+            Alias("shop-amazon", "me@personal.com,shop@work.com"),
+            Alias("shop-ebay", "shop@work.com", active=False),
+            Alias("info", "team@work.com"),
+            Alias("info", "team@work.com"),
+        ]
+
+    def test_report(self):
+        """Test counts, rankings and duplicate detection."""
+        report = AliasStats().update(self.make_aliases()).report(top=3)
+
+        assert report["aliases"] == 6
+        assert report["active"] == 5
+        assert report["inactive"] == 1
+        assert report["targets_per_alias"] == {"1": 5, "2": 1}
+        assert report["top_targets"][0] == {"forward": "me@personal.com", "aliases": 3}
+        assert report["top_domains"] == [
+            {"domain": "work.com", "aliases": 4}, {"domain": "personal.com", "aliases": 3}
+        ]
+        assert {"prefix": "shop", "aliases": 2} in report["top_prefixes"]
+        assert report["duplicates"] == [{"alias": "info", "count": 2}]
+        assert report["near_duplicates"] == [
+            {"key": "johndoe", "aliases": 2, "examples": ["john.doe", "john_doe"]}
+        ]
+        assert report["exact"]
+
+    def test_empty(self):
+        """Test the report of a domain without aliases."""
+        report = AliasStats().report()
+
+        assert report["aliases"] == 0
+        assert report["top_targets"] == []
+        assert report["duplicates"] == []
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,186 @@
+"""Tests for store module."""
+
+import pytest
+
+from models import Alias
+from store import AliasStore, StoreError, REPORTS
+
+
+def make_alias(name, forward=None, active=True):
+    return Alias(name, forward or f"{name}@example.com", active, len(name))
+
+
+class TestAliasStoreSync:
+    """Test cases for syncing the local mirror."""
+
+    def setup_method(self, method):
+        """Set up test fixtures."""
+        self.aliases = [make_alias("a"), make_alias("b"), make_alias("c", active=False)]
+
+    def test_initial_sync_adds_everything(self, tmp_path):
+        """Test that the first sync inserts all aliases."""
+        with AliasStore(tmp_path / "aliases.db") as store:
+            counts = store.sync(self.aliases, "test.com")
+
+            assert counts == {"added": 3, "updated": 0, "removed": 0, "total": 3}
+            assert store.count("test.com") == 3
+            assert store.last_sync("test.com") is not None
+
+    def test_incremental_sync_only_touches_changes(self, tmp_path):
+        """Test that a resync reports only changed rows."""
+        with AliasStore(tmp_path / "aliases.db") as store:
+            store.sync(self.aliases, "test.com")
+            counts = store.sync(
+                [make_alias("a"), make_alias("b", "moved@example.com"), make_alias("d")],
+                "test.com"
+            )
+
+            assert counts == {"added": 1, "updated": 1, "removed": 1, "total": 3}
+            names = [a.alias for a in store.aliases("test.com")]
+            assert names == ["a", "b", "d"]
+
+    def test_domains_are_isolated(self, tmp_path):
+        """Test that syncing one domain leaves others untouched."""
+        with AliasStore(tmp_path / "aliases.db") as store:
+            store.sync(self.aliases, "one.com")
+            store.sync([make_alias("x")], "two.com")
+
+            assert store.count("one.com") == 3
+            assert store.count("two.com") == 1
+
+
+class TestAliasStoreQueries:
+    """Test cases for reports and ad-hoc queries."""
+
+    def test_reports_run(self, tmp_path):
+        """Test that every predefined report executes."""
+        with AliasStore(tmp_path / "aliases.db") as store:
+            store.sync([make_alias("a", "x@example.com"), make_alias("b", "x@example.com"),
+                        make_alias("c", active=False)], "test.com")
+
+            for name in REPORTS:
+                store.report(name, "test.com")
+
+            columns, rows = store.report("by-forward", "test.com")
+            assert columns == ["forward", "aliases"]
+            assert rows[0] == ("x@example.com", 2)
+
+            _, rows = store.report("inactive", "test.com")
+            assert rows == [("c", "c@example.com")]
+
+    def test_sql_query_is_read_only(self, tmp_path):
+        """Test that ad-hoc SQL cannot modify the mirror."""
+        with AliasStore(tmp_path / "aliases.db") as store:
+            store.sync([make_alias("a")], "test.com")
+
+            columns, rows = store.query("SELECT alias FROM aliases")
+            assert rows == [("a",)]
+            with pytest.raises(StoreError):
+                store.query("DELETE FROM aliases")
+            assert store.count("test.com") == 1
+
+    def test_unknown_report(self, tmp_path):
+        """Test that unknown report names are rejected."""
+        with AliasStore(tmp_path / "aliases.db") as store:
+            with pytest.raises(StoreError, match="Unknown report"):
+                store.report("nope")
+
+
+
+class TestExpiries:
+    """Test cases for temporary alias expiries."""
+
+    def test_set_and_remove(self, tmp_path):
+        """Test that expiries are stored per domain and dropped with the alias."""
+        with AliasStore(tmp_path / "aliases.db") as store:
+            store.put(make_alias("tmp"), "test.com")
+            store.set_expiry("tmp", 100.0, "tmp@example.com", "test.com")
+            store.set_expiry("tmp", 200.0, "tmp@example.com", "other.com")
+
+            assert store.due_expiries(1000.0, "test.com") == [("tmp", "tmp@example.com")]
+            store.remove("tmp", "test.com")
+            assert store.due_expiries(1000.0, "test.com") == []
+            assert store.due_expiries(1000.0, "other.com") == [("tmp", "tmp@example.com")]
+
+    def test_clear_and_retarget(self, tmp_path):
+        """Test that an expiry survives only a re-add with its own forward."""
+        with AliasStore(tmp_path / "aliases.db") as store:
+            store.set_expiry("tmp", 100.0, "a@example.com", "test.com")
+            store.clear_expiry("tmp", keep_forward="a@example.com", domain="test.com")
+            assert store.expiry_count("test.com") == 1
+
+            store.retarget_expiry("tmp", "b@example.com", "test.com")
+            assert store.due_expiries(100.0, "test.com") == [("tmp", "b@example.com")]
+
+            store.clear_expiry("tmp", keep_forward="a@example.com", domain="test.com")
+            assert store.expiry_count("test.com") == 0
+
+    def test_due_in_expiry_order(self, tmp_path):
+        """Test that only due aliases are returned, soonest first, and the next expiry after them."""
+        with AliasStore(tmp_path / "aliases.db") as store:
+            for name, at in (("c", 30.0), ("a", 10.0), ("d", 50.0), ("b", 20.0)):
+                store.set_expiry(name, at, f"{name}@example.com", "test.com")
+
+            assert [name for name, _ in store.due_expiries(30.0, "test.com")] == ["a", "b", "c"]
+            assert store.next_expiry(domain="test.com") == 10.0
+            assert store.next_expiry(30.0, "test.com") == 50.0
+            assert store.next_expiry(50.0, "test.com") is None
+            assert store.expiry_count("test.com") == 4
+
+    def test_due_query_uses_index(self, tmp_path):
+        """Test that due expiries are found through the (domain, expires_at) index."""
+        with AliasStore(tmp_path / "aliases.db") as store:
+            plan = store.conn.execute(
+                "EXPLAIN QUERY PLAN SELECT alias FROM expiries WHERE domain = ? AND expires_at <= ? "
+                "ORDER BY expires_at, alias", ("test.com", 1.0)
+            ).fetchall()
+
+        assert any("idx_expiries_due" in row[-1] for row in plan)
+
+    def test_lookup(self, tmp_path):
+        """Test looking up mirrored aliases by name."""
+        with AliasStore(tmp_path / "aliases.db") as store:
+            store.put(make_alias("a"), "test.com")
+            store.put(make_alias("b"), "test.com")
+
+            assert [alias.alias for alias in store.lookup(["b", "missing"], "test.com")] == ["b"]
+
+class TestAccountLimits:
+    """Test cases for the cached account limits."""
+
+    def test_limits_round_trip(self, tmp_path):
+        """Test that stored limits are returned while fresh."""
+        with AliasStore(tmp_path / "aliases.db") as store:
+            assert store.limits() is None
+            store.put_limits({"aliases": 5000, "domains": 50})
+
+            assert store.limits(max_age=60) == {"aliases": 5000, "domains": 50}
+
+    def test_stale_limits_are_ignored(self, tmp_path):
+        """Test that limits older than max_age count as missing."""
+        with AliasStore(tmp_path / "aliases.db") as store:
+            store.put_limits({"aliases": 5000})
+            store.conn.execute("UPDATE account_limits SET fetched_at = fetched_at - 120")
+
+            assert store.limits(max_age=60) is None
+            assert store.limits() == {"aliases": 5000}
+
+
+class TestLogCursors:
+    """Test cases for the delivery log high-water marks."""
+
+    def test_cursor_per_alias_and_domain(self, tmp_path):
+        """Test that cursors are kept per (domain, alias)."""
+        with AliasStore(tmp_path / "aliases.db") as store:
+            assert store.log_cursor() is None
+            store.set_log_cursor(100.0, ["a", "b"], domain="test.com")
+            store.set_log_cursor(50.0, ["c"], alias="info", domain="test.com")
+            store.set_log_cursor(120.0, ["d", "e"], domain="test.com")
+
+            assert store.log_cursor(domain="test.com") == (120.0, ["d", "e"])
+            assert store.log_cursor("info", domain="test.com") == (50.0, ["c"])
+            assert store.log_cursor(domain="other.com") is None
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
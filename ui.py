@@ -1,7 +1,9 @@
 """UI components and styling for GALIAS CLI."""
 
-from typing import List, Dict, Any, Optional
+from contextlib import contextmanager
+from typing import List, Dict, Any, Optional, Union, Callable, Iterator
 from rich.console import Console
+from rich.progress import Progress, BarColumn, TextColumn, MofNCompleteColumn
 from rich.table import Table
 from rich.panel import Panel
 from rich.text import Text
@@ -9,6 +11,7 @@ from rich.prompt import Prompt, Confirm
 from rich import box
 
 from config import DOMAIN, MAX_ALIASES
+from models import AliasSet
 
 
 # Global console instance
@@ -82,14 +85,15 @@ def print_alias_count(current: int, maximum: int = None):
     console.print(f"{progress_bar} {count_text}{warning}", style=style)
 
 
-def print_aliases_table(aliases_data: Dict[str, Any]):
+def print_aliases_table(aliases: Union[AliasSet, Dict[str, Any]]):
     """
     Print aliases in a formatted table.
     
     Args:
-        aliases_data: Response from list_aliases API call
+        aliases: AliasSet, or a raw response from list_aliases API call
     """
-    aliases = aliases_data.get("aliases", [])
+    if isinstance(aliases, dict):
+        aliases = AliasSet.from_response(aliases)
     
     if not aliases:
         console.print("No aliases found.", style="dim yellow")
@@ -101,17 +105,352 @@ def print_aliases_table(aliases_data: Dict[str, Any]):
     table.add_column("Status", style="yellow")
     
     for alias in aliases:
-        alias_name = alias.get("alias", "")
-        forward = alias.get("forward", "")
-        active = alias.get("active", True)
-        status = "✓ Active" if active else "✗ Inactive"
+        status = "✓ Active" if alias.active else "✗ Inactive"
         
-        table.add_row(alias_name, forward, status)
+        table.add_row(alias.alias, alias.forward, status)
     
     console.print(table)
     console.print()
 
 
+def print_snapshots_table(snapshots: List[Any]):
+    """
+    Print backup snapshots in a formatted table.
+    
+    Args:
+        snapshots: Snapshot objects from backup.list_snapshots
+    """
+    if not snapshots:
+        console.print("No backups found.", style="dim yellow")
+        return
+    
+    table = Table(title="Backups", box=box.ROUNDED)
+    table.add_column("Timestamp (UTC)", style="cyan", no_wrap=True)
+    table.add_column("Type", style="yellow")
+    table.add_column("File", style="dim")
+    
+    for snapshot in snapshots:
+        table.add_row(
+            snapshot.timestamp.strftime("%Y-%m-%d %H:%M:%S"),
+            snapshot.kind,
+            snapshot.path.name
+        )
+    
+    console.print(table)
+    console.print()
+
+
+def print_operations_table(operations: List[Any], title: str = "Planned Changes"):
+    """
+    Print pending alias operations in a formatted table.
+    
+    Args:
+        operations: Operation objects from batch module
+        title: Table title
+    """
+    if not operations:
+        console.print("Nothing to do.", style="dim yellow")
+        return
+    
+    table = Table(title=title, box=box.ROUNDED)
+    table.add_column("Action", style="yellow")
+    table.add_column("Alias", style="cyan", no_wrap=True)
+    table.add_column("Forward To", style="green")
+    
+    for op in operations:
+        table.add_row(op.action, op.alias, op.forward or "")
+    
+    console.print(table)
+    console.print()
+
+
+def print_query_table(columns: List[str], rows: List[Any], title: str = None):
+    """
+    Print rows returned by a local store query.
+    
+    Args:
+        columns: Column names
+        rows: Row tuples
+        title: Optional table title
+    """
+    if not rows:
+        console.print("No rows.", style="dim yellow")
+        return
+    
+    table = Table(title=title, box=box.ROUNDED)
+    for column in columns:
+        table.add_column(column, style="cyan" if column == "alias" else None)
+    
+    for row in rows:
+        table.add_row(*["" if value is None else str(value) for value in row])
+    
+    console.print(table)
+    console.print()
+
+
+def print_jobs_table(jobs: List[Any]):
+    """
+    Print journaled batch jobs in a formatted table.
+    
+    Args:
+        jobs: Job objects from journal.list_jobs
+    """
+    if not jobs:
+        console.print("No jobs found.", style="dim yellow")
+        return
+    
+    table = Table(title="Jobs", box=box.ROUNDED)
+    table.add_column("Job", style="cyan", no_wrap=True)
+    table.add_column("Command", style="yellow")
+    table.add_column("Done", justify="right")
+    table.add_column("Failed", justify="right")
+    table.add_column("Pending", justify="right")
+    
+    for job in jobs:
+        counts = job.counts()
+        table.add_row(
+            job.id, job.command,
+            str(counts["done"]), str(counts["failed"]), str(counts["pending"])
+        )
+    
+    console.print(table)
+    console.print()
+
+
+def print_dry_run_report(report: Dict[str, Any]):
+    """
+    Print the cost estimate of a dry run.
+    
+    Args:
+        report: Report from planner.build_report
+    """
+    console.print("Dry run - nothing was changed", style="bold yellow")
+    
+    if report["steps"]:
+        table = Table(title="Planned API Calls", box=box.ROUNDED)
+        table.add_column("Request", style="cyan")
+        table.add_column("Calls", justify="right")
+        for step in report["steps"]:
+            table.add_row(step["request"], str(step["calls"]))
+        console.print(table)
+    else:
+        console.print("No changes would be sent.", style="dim yellow")
+    
+    seconds = report["estimated_seconds"]
+    if seconds is not None:
+        print_info(
+            f"{report['api_calls']} call(s), ~{seconds:.1f}s with {report['workers']} worker(s) "
+            f"at {report['latency_ms']} ms observed latency"
+        )
+    
+    remaining = report["rate_limit"].get("remaining")
+    if remaining is not None and report["api_calls"] > remaining:
+        print_warning(f"Exceeds the remaining rate limit ({remaining} requests left)")
+    
+    if report["exceeds_limit_at"] is not None:
+        print_warning(
+            f"Alias limit of {report['max_aliases']} would be exceeded at call "
+            f"{report['exceeds_limit_at']} (peak {report['peak_aliases']})"
+        )
+    else:
+        print_alias_count(report["peak_aliases"], report["max_aliases"])
+
+
+def print_stats_report(report: Dict[str, Any]):
+    """
+    Print alias statistics.
+
+    Args:
+        report: Report from stats.AliasStats.report
+    """
+    console.print(
+        f"{report['aliases']} aliases: {report['active']} active, {report['inactive']} inactive",
+        style="bold cyan"
+    )
+    spread = ", ".join(
+        f"{count} with {n} target{'s' if n != '1' else ''}" for n, count in report["targets_per_alias"].items()
+    )
+    if spread:
+        console.print(f"Forward targets: {spread}")
+    console.print()
+
+    rankings = [
+        ("Top Forward Targets", "Forward To", "forward", report["top_targets"]),
+        ("Top Forwarding Domains", "Domain", "domain", report["top_domains"]),
+        ("Top Prefixes", "Prefix", "prefix", report["top_prefixes"]),
+    ]
+    for title, column, key, rows in rankings:
+        if not rows:
+            continue
+        table = Table(title=title, box=box.ROUNDED)
+        table.add_column(column, style="cyan")
+        table.add_column("Aliases", justify="right")
+        for row in rows:
+            table.add_row(row[key], str(row["aliases"]))
+        console.print(table)
+
+    if report["duplicates"]:
+        table = Table(title="Duplicate Aliases", box=box.ROUNDED)
+        table.add_column("Alias", style="cyan")
+        table.add_column("Listed", justify="right")
+        for row in report["duplicates"]:
+            table.add_row(row["alias"], str(row["count"]))
+        console.print(table)
+
+    if report["near_duplicates"]:
+        table = Table(title="Near-Duplicate Aliases", box=box.ROUNDED)
+        table.add_column("Aliases", justify="right")
+        table.add_column("Examples", style="cyan")
+        for row in report["near_duplicates"]:
+            table.add_row(str(row["aliases"]), ", ".join(row["examples"]))
+        console.print(table)
+
+    if not report["exact"]:
+        print_info("Too many distinct values to count exactly; rankings show estimates")
+
+
+LOG_STATUS_STYLES = {"DELIVERED": "green", "QUEUED": "yellow", "SENDING": "yellow"}
+
+
+def print_log_entry(entry: Dict[str, Any]):
+    """
+    Print one delivery log entry on a single line.
+
+    Args:
+        entry: Log entry from ImprovMXAPI.iter_logs
+    """
+    from logs import log_time, log_status
+    from datetime import datetime, timezone
+
+    at = datetime.fromtimestamp(log_time(entry), timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+    status = log_status(entry)
+    sender = (entry.get("sender") or {}).get("email", "?")
+    recipient = (entry.get("recipient") or {}).get("email", "?")
+    line = Text(f"{at}  ", style="dim")
+    line.append(f"{status:<11}", style=LOG_STATUS_STYLES.get(status, "red"))
+    line.append(f"  {sender} → ", style="white")
+    line.append(recipient, style="cyan")
+    if entry.get("subject"):
+        line.append(f"  {entry['subject']}", style="dim")
+    console.print(line, soft_wrap=True)
+
+
+def print_doctor_report(report: Dict[str, Any]):
+    """
+    Print the findings of ``galias doctor``.
+
+    Args:
+        report: Report from doctor.run
+    """
+    env = report["environment"]
+    print_info(f"Python {env['python']} on {env['platform']}, requests {env['requests']}")
+    print_info(f"API {env['api_url']} (connect timeout {env['connect_timeout']}s, "
+               f"read timeout {env['read_timeout']}s, proxy {env['proxy'] or 'none'})")
+
+    if "startup_ms" in report:
+        table = Table(title="Start-up Imports", box=box.ROUNDED)
+        table.add_column("Module", style="cyan")
+        table.add_column("ms", justify="right")
+        for name, ms in report["startup_ms"].items():
+            table.add_row(name, f"{ms:.1f}")
+        table.add_row("total", f"{sum(report['startup_ms'].values()):.1f}", style="bold")
+        console.print(table)
+    else:
+        print_warning(f"Could not measure start-up: {report['startup_error']}")
+
+    requests_report = report["requests"]
+    if requests_report["phases_ms"]:
+        table = Table(
+            title=f"Request Phases ({requests_report['samples']} x GET, HTTP {requests_report['status']} "
+                  f"from {requests_report['address']})",
+            box=box.ROUNDED
+        )
+        table.add_column("Phase", style="cyan")
+        table.add_column("p50 ms", justify="right")
+        table.add_column("p90 ms", justify="right")
+        table.add_column("max ms", justify="right")
+        for phase, values in requests_report["phases_ms"].items():
+            if values is None:
+                table.add_row(phase, "-", "-", "-", style="dim")
+            else:
+                table.add_row(phase, f"{values['p50']:.1f}", f"{values['p90']:.1f}", f"{values['max']:.1f}",
+                              style="bold" if phase == "total" else None)
+        console.print(table)
+    if not requests_report["authenticated"]:
+        print_info(f"{requests_report['url']} was requested without the API key "
+                   f"(it is only sent over HTTPS to the API host)")
+    for error in requests_report["errors"]:
+        print_error(f"Request failed: {error}")
+
+    reuse = report["connection_reuse"]
+    if "error" in reuse:
+        print_warning(f"Could not check connection reuse: {reuse['error']}")
+    elif reuse["reused"]:
+        print_success(f"Connection reused: {reuse['requests']} request(s) over {reuse['connections']} new connection(s)")
+    else:
+        print_warning(f"Connection not reused: {reuse['requests']} request(s) opened "
+                      f"{reuse['connections']} connection(s)")
+
+
+@contextmanager
+def batch_progress(total: int) -> Iterator[Callable[[int, float], None]]:
+    """
+    Live progress bar for a batch job, removed when the batch finishes.
+    
+    Args:
+        total: Number of operations in the batch
+        
+    Yields:
+        Callback taking (window, ops_per_second), called once per completed operation
+    """
+    progress = Progress(
+        BarColumn(),
+        MofNCompleteColumn(),
+        TextColumn("window {task.fields[window]} · {task.fields[rate]:.1f} ops/s", style="dim"),
+        console=console,
+        transient=True
+    )
+    task = progress.add_task("batch", total=total, window="-", rate=0.0)
+    
+    def advance(window: int, rate: float):
+        progress.update(task, advance=1, window=window, rate=rate)
+    
+    with progress:
+        yield advance
+
+
+def print_batch_results(results: List[Any]):
+    """
+    Print a summary of a completed batch of operations.
+    
+    Args:
+        results: OperationResult objects from batch.run_operations
+    """
+    failed = [r for r in results if not r.ok]
+    succeeded = len(results) - len(failed)
+    
+    if succeeded:
+        print_success(f"{succeeded} operation(s) applied")
+    for result in failed:
+        print_error(f"{result.operation.action} {result.operation.alias}: {result.error}")
+
+
+def print_stream_result(result: Any, line: int):
+    """
+    Print one completed operation of a streamed batch.
+    
+    Args:
+        result: OperationResult from batch.run_stream
+        line: Input line the operation was read from
+    """
+    op = result.operation
+    target = f" -> {op.forward}" if op.forward else ""
+    if result.ok:
+        print_success(f"{op.action} {op.alias}{target}")
+    else:
+        print_error(f"line {line}: {op.action} {op.alias}{target}: {result.error}")
+
+
 def print_success(message: str):
     """Print a success message."""
     console.print(f"✓ {message}", style="bold green")
@@ -155,7 +494,9 @@ def confirm_delete(alias: str) -> bool:
 def print_json_output(data: Dict[str, Any]):
     """Print raw JSON output for scripting."""
     import json
-    console.print(json.dumps(data, indent=2))
+    # Written as-is: rendering through rich costs far more time and memory
+    # than the data itself on large listings
+    console.file.write(json.dumps(data, indent=2) + "\n")
 
 
 def print_operation_summary(operation: str, alias: str, forward: str = None):
@@ -184,7 +525,7 @@ def handle_error_display(error: Exception):
     """
     from api import (
         AuthenticationError, AliasExistsError, AliasNotFoundError,
-        LimitReachedError, NetworkError, APIError
+        LimitReachedError, NetworkError, CircuitOpenError, DeadlineExceededError, APIError
     )
     from config import ConfigError
     
@@ -203,6 +544,12 @@ def handle_error_display(error: Exception):
     elif isinstance(error, LimitReachedError):
         print_error("Alias limit reached")
         console.print("Delete some aliases before adding new ones", style="dim")
+    elif isinstance(error, DeadlineExceededError):
+        print_error("Deadline exceeded")
+        console.print(str(error), style="dim")
+    elif isinstance(error, CircuitOpenError):
+        print_error("ImprovMX API unavailable")
+        console.print(str(error), style="dim")
     elif isinstance(error, NetworkError):
         print_error("Network error")
         console.print("Check your internet connection and try again", style="dim")